@@ -1,7 +1,6 @@
 import sys
 import matplotlib.pyplot as plt
 from generator.topology_analyzer import analizar_imagen_topologica
-from generator.topology_base import compute_betti_numbers_2d, calcular_V_E_F
 from generator.image_reader import read_binary_image
 
 def main():
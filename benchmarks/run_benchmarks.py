@@ -0,0 +1,223 @@
+"""
+Banco de pruebas de rendimiento para las etapas del análisis topológico.
+
+Uso:
+    python benchmarks/run_benchmarks.py run --sizes 64 256 1024 --output base.json
+    python benchmarks/run_benchmarks.py run --cases single_blob irregular_mesh --stages get_f8_code
+    python benchmarks/run_benchmarks.py compare base.json nuevo.json --threshold 0.10
+"""
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import platform
+import tempfile
+import tracemalloc
+import numpy as np
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from generator.field_generator import generate_topology_case, generate_vector_field
+from generator.case_definitions import get_topology_cases
+from generator.image_reader import read_binary_image, preprocess_binary_image
+from generator.topology_base import calcular_V_E_F, compute_betti_numbers_2d
+from generator.topology_metrics import (count_vertices_edges_faces_corrected, analyze_connectivity,
+                                        compute_all_metrics)
+from generator.topology_codes_extended import (get_f8_code, get_f8_chains, f8_chains_to_f4,
+                                               f4_chains_to_vcc, compute_vcc, compute_3ot)
+from generator.visualizer import plot_topology_analysis, vector_field_size
+from generator.run_logging import configure_logging
+
+logger = logging.getLogger('benchmarks')
+
+DEFAULT_SIZES = [64, 256, 1024, 4096]
+
+def prepare_case(case_name, size, workdir):
+    """
+    Genera un caso y los datos intermedios que necesitan las etapas, fuera de la medición.
+
+    Returns:
+        dict: Imagen, ruta PNG y entradas precalculadas de cada etapa
+    """
+    field = generate_topology_case(case_name, size=(size, size), seed=0)
+    binary = (field > 0.5).astype(np.uint8)
+
+    image_path = os.path.join(workdir, f"{case_name}_{size}.png")
+    plt.imsave(image_path, binary, cmap='gray')
+
+    f4_chains = f8_chains_to_f4(get_f8_chains(field))
+    # Entradas de la figura: la etapa 'visualizer' solo mide el dibujo
+    u, v = generate_vector_field(field, max_size=vector_field_size(7.5))
+    return {
+        'name': case_name,
+        'field': field,
+        'binary': binary,
+        'path': image_path,
+        'f4_chains': f4_chains,
+        'vcc_chains': f4_chains_to_vcc(f4_chains),
+        'vector_field': (u, v),
+        'metrics': compute_all_metrics(field),
+        'plot_path': os.path.join(workdir, f"plot_{case_name}_{size}.png"),
+    }
+
+def plot_case(case):
+    """Etapa de visualización: solo el dibujo y guardado de la figura completa"""
+    u, v = case['vector_field']
+    plot_topology_analysis(case['field'], u, v, case['metrics'], case['plot_path'], case['name'])
+
+# Cada etapa recibe el caso preparado y usa arrays sin contexto compartido,
+# de modo que nada se reutiliza entre etapas.
+STAGES = {
+    'read_binary_image': lambda c: read_binary_image(c['path']),
+    'preprocess_binary_image': lambda c: preprocess_binary_image(c['binary']),
+    'generate_vector_field': lambda c: generate_vector_field(c['field']),
+    'count_vertices_edges_faces_corrected': lambda c: count_vertices_edges_faces_corrected(c['field']),
+    'calcular_V_E_F': lambda c: calcular_V_E_F(c['binary']),
+    'compute_betti_numbers_2d': lambda c: compute_betti_numbers_2d(c['field']),
+    'get_f8_code': lambda c: get_f8_code(c['field']),
+    'compute_vcc': lambda c: compute_vcc(c['field'], c['f4_chains']),
+    'compute_3ot': lambda c: compute_3ot(c['field'], c['vcc_chains']),
+    'analyze_connectivity': lambda c: analyze_connectivity(c['field']),
+    'visualizer': plot_case,
+}
+
+def time_stage(stage, case, repeat):
+    """
+    Mide una etapa `repeat` veces y su pico de memoria en una ejecución adicional.
+
+    Returns:
+        dict: Mediana y p95 del tiempo (s) y pico de memoria (bytes)
+    """
+    fn = STAGES[stage]
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(case)
+        times.append(time.perf_counter() - start)
+
+    # tracemalloc ralentiza la ejecución: la memoria se mide aparte
+    tracemalloc.start()
+    try:
+        fn(case)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'median_s': float(np.median(times)),
+        'p95_s': float(np.percentile(times, 95)),
+        'peak_bytes': int(peak),
+        'repeat': repeat,
+    }
+
+def run_benchmarks(sizes, cases, stages, repeat):
+    """
+    Recorre tamaños, casos y etapas y devuelve los resultados en formato JSON.
+
+    Returns:
+        dict: {'meta': ..., 'results': [...]}
+    """
+    results = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for size in sizes:
+            for case_name in cases:
+                case = prepare_case(case_name, size, workdir)
+                for stage in stages:
+                    stats = time_stage(stage, case, repeat)
+                    stats.update({'stage': stage, 'case': case_name, 'size': size})
+                    results.append(stats)
+                    logger.info("%-38s %-24s %5d²  mediana=%.4f s  p95=%.4f s  pico=%.1f MB",
+                                stage, case_name, size, stats['median_s'], stats['p95_s'],
+                                stats['peak_bytes'] / 2**20)
+
+    return {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%d %H:%M:%S'),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'repeat': repeat,
+        },
+        'results': results,
+    }
+
+def compare_results(baseline, current, threshold=0.10, min_time=1e-3):
+    """
+    Compara dos archivos de resultados y marca las regresiones.
+
+    Una etapa regresa si su mediana crece más de `threshold` (fracción) y al
+    menos `min_time` segundos, o si su pico de memoria crece más de `threshold`.
+
+    Returns:
+        list: Filas de comparación con 'regression' True/False
+    """
+    def key(r):
+        return (r['stage'], r['case'], r['size'])
+
+    base = {key(r): r for r in baseline['results']}
+    rows = []
+    for r in current['results']:
+        old = base.get(key(r))
+        if old is None:
+            continue
+        time_ratio = r['median_s'] / old['median_s'] if old['median_s'] > 0 else float('inf')
+        mem_ratio = r['peak_bytes'] / old['peak_bytes'] if old['peak_bytes'] > 0 else 1.0
+        slower = time_ratio > 1 + threshold and r['median_s'] - old['median_s'] >= min_time
+        bigger = mem_ratio > 1 + threshold
+        rows.append({
+            'stage': r['stage'], 'case': r['case'], 'size': r['size'],
+            'old_median_s': old['median_s'], 'new_median_s': r['median_s'],
+            'time_ratio': time_ratio, 'mem_ratio': mem_ratio,
+            'regression': slower or bigger,
+        })
+    return rows
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks del análisis topológico 2D")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    run = sub.add_parser('run', help="Ejecutar los benchmarks")
+    run.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help="Lados de imagen a recorrer")
+    run.add_argument('--cases', nargs='+', default=list(get_topology_cases()), help="Casos de generate_topology_case")
+    run.add_argument('--stages', nargs='+', default=list(STAGES), choices=list(STAGES), help="Etapas a medir")
+    run.add_argument('--repeat', type=int, default=5, help="Repeticiones por medición")
+    run.add_argument('--output', default='benchmark_results.json', help="Archivo JSON de salida")
+
+    cmp = sub.add_parser('compare', help="Comparar dos archivos de resultados")
+    cmp.add_argument('baseline', help="Resultados de referencia")
+    cmp.add_argument('current', help="Resultados nuevos")
+    cmp.add_argument('--threshold', type=float, default=0.10, help="Aumento relativo tolerado")
+    cmp.add_argument('--min-time', type=float, default=1e-3, help="Aumento absoluto mínimo (s) para marcar")
+
+    args = parser.parse_args()
+    configure_logging()
+
+    if args.command == 'run':
+        data = run_benchmarks(args.sizes, args.cases, args.stages, args.repeat)
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2)
+        logger.info("\nResultados guardados en: %s", args.output)
+        return 0
+
+    with open(args.baseline, encoding='utf-8') as f:
+        baseline = json.load(f)
+    with open(args.current, encoding='utf-8') as f:
+        current = json.load(f)
+
+    rows = compare_results(baseline, current, args.threshold, args.min_time)
+    regressions = [r for r in rows if r['regression']]
+    for r in rows:
+        flag = 'REGRESIÓN' if r['regression'] else ''
+        logger.info("%-38s %-24s %5d²  %.4f -> %.4f s  x%.2f  mem x%.2f  %s",
+                    r['stage'], r['case'], r['size'], r['old_median_s'], r['new_median_s'],
+                    r['time_ratio'], r['mem_ratio'], flag)
+    logger.info("\n%d comparaciones, %d regresiones", len(rows), len(regressions))
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
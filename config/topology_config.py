@@ -16,6 +16,27 @@ VISUALIZATION_CONFIG = {
     'vector_field_step': 10,    # Paso para submuestreo del campo vectorial
     'arrow_color': 'red',       # Color de las flechas del campo vectorial
     'arrow_scale': 30,          # Escala de las flechas
+    'vector_field_arrows': 64,  # Flechas máximas por lado en los quiver
+    'vector_field_size': 1024,  # Lado mayor del campo vectorial de TopologyResult (None = completo)
+    'code_full_resolution': 200,  # Símbolos máximos dibujados uno a uno en plot_topology_codes
+    'code_max_bins': 512,       # Ventanas del histograma de símbolos de códigos largos
+    'code_text_limit': 120,     # Símbolos mostrados de cada código en las anotaciones
+}
+
+# Configuración de la etapa de render sin interfaz (generator.render_pipeline)
+RENDER_CONFIG = {
+    'workers': 2,               # Procesos de render (0 = hilo en el proceso principal)
+    'queue_size': 16,           # Casos en cola antes de que submit() espere
+    'dpi': 150,                 # DPI de las figuras del pipeline
+    'figures': ('analysis', 'patterns', 'codes'),  # Figuras por caso
+}
+
+# Configuración de la exportación columnar (generator.columnar_export)
+COLUMNAR_CONFIG = {
+    'path': 'output/metricas.parquet',  # Archivo por defecto de --parquet
+    'row_group_size': 64,       # Filas por grupo escritas a medida que llegan
+    'compression': 'zstd',      # Compresión de Parquet
+    'codes': True,              # Guardar los códigos empaquetados (2-3 bits por símbolo)
 }
 
 # Configuración de topología
@@ -25,4 +46,24 @@ TOPOLOGY_CONFIG = {
     'min_hole_radius': 5,       # Radio mínimo para agujeros
     'min_distance': 20,         # Distancia mínima entre características
     'noise_level': 0.05,        # Nivel de ruido por defecto
-} 
\ No newline at end of file
+    'vector_field_sigma': 2.0,  # Sigma del suavizado antes del gradiente del campo vectorial
+    'fft_sigma': 8.0,           # Sigma a partir del cual se suaviza con FFT
+} 
+
+# Configuración de registro (logging)
+LOGGING_CONFIG = {
+    'verbosity': 1,             # 0=solo advertencias, 1=progreso, 2=detalle (debug)
+    'dump_codes': False,        # Volcar las cadenas de códigos F8/F4/VCC/3OT
+    'format': '%(message)s',    # Formato de los mensajes
+    'loggers': ('generator', 'main', 'benchmarks'),  # Loggers que reciben el manejador (el raíz no se toca)
+}
+# Configuración del análisis por teselas (imágenes que no caben en memoria)
+TILING_CONFIG = {
+    'tile_size': 1024,          # Lado de las teselas en píxeles
+}
+
+# Configuración de la caché de resultados por contenido de la máscara
+CACHE_CONFIG = {
+    'path': 'output/cache.sqlite',  # Archivo SQLite de la caché
+    'max_bytes': 256 * 2**20,       # Tamaño máximo antes de expulsar entradas (LRU)
+}
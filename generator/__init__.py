@@ -18,6 +18,16 @@ from .field_generator import (
     add_noise_to_field
 )
 
+from .binary_mask import (
+    BinaryMask,
+    popcount
+)
+
+from .analysis_context import (
+    AnalysisContext,
+    as_context
+)
+
 from .topology_metrics import (
     count_vertices_edges_faces_corrected,
     euler_characteristic_2d,
@@ -28,9 +38,18 @@ from .topology_metrics import (
     analyze_connectivity
 )
 
+from .topology_result import (
+    TopologyResult,
+    TopologyCodes
+)
+
 from .topology_codes_extended import (
     get_f8_code,
+    get_f8_chains,
     f8_to_f4,
+    f8_chains_to_f4,
+    f4_chains_to_vcc,
+    vcc_chains_to_3ot,
     compute_vcc,
     compute_3ot
 )
@@ -41,11 +60,33 @@ from .visualizer import (
     plot_vector_field_enhanced,
     create_individual_case_visualization,
     save_metrics_to_csv,
+    MetricsCSVWriter,
     create_summary_report,
     plot_topology_codes,
     plot_topology_patterns
 )
 
+from .render_pipeline import (
+    RenderPipeline,
+    TopologyAnalysisFigure,
+    TopologyPatternsFigure,
+    render_job,
+    render_case
+)
+
+from .chain_codes import (
+    ChainCode,
+    context_chain_codes,
+    save_chain_codes,
+    load_chain_codes
+)
+
+from .columnar_export import (
+    MetricsWriter,
+    save_metrics_columnar,
+    read_metrics_columnar
+)
+
 from .case_definitions import (
     get_topology_cases,
     validate_case_topology
@@ -54,7 +95,63 @@ from .case_definitions import (
 from .image_reader import (
     read_binary_image,
     validate_binary_image,
-    preprocess_binary_image
+    preprocess_binary_image,
+    open_memmap_image,
+    iter_binary_chunks,
+    read_binary_image_chunked
+)
+
+from .tiled_topology import (
+    iter_tile_bounds,
+    tiled_quad_histogram,
+    tiled_vertices_edges_faces,
+    tiled_euler_characteristic,
+    tiled_betti_numbers
+)
+
+from .batch_runner import (
+    collect_image_paths,
+    analyze_case,
+    analyze_image_file,
+    iter_batch_results,
+    run_batch
+)
+
+from .stack_topology import (
+    analyze_stack,
+    stack_vertices_edges_faces,
+    stack_betti_numbers
+)
+
+from .rle_mask import (
+    RLEMask,
+    read_rle_image,
+    rle_vertices_edges_faces,
+    rle_perimeter,
+    rle_betti_numbers,
+    rle_metrics
+)
+
+from .streaming_topology import (
+    StreamingTopology,
+    scan_rows,
+    stream_euler_betti
+)
+
+from .incremental_topology import (
+    IncrementalTopology
+)
+
+from .result_cache import (
+    ResultCache,
+    open_cache,
+    mask_key
+)
+
+from .profiling import (
+    StageProfiler,
+    aggregate_timings,
+    format_timings_report
 )
 
 __all__ = [
@@ -72,6 +169,14 @@ __all__ = [
     'create_asymmetric_branches',
     'add_noise_to_field',
     
+    # Binary masks
+    'BinaryMask',
+    'popcount',
+    
+    # Analysis context
+    'AnalysisContext',
+    'as_context',
+    
     # Topology metrics
     'count_vertices_edges_faces_corrected',
     'euler_characteristic_2d',
@@ -81,9 +186,17 @@ __all__ = [
     'compute_perimeter',
     'analyze_connectivity',
     
+    # Lazy results
+    'TopologyResult',
+    'TopologyCodes',
+    
     # Topology codes
     'get_f8_code',
+    'get_f8_chains',
     'f8_to_f4',
+    'f8_chains_to_f4',
+    'f4_chains_to_vcc',
+    'vcc_chains_to_3ot',
     'compute_vcc',
     'compute_3ot',
     
@@ -93,10 +206,29 @@ __all__ = [
     'plot_vector_field_enhanced',
     'create_individual_case_visualization',
     'save_metrics_to_csv',
+    'MetricsCSVWriter',
     'create_summary_report',
     'plot_topology_codes',
     'plot_topology_patterns',
     
+    # Packed chain codes
+    'ChainCode',
+    'context_chain_codes',
+    'save_chain_codes',
+    'load_chain_codes',
+    
+    # Columnar export
+    'MetricsWriter',
+    'save_metrics_columnar',
+    'read_metrics_columnar',
+    
+    # Headless rendering
+    'RenderPipeline',
+    'TopologyAnalysisFigure',
+    'TopologyPatternsFigure',
+    'render_job',
+    'render_case',
+    
     # Case definitions
     'get_topology_cases',
     'validate_case_topology',
@@ -107,5 +239,53 @@ __all__ = [
     # Image reader
     'read_binary_image',
     'validate_binary_image',
-    'preprocess_binary_image'
+    'preprocess_binary_image',
+    'open_memmap_image',
+    'iter_binary_chunks',
+    'read_binary_image_chunked',
+    
+    # Tiled analysis
+    'iter_tile_bounds',
+    'tiled_quad_histogram',
+    'tiled_vertices_edges_faces',
+    'tiled_euler_characteristic',
+    'tiled_betti_numbers',
+    
+    # Batch analysis
+    'collect_image_paths',
+    'analyze_case',
+    'analyze_image_file',
+    'iter_batch_results',
+    'run_batch',
+    
+    # Stack analysis
+    'analyze_stack',
+    'stack_vertices_edges_faces',
+    'stack_betti_numbers',
+    
+    # Run-length masks
+    'RLEMask',
+    'read_rle_image',
+    'rle_vertices_edges_faces',
+    'rle_perimeter',
+    'rle_betti_numbers',
+    'rle_metrics',
+    
+    # Streaming analysis
+    'StreamingTopology',
+    'scan_rows',
+    'stream_euler_betti',
+    
+    # Incremental topology
+    'IncrementalTopology',
+    
+    # Result cache
+    'ResultCache',
+    'open_cache',
+    'mask_key',
+    
+    # Profiling
+    'StageProfiler',
+    'aggregate_timings',
+    'format_timings_report'
 ]
\ No newline at end of file
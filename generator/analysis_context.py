@@ -0,0 +1,134 @@
+import numpy as np
+import cv2
+from scipy.ndimage import label
+from .topology_base import compute_betti_numbers_2d
+from .binary_mask import BinaryMask
+
+class AnalysisContext:
+    """
+    Contexto de análisis de una imagen: calcula cada artefacto derivado
+    (máscara binaria, etiquetado, números de Betti, contornos y códigos
+    F8/F4/VCC/3OT) la primera vez que se pide y lo reutiliza después.
+
+    Las funciones de métricas aceptan indistintamente una imagen, una
+    BinaryMask o un contexto, de modo que una misma imagen se etiqueta una
+    sola vez aunque la consulten varias métricas.
+
+    Args:
+        image: Imagen binaria donde 1=material, 0=poro, o BinaryMask
+    """
+
+    def __init__(self, image):
+        self._cache = {}
+        if isinstance(image, BinaryMask):
+            # Los consumidores de píxeles usan la vista uint8 de la máscara
+            self._cache['mask'] = image
+            self._cache['binary'] = image.unpack()
+            image = image.as_uint8()
+        self.image = image
+
+    def get(self, key, factory):
+        """
+        Devuelve el artefacto guardado bajo `key`, calculándolo con
+        `factory()` si todavía no existe.
+        """
+        if key not in self._cache:
+            self._cache[key] = factory()
+        return self._cache[key]
+
+    @property
+    def shape(self):
+        return self.image.shape
+
+    @property
+    def size(self):
+        return self.image.size
+
+    @property
+    def binary(self):
+        """Máscara booleana (imagen > 0.5, sin copia si ya es booleana)"""
+        return self.get('binary', lambda: self.image if self.image.dtype == bool else self.image > 0.5)
+
+    @property
+    def mask(self):
+        """Máscara empaquetada en bits (BinaryMask)"""
+        return self.get('mask', lambda: BinaryMask.from_array(self.binary))
+
+    @property
+    def labels(self):
+        """Etiquetado 4-conexo de la máscara: (etiquetas, número de componentes)"""
+        return self.get('labels', lambda: label(self.binary))
+
+    @property
+    def betti(self):
+        """Números de Betti (β₀, β₁)"""
+        return self.get('betti', lambda: compute_betti_numbers_2d(self.image))
+
+    @property
+    def contours(self):
+        """Contornos de OpenCV (RETR_TREE, CHAIN_APPROX_NONE) y su jerarquía"""
+        def find_contours():
+            image_u8 = self.image.astype(np.uint8) * 255
+            return cv2.findContours(image_u8, cv2.RETR_TREE, cv2.CHAIN_APPROX_NONE)
+        return self.get('contours', find_contours)
+
+    @property
+    def f8_contours(self):
+        """Código F8 de cada contorno y su índice en `contours` (get_f8_contours)"""
+        from .topology_codes_extended import get_f8_contours
+        return self.get('f8_contours', lambda: get_f8_contours(self))
+
+    @property
+    def f8_chains(self):
+        """Código F8 de cada contorno como arrays uint8"""
+        return self.f8_contours[0]
+
+    @property
+    def f8(self):
+        """Código F8 de Freeman"""
+        from .topology_codes_extended import get_f8_code
+        return self.get('f8', lambda: get_f8_code(self))
+
+    @property
+    def f4_chains(self):
+        """Código F4 de cada contorno como arrays uint8"""
+        from .topology_codes_extended import f8_chains_to_f4
+        return self.get('f4_chains', lambda: f8_chains_to_f4(self.f8_chains))
+
+    @property
+    def f4(self):
+        """Código F4 obtenido a partir del F8"""
+        from .topology_codes_extended import chains_to_string
+        return self.get('f4', lambda: chains_to_string(self.f4_chains))
+
+    @property
+    def vcc_chains(self):
+        """Código VCC de cada contorno como arrays uint8"""
+        from .topology_codes_extended import f4_chains_to_vcc
+        return self.get('vcc_chains', lambda: f4_chains_to_vcc(self.f4_chains))
+
+    @property
+    def vcc(self):
+        """Resultados de compute_vcc sobre el código F4 de cada contorno"""
+        from .topology_codes_extended import compute_vcc
+        return self.get('vcc', lambda: compute_vcc(self, self.f4_chains))
+
+    @property
+    def ot3(self):
+        """Resultados de compute_3ot sobre el código VCC de cada contorno"""
+        from .topology_codes_extended import compute_3ot
+        return self.get('3ot', lambda: compute_3ot(self, self.vcc_chains))
+
+def as_context(binary_image):
+    """
+    Devuelve `binary_image` si ya es un AnalysisContext o lo envuelve en uno nuevo.
+
+    Args:
+        binary_image: Imagen binaria, BinaryMask o AnalysisContext
+
+    Returns:
+        AnalysisContext: Contexto de análisis de la imagen
+    """
+    if isinstance(binary_image, AnalysisContext):
+        return binary_image
+    return AnalysisContext(binary_image)
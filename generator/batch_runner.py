@@ -0,0 +1,327 @@
+import os
+import glob
+import time
+import logging
+import numpy as np
+from itertools import islice
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from .analysis_context import AnalysisContext
+from .topology_metrics import compute_all_metrics, analyze_connectivity
+from .topology_codes_extended import compute_euler_from_freeman_chain, verify_euler_equalities
+from .image_reader import read_binary_image, validate_binary_image, preprocess_binary_image
+from .visualizer import MetricsCSVWriter
+from .profiling import StageProfiler, warm_context, log_timings_report
+from .binary_mask import BinaryMask
+from .result_cache import open_cache, mask_key, CACHED_KEYS
+from .render_pipeline import RenderPipeline
+from .columnar_export import MetricsWriter
+from .chain_codes import context_chain_codes
+
+logger = logging.getLogger(__name__)
+
+def collect_image_paths(source, pattern='*.png'):
+    """
+    Obtiene la lista ordenada de imágenes a analizar.
+
+    Args:
+        source: Directorio o patrón glob (p. ej. 'masks/**/*.png')
+        pattern: Patrón de archivos cuando `source` es un directorio
+
+    Returns:
+        list: Rutas de las imágenes encontradas
+    """
+    if os.path.isdir(source):
+        source = os.path.join(source, pattern)
+    return sorted(glob.glob(source, recursive=True))
+
+def analyze_case(name, image, profile=False, chain_codes=False):
+    """
+    Calcula métricas, conectividad, códigos e igualdades de una imagen.
+
+    El resultado no incluye la imagen ni el campo vectorial para que sea
+    barato de enviar entre procesos; el número de píxeles se guarda en
+    'pixels' para save_metrics_to_csv.
+
+    Args:
+        name: Nombre del caso
+        image: Imagen binaria donde 1=material, 0=poro
+        profile: Si se miden las etapas (resultado en 'timings')
+        chain_codes: Si se añaden en 'chain_codes' los códigos empaquetados
+                     con un tramo por contorno (context_chain_codes), que
+                     solo se pueden obtener mientras existe el contexto
+
+    Returns:
+        dict: Resultados del análisis
+    """
+    profiler = StageProfiler(enabled=profile)
+    result = _analyze_case(name, image, profiler, chain_codes)
+    if profile:
+        result['timings'] = profiler.close()
+    return result
+
+def _analyze_case(name, image, profiler, chain_codes=False):
+    """Análisis de analyze_case con cada etapa medida por `profiler`"""
+    ctx = AnalysisContext(image)
+    warm_context(ctx, profiler)
+
+    with profiler.stage('metrics'):
+        metrics = compute_all_metrics(ctx)
+    with profiler.stage('connectivity'):
+        connectivity = analyze_connectivity(ctx)
+
+    with profiler.stage('equalities'):
+        metrics['freeman_chain'] = {
+            'euler_from_chain_rotation': compute_euler_from_freeman_chain(ctx.f8)
+        }
+        equalities = verify_euler_equalities(metrics)
+
+    result = {
+        'name': name,
+        'pixels': np.sum(image),
+        'metrics': metrics,
+        'connectivity': connectivity,
+        'codes': {
+            'f8': ctx.f8,
+            'f4': ctx.f4,
+            'vcc': ctx.vcc['code_string'],
+            'ot3': ctx.ot3['code_string']
+        },
+        'equalities': equalities
+    }
+    if chain_codes:
+        with profiler.stage('chain_codes'):
+            result['chain_codes'] = context_chain_codes(ctx)
+    return result
+
+def cache_entry(result, binary_image):
+    """Parte de un resultado que se guarda en la caché, con la máscara preprocesada empaquetada"""
+    entry = {key: result[key] for key in CACHED_KEYS}
+    entry['mask'] = BinaryMask.from_array(binary_image)
+    return entry
+
+def result_summary(result):
+    """
+    Parte de un resultado que se conserva en memoria cuando sus métricas ya
+    se han escrito: nombre, métricas escalares (las del gráfico comparativo),
+    longitud de cada código y, si existen, ruta, tiempos y acierto de caché.
+    """
+    summary = {
+        'name': result['name'],
+        'metrics': {key: value for key, value in result['metrics'].items() if np.isscalar(value)},
+        'code_lengths': {key: len(result['codes'][key]) for key in ('f8', 'f4', 'vcc', 'ot3')}
+    }
+    for key in ('path', 'wall_time', 'timings', 'cache_hit'):
+        if key in result:
+            summary[key] = result[key]
+    return summary
+
+def analyze_image_file(image_path, threshold=127, profile=False, cache_path=None, chain_codes=False):
+    """
+    Lee, valida y preprocesa una imagen del disco y la analiza con analyze_case.
+
+    Args:
+        image_path: Ruta a la imagen binaria
+        threshold: Valor umbral para binarización (0-255)
+        profile: Si se miden las etapas (resultado en 'timings')
+        cache_path: Archivo de la caché de resultados (None = sin caché)
+        chain_codes: Si se añaden los códigos con un tramo por contorno
+                     (ver analyze_case)
+
+    Returns:
+        dict: Resultados del análisis con la ruta en 'path' y, si hay
+              caché, 'cache_hit' True/False
+    """
+    profiler = StageProfiler(enabled=profile)
+    try:
+        result = _analyze_image_file(image_path, threshold, profiler, cache_path, chain_codes)
+    finally:
+        profiler.close()
+
+    result['path'] = image_path
+    if profile:
+        result['timings'] = profiler.timings
+    return result
+
+def _analyze_image_file(image_path, threshold, profiler, cache_path, chain_codes=False):
+    """Análisis de analyze_image_file con cada etapa medida por `profiler`"""
+    name = os.path.splitext(os.path.basename(image_path))[0]
+
+    with profiler.stage('read'):
+        binary_image = read_binary_image(image_path, threshold=threshold)
+
+    # Con caché, la máscara binarizada decide si hace falta analizar
+    if cache_path is not None:
+        with profiler.stage('cache'):
+            cache = open_cache(cache_path)
+            key = mask_key(binary_image, threshold)
+            entry = cache.get(key)
+        if entry is not None:
+            result = {'name': name, **{k: entry[k] for k in CACHED_KEYS}, 'cache_hit': True}
+            if chain_codes:
+                # La caché guarda la máscara preprocesada: los contornos se recuperan de ella
+                with profiler.stage('chain_codes'):
+                    result['chain_codes'] = context_chain_codes(entry['mask'])
+            return result
+
+    with profiler.stage('validate'):
+        if not validate_binary_image(binary_image):
+            raise ValueError(f"La imagen no es válida para análisis topológico: {image_path}")
+    with profiler.stage('preprocess'):
+        binary_image = preprocess_binary_image(binary_image)
+
+    result = _analyze_case(name, binary_image, profiler, chain_codes)
+
+    if cache_path is not None:
+        with profiler.stage('cache'):
+            cache.put(key, cache_entry(result, binary_image))
+        result['cache_hit'] = False
+    return result
+
+def _analyze_chunk(task, chunk):
+    """Analiza un lote de argumentos en un proceso trabajador midiendo cada imagen"""
+    results = []
+    for args in chunk:
+        start = time.perf_counter()
+        try:
+            result = task(*args)
+        except Exception as e:
+            result = {'name': str(args[0]), 'error': str(e)}
+        result['wall_time'] = time.perf_counter() - start
+        results.append(result)
+    return results
+
+def iter_batch_results(task, items, workers=None, chunksize=1, ordered=True):
+    """
+    Ejecuta `task(*args)` para cada tupla de `items` en un ProcessPoolExecutor
+    y devuelve los resultados en el orden de `items` (o en orden de
+    finalización con ordered=False).
+
+    Args:
+        task: Función a nivel de módulo (serializable) que analiza un elemento
+        items: Iterable de tuplas de argumentos para `task`
+        workers: Número de procesos (None = número de CPUs)
+        chunksize: Número de elementos enviados a cada proceso por tarea
+        ordered: Si los resultados se devuelven en el orden de envío
+
+    Los lotes se leen de `items` a medida que se envían, con como mucho
+    2 * workers lotes en curso o terminados esperando su turno, de modo que
+    ni los argumentos ni los resultados pendientes crecen con el tamaño del
+    lote completo.
+
+    Yields:
+        dict: Resultado de cada elemento, con 'wall_time' en segundos y
+              'error' si el análisis falló
+    """
+    items = iter(items)
+    max_pending = 2 * (workers or os.cpu_count())
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = {}   # futuro -> índice del lote
+        finished = {}  # índice -> resultados de un lote terminado antes que los anteriores
+        submitted = next_index = 0
+        while True:
+            while len(pending) + len(finished) < max_pending:
+                chunk = list(islice(items, chunksize))
+                if not chunk:
+                    break
+                pending[executor.submit(_analyze_chunk, task, chunk)] = submitted
+                submitted += 1
+            if not pending:
+                break
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                index = pending.pop(future)
+                if ordered:
+                    finished[index] = future.result()
+                else:
+                    yield from future.result()
+            while next_index in finished:
+                yield from finished.pop(next_index)
+                next_index += 1
+
+def run_batch(source, save_path, workers=None, chunksize=1, threshold=127, pattern='*.png',
+              profile=False, cache_path=None, plots_dir=None, columnar_path=None, codes_dir=None):
+    """
+    Analiza en paralelo todas las imágenes de un directorio o patrón glob y
+    añade las métricas de cada una al CSV (MetricsCSVWriter) a medida que
+    llegan, en el orden de las rutas.
+
+    Args:
+        source: Directorio o patrón glob de imágenes
+        save_path: Ruta del archivo CSV de salida
+        workers: Número de procesos (None = número de CPUs)
+        chunksize: Número de imágenes enviadas a cada proceso por tarea
+        threshold: Valor umbral para binarización (0-255)
+        pattern: Patrón de archivos cuando `source` es un directorio
+        profile: Si se miden las etapas de cada imagen y se registra el
+                 reporte agregado por etapa
+        cache_path: Archivo de la caché de resultados compartida por los
+                    procesos (None = sin caché)
+        plots_dir: Directorio de las figuras de cada imagen (None = sin
+                   figuras); se dibujan en RenderPipeline mientras sigue el
+                   análisis y se esperan después de guardar las métricas
+        columnar_path: Archivo Parquet (o .arrow/.feather) donde se añaden
+                       las métricas a medida que llegan (None = solo CSV)
+        codes_dir: Directorio de los códigos empaquetados de cada imagen; el
+                   CSV los referencia en lugar de copiar las cadenas
+
+    Returns:
+        list: Resultados de las imágenes analizadas correctamente; con
+              `columnar_path`, solo su result_summary
+    """
+    paths = collect_image_paths(source, pattern)
+    if not paths:
+        raise ValueError(f"No se encontraron imágenes en: {source}")
+
+    logger.info("\nAnálisis por lotes: %d imágenes, %d procesos, lotes de %d",
+                len(paths), workers or os.cpu_count(), chunksize)
+    logger.info("=" * 80)
+
+    results = []
+    errors = []
+    start = time.perf_counter()
+    # Con codes_dir, cada proceso empaqueta los códigos por contorno mientras tiene el contexto
+    items = ((path, threshold, profile, cache_path, codes_dir is not None) for path in paths)
+    pipeline = RenderPipeline(plots_dir) if plots_dir is not None else None
+    writer = MetricsWriter(columnar_path) if columnar_path is not None else None
+    csv_writer = MetricsCSVWriter(save_path, codes_dir=codes_dir)
+
+    for i, result in enumerate(iter_batch_results(analyze_image_file, items, workers, chunksize), 1):
+        if 'error' in result:
+            errors.append(result)
+            logger.warning("[%d/%d] %s: ERROR %s", i, len(paths), result['name'], result['error'])
+            continue
+        logger.info("[%d/%d] %s: %.3f s%s", i, len(paths), result['name'], result['wall_time'],
+                    " (caché)" if result.get('cache_hit') else "")
+        csv_writer.write(result)
+        if pipeline is not None:
+            pipeline.submit(result)
+        if writer is not None:
+            # Las métricas ya están en disco: solo se guarda lo que usan el
+            # resumen y el gráfico comparativo
+            writer.write(result)
+            result = result_summary(result)
+        results.append(result)
+
+    csv_writer.close()
+    if writer is not None:
+        writer.close()
+    elapsed = time.perf_counter() - start
+
+    logger.info("\nImágenes analizadas: %d, errores: %d, tiempo: %.2f s",
+                len(results), len(errors), elapsed)
+
+    if cache_path is not None:
+        hits = sum(1 for r in results if r.get('cache_hit'))
+        logger.info("Caché: %d aciertos, %d fallos (%.0f%%)", hits, len(results) - hits,
+                    100 * hits / len(results) if results else 0.0)
+
+    if profile:
+        log_timings_report(results)
+
+    if pipeline is not None:
+        if results:
+            pipeline.submit_comparison(results, os.path.join(plots_dir, 'comparison.png'))
+        logger.info("Figuras guardadas: %d en %s", len(pipeline.close()), plots_dir)
+
+    return results
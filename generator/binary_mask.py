@@ -0,0 +1,173 @@
+import numpy as np
+
+# Número de bits activos de cada byte (para numpy sin np.bitwise_count)
+POPCOUNT_TABLE = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1).sum(axis=1).astype(np.uint8)
+
+def popcount(packed, axis=None):
+    """
+    Cuenta los bits activos de un array de bytes.
+
+    Args:
+        packed: Array uint8
+        axis: Ejes sobre los que sumar (None = todo el array)
+
+    Returns:
+        int o numpy.ndarray: Número de bits a 1 (array si se indica `axis`)
+    """
+    if hasattr(np, 'bitwise_count'):
+        counts = np.bitwise_count(packed)
+    else:
+        counts = POPCOUNT_TABLE[packed]
+    if axis is None:
+        return int(counts.sum(dtype=np.int64))
+    return counts.sum(axis=axis, dtype=np.int64)
+
+def shift_right(packed):
+    """
+    Desplaza cada fila empaquetada (último eje) un píxel hacia la derecha
+    (el píxel j pasa a la posición j+1); entra un cero por la izquierda.
+    El último píxel pasa al primer bit de relleno si lo hay: quien necesite
+    el relleno a cero debe combinar el resultado con AND con una máscara.
+    """
+    shifted = packed >> 1
+    shifted[..., 1:] |= (packed[..., :-1] & 1) << 7
+    return shifted
+
+def shift_left(packed):
+    """
+    Desplaza cada fila empaquetada (último eje) un píxel hacia la izquierda
+    (el píxel j pasa a la posición j-1); entra un cero por la derecha.
+    """
+    shifted = packed << 1
+    shifted[..., :-1] |= packed[..., 1:] >> 7
+    return shifted
+
+class BinaryMask:
+    """
+    Máscara binaria con las filas empaquetadas en bits (np.packbits, 8 píxeles
+    por byte): ocupa 8 veces menos que un array uint8/bool y 64 veces menos
+    que uno float64.
+
+    Las cuentas topológicas (área, pares de vecinos, V/E/F, perímetro) se
+    hacen directamente sobre los bytes con desplazamientos y AND. Los bits de
+    relleno al final de cada fila son siempre cero, de modo que actúan como
+    el fondo que rodea la imagen.
+
+    Para los consumidores que necesitan píxeles (OpenCV, scipy), unpack()
+    desempaqueta una sola vez y guarda el resultado, y as_uint8() lo expone
+    como uint8 sin copiarlo.
+
+    Args:
+        packed: Filas empaquetadas, array uint8 de (alto, ceil(ancho/8))
+        shape: (alto, ancho) de la imagen
+    """
+
+    def __init__(self, packed, shape):
+        self.packed = np.ascontiguousarray(packed, dtype=np.uint8)
+        self.shape = tuple(shape)
+        self._unpacked = None
+
+        if self.packed.shape != (self.shape[0], (self.shape[1] + 7) // 8):
+            raise ValueError(f"Las filas empaquetadas {self.packed.shape} no corresponden a la forma {self.shape}")
+
+    def __getstate__(self):
+        # No se serializa la copia desempaquetada
+        return {'packed': self.packed, 'shape': self.shape}
+
+    def __setstate__(self, state):
+        self.packed = state['packed']
+        self.shape = state['shape']
+        self._unpacked = None
+
+    @classmethod
+    def from_array(cls, image, threshold=0.5):
+        """
+        Binariza (píxel activo si > threshold) y empaqueta una imagen 2D.
+
+        Args:
+            image: Imagen 2D de cualquier tipo numérico o booleano
+            threshold: Umbral de binarización
+
+        Returns:
+            BinaryMask: Máscara empaquetada
+        """
+        image = np.asarray(image)
+        binary = image if image.dtype == bool else image > threshold
+        return cls(np.packbits(binary, axis=1), binary.shape)
+
+    @property
+    def size(self):
+        return self.shape[0] * self.shape[1]
+
+    @property
+    def nbytes(self):
+        return self.packed.nbytes
+
+    @property
+    def area(self):
+        """Número de píxeles activos"""
+        return popcount(self.packed)
+
+    def unpack(self):
+        """Máscara booleana (alto, ancho), desempaquetada una sola vez"""
+        if self._unpacked is None:
+            self._unpacked = np.unpackbits(self.packed, axis=1, count=self.shape[1]).view(bool)
+        return self._unpacked
+
+    def as_uint8(self):
+        """Vista uint8 (0/1) de unpack() sin copia, para OpenCV y scipy"""
+        return self.unpack().view(np.uint8)
+
+    def __array__(self, dtype=None, copy=None):
+        unpacked = self.unpack()
+        return unpacked if dtype is None else unpacked.astype(dtype)
+
+    def horizontal_pairs(self):
+        """Número de pares de píxeles activos adyacentes en horizontal"""
+        return popcount(self.packed & shift_right(self.packed))
+
+    def vertical_pairs(self):
+        """Número de pares de píxeles activos adyacentes en vertical"""
+        return popcount(self.packed[:-1] & self.packed[1:])
+
+    def vertices_edges_faces(self):
+        """
+        Cuenta V, E y F del complejo celular de la máscara, con los mismos
+        criterios que count_vertices_edges_faces_corrected.
+
+        - F: píxeles activos
+        - E: aristas de la retícula que tocan algún píxel activo; cada píxel
+          aporta 4 y cada par de vecinos activos comparte una, E = 4F - pares
+        - V: vértices de la retícula con algún píxel activo en el bloque 2x2
+          que los rodea (OR de cada fila con su desplazada y de filas vecinas)
+
+        Returns:
+            tuple: (V, E, F)
+        """
+        F = self.area
+        if F == 0:
+            return 0, 0, 0
+        E = 4 * F - self.horizontal_pairs() - self.vertical_pairs()
+
+        # Un byte más por fila para el vértice a la derecha del último píxel
+        extended = np.pad(self.packed, ((0, 0), (0, 1)))
+        row_or = extended | shift_right(extended)
+        V = (popcount(row_or[0]) + popcount(row_or[-1]) +
+             popcount(row_or[:-1] | row_or[1:]))
+
+        return V, E, F
+
+    def perimeter(self):
+        """
+        Píxeles activos con algún 4-vecino inactivo o en el borde de la imagen,
+        igual que binary_img & ~binary_erosion(binary_img).
+
+        Returns:
+            int: Número de píxeles de borde
+        """
+        packed = self.packed
+        interior = packed & shift_right(packed) & shift_left(packed)
+        interior[0] = 0
+        interior[-1] = 0
+        interior[1:-1] &= packed[:-2] & packed[2:]
+        return self.area - popcount(interior)
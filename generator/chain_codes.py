@@ -0,0 +1,297 @@
+import os
+import struct
+import numpy as np
+from .analysis_context import as_context
+from .topology_codes_extended import string_to_chains, chains_to_string, vcc_chains_to_3ot
+
+# Bits por símbolo y divisor de cada código: F4 solo usa 0, 2, 4 y 6,
+# así que se guarda dividido entre 2 en 2 bits
+CODE_BITS = {
+    'f8': (3, 1),
+    'f4': (2, 2),
+    'vcc': (2, 1),
+    'ot3': (2, 1),
+}
+CODE_KINDS = tuple(CODE_BITS)
+
+# Cabecera del formato binario (little-endian): firma, tipo de código,
+# indicadores de arrays opcionales, número de contornos y de símbolos
+MAGIC = b'CHC1'
+HEADER = struct.Struct('<4sBBIQ')
+HAS_STARTS = 1
+HAS_PARENTS = 2
+
+def _symbols(code):
+    """Símbolos de un código (cadena o lista de arrays por contorno) en un único array uint8"""
+    chains = string_to_chains(code)
+    if not len(chains):
+        return np.zeros(0, dtype=np.uint8)
+    return np.concatenate(chains).astype(np.uint8, copy=False)
+
+def pack_code(code, bits, scale=1):
+    """
+    Empaqueta los símbolos de un código en `bits` bits por símbolo.
+
+    Args:
+        code: Código (cadena de dígitos o lista de arrays por contorno)
+        bits: Bits por símbolo
+        scale: Divisor de los símbolos antes de empaquetar
+
+    Returns:
+        tuple: (bytes empaquetados, número de símbolos)
+    """
+    symbols = _symbols(code)
+    if scale != 1:
+        symbols = symbols // scale
+    shifts = np.arange(bits - 1, -1, -1, dtype=np.uint8)
+    planes = (symbols[:, None] >> shifts) & 1
+    return np.packbits(planes.ravel()).tobytes(), int(symbols.size)
+
+def unpack_symbols(data, bits, scale=1, start=0, stop=0):
+    """
+    Desempaqueta los símbolos [start, stop) de `data` de forma vectorizada.
+
+    Returns:
+        numpy.ndarray: Símbolos uint8
+    """
+    bit0, bit1 = start * bits, stop * bits
+    raw = np.frombuffer(data, dtype=np.uint8, count=-(-bit1 // 8) - bit0 // 8, offset=bit0 // 8)
+    planes = np.unpackbits(raw)[bit0 % 8:bit0 % 8 + bit1 - bit0].reshape(-1, bits)
+    symbols = (planes @ (1 << np.arange(bits - 1, -1, -1))).astype(np.uint8)
+    return symbols * np.uint8(scale) if scale != 1 else symbols
+
+def unpack_code(data, length, bits, scale=1):
+    """
+    Inversa de pack_code.
+
+    Returns:
+        str: Código como cadena de dígitos
+    """
+    return (unpack_symbols(data, bits, scale, 0, length) + ord('0')).tobytes().decode('ascii')
+
+class ChainCode:
+    """
+    Código de cadena (F8, F4, VCC o 3OT) empaquetado a 2-3 bits por símbolo,
+    con el desplazamiento de cada contorno y, si se conocen, el píxel inicial
+    (x, y) de cada contorno y el índice de su contorno padre en la jerarquía
+    (-1 si no tiene).
+
+    str(código) da la misma cadena que get_f8_code / compute_vcc /
+    compute_3ot, y tobytes()/frombytes() lo guardan en un formato binario
+    compacto sin pérdida.
+
+    Args:
+        kind: Tipo de código ('f8', 'f4', 'vcc' u 'ot3')
+        data: Símbolos empaquetados (pack_code)
+        offsets: Inicio de cada contorno en símbolos, más el total al final
+        starts: Array (n, 2) con el píxel inicial de cada contorno (opcional)
+        parents: Array (n,) con el contorno padre de cada contorno (opcional)
+    """
+
+    def __init__(self, kind, data, offsets, starts=None, parents=None):
+        if kind not in CODE_BITS:
+            raise ValueError(f"Tipo de código '{kind}' no válido. Use uno de {', '.join(CODE_KINDS)}.")
+        self.kind = kind
+        self.bits, self.scale = CODE_BITS[kind]
+        self.data = bytes(data)
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+        self.starts = None if starts is None else np.asarray(starts, dtype=np.int32).reshape(-1, 2)
+        self.parents = None if parents is None else np.asarray(parents, dtype=np.int32)
+
+    @classmethod
+    def from_chains(cls, kind, chains, starts=None, parents=None):
+        """Crea el código a partir de un array uint8 por contorno"""
+        offsets = np.zeros(len(chains) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum([chain.size for chain in chains])
+        data, _ = pack_code(chains, *CODE_BITS[kind])
+        return cls(kind, data, offsets, starts, parents)
+
+    @classmethod
+    def from_string(cls, kind, code):
+        """Crea el código a partir de una cadena de dígitos (un único contorno)"""
+        return cls.from_chains(kind, string_to_chains(code))
+
+    @classmethod
+    def from_context(cls, binary_image, kind='f8'):
+        """
+        Crea el código de una imagen con un tramo por contorno. El F8 guarda
+        además el píxel inicial y el padre de cada contorno; los contornos
+        descartados en get_f8_contours se saltan al buscar el padre.
+
+        Args:
+            binary_image: Imagen binaria, BinaryMask o AnalysisContext
+            kind: Tipo de código
+        """
+        ctx = as_context(binary_image)
+        if kind != 'f8':
+            chains = {'f4': lambda: ctx.f4_chains,
+                      'vcc': lambda: ctx.vcc_chains,
+                      'ot3': lambda: vcc_chains_to_3ot(ctx.vcc_chains)}[kind]()
+            return cls.from_chains(kind, chains)
+
+        chains, indices = ctx.f8_contours
+        contours, hierarchy = ctx.contours
+        starts = np.array([contours[i][0, 0] for i in indices], dtype=np.int32).reshape(-1, 2)
+
+        position = np.full(len(contours), -1, dtype=np.int32)
+        position[indices] = np.arange(len(indices))
+        parent_of = hierarchy[0][:, 3] if hierarchy is not None else np.zeros(0, dtype=np.int32)
+        parents = np.full(len(indices), -1, dtype=np.int32)
+        for k, i in enumerate(indices):
+            j = parent_of[i]
+            while j != -1 and position[j] == -1:
+                j = parent_of[j]
+            parents[k] = position[j] if j != -1 else -1
+        return cls.from_chains('f8', chains, starts, parents)
+
+    @property
+    def num_contours(self):
+        return len(self.offsets) - 1
+
+    def __len__(self):
+        return int(self.offsets[-1])
+
+    def decode(self):
+        """Todos los símbolos del código como un array uint8"""
+        return unpack_symbols(self.data, self.bits, self.scale, 0, len(self))
+
+    def chains(self):
+        """Un array uint8 por contorno"""
+        return np.split(self.decode(), self.offsets[1:-1])
+
+    def __getitem__(self, index):
+        """Símbolos del contorno `index` (solo desempaqueta ese tramo)"""
+        start, stop = self.offsets[index], self.offsets[index + 1]
+        return unpack_symbols(self.data, self.bits, self.scale, int(start), int(stop))
+
+    def __str__(self):
+        return chains_to_string([self.decode()]) if len(self) else ''
+
+    def __repr__(self):
+        return (f"ChainCode(kind={self.kind!r}, symbols={len(self)}, contours={self.num_contours}, "
+                f"bytes={len(self.data)})")
+
+    def __eq__(self, other):
+        if not isinstance(other, ChainCode):
+            return NotImplemented
+        return (self.kind == other.kind and self.data == other.data
+                and np.array_equal(self.offsets, other.offsets)
+                and _same_optional(self.starts, other.starts)
+                and _same_optional(self.parents, other.parents))
+
+    def tobytes(self):
+        """
+        Formato binario: cabecera, longitud de cada contorno (uint32), píxeles
+        iniciales y padres (int32, si existen) y los símbolos empaquetados.
+        """
+        flags = (HAS_STARTS if self.starts is not None else 0) | (HAS_PARENTS if self.parents is not None else 0)
+        parts = [HEADER.pack(MAGIC, CODE_KINDS.index(self.kind), flags, self.num_contours, len(self)),
+                 np.diff(self.offsets).astype('<u4').tobytes()]
+        if self.starts is not None:
+            parts.append(self.starts.astype('<i4').tobytes())
+        if self.parents is not None:
+            parts.append(self.parents.astype('<i4').tobytes())
+        parts.append(self.data)
+        return b''.join(parts)
+
+    @classmethod
+    def read(cls, buffer, offset=0):
+        """
+        Lee un código de `buffer` a partir de `offset`.
+
+        Returns:
+            tuple: (ChainCode, posición siguiente al código)
+        """
+        magic, kind, flags, n, length = HEADER.unpack_from(buffer, offset)
+        if magic != MAGIC:
+            raise ValueError("Los datos no son un código de cadena empaquetado")
+        kind = CODE_KINDS[kind]
+        offset += HEADER.size
+
+        lengths = np.frombuffer(buffer, dtype='<u4', count=n, offset=offset)
+        offset += 4 * n
+        offsets = np.zeros(n + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum(lengths)
+
+        starts = parents = None
+        if flags & HAS_STARTS:
+            starts = np.frombuffer(buffer, dtype='<i4', count=2 * n, offset=offset)
+            offset += 8 * n
+        if flags & HAS_PARENTS:
+            parents = np.frombuffer(buffer, dtype='<i4', count=n, offset=offset)
+            offset += 4 * n
+
+        size = -(-length * CODE_BITS[kind][0] // 8)
+        data = bytes(buffer[offset:offset + size])
+        return cls(kind, data, offsets, starts, parents), offset + size
+
+    @classmethod
+    def frombytes(cls, buffer):
+        """Inversa de tobytes()"""
+        return cls.read(buffer)[0]
+
+def _same_optional(a, b):
+    if a is None or b is None:
+        return a is None and b is None
+    return np.array_equal(a, b)
+
+def context_chain_codes(binary_image):
+    """
+    Los cuatro códigos de una imagen con ChainCode.from_context.
+
+    Args:
+        binary_image: Imagen binaria, BinaryMask o AnalysisContext
+
+    Returns:
+        dict: Tipo de código -> ChainCode
+    """
+    ctx = as_context(binary_image)
+    return {kind: ChainCode.from_context(ctx, kind) for kind in CODE_KINDS}
+
+def case_chain_codes(case):
+    """
+    Códigos de un resultado como ChainCode. Los de 'chain_codes' (creados
+    mientras el contexto del análisis existía) y los de TopologyCodes
+    conservan un tramo por contorno (y píxel inicial y padre en F8); con
+    solo las cadenas, cada código es un único tramo.
+
+    Returns:
+        dict: Tipo de código -> ChainCode
+    """
+    if 'chain_codes' in case:
+        return case['chain_codes']
+    codes = case['codes']
+    if hasattr(codes, 'chain_code'):
+        return {kind: codes.chain_code(kind) for kind in CODE_KINDS}
+    return {kind: ChainCode.from_string(kind, codes[kind]) for kind in CODE_KINDS}
+
+def save_chain_codes(path, codes):
+    """
+    Guarda varios códigos (p. ej. los de case_chain_codes) uno tras otro en un archivo.
+
+    Returns:
+        int: Bytes escritos
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    payload = b''.join(code.tobytes() for code in codes.values())
+    with open(path, 'wb') as f:
+        f.write(payload)
+    return len(payload)
+
+def load_chain_codes(path):
+    """
+    Lee un archivo de save_chain_codes.
+
+    Returns:
+        dict: Tipo de código -> ChainCode
+    """
+    with open(path, 'rb') as f:
+        buffer = f.read()
+    codes = {}
+    offset = 0
+    while offset < len(buffer):
+        code, offset = ChainCode.read(buffer, offset)
+        codes[code.kind] = code
+    return codes
@@ -0,0 +1,167 @@
+import os
+import sys
+import logging
+import numpy as np
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config.topology_config import COLUMNAR_CONFIG
+from .visualizer import metrics_record
+from .chain_codes import CODE_BITS, pack_code, unpack_code
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    import pyarrow.ipc as ipc
+except ImportError:  # dependencia opcional: exportación Parquet / Arrow IPC
+    pa = None
+
+logger = logging.getLogger(__name__)
+
+# Columnas siempre reales, aunque la primera fila tenga un valor entero
+FLOAT_COLUMNS = ('vcc_x', '3ot_x', 'euler_freeman')
+
+# Extensiones escritas como Arrow IPC (Feather v2); el resto, Parquet
+IPC_EXTENSIONS = ('.arrow', '.feather', '.ipc')
+
+def _code_columns(case):
+    """Columnas codigo_<k> (binario empaquetado) y longitud_<k> de un caso"""
+    columns = {}
+    for key, (bits, scale) in CODE_BITS.items():
+        data, length = pack_code(case['codes'][key], bits, scale)
+        columns[f'codigo_{key}'] = data
+        columns[f'longitud_{key}'] = length
+    return columns
+
+def _schema(record):
+    """
+    Esquema con tipos fijos a partir de la primera fila: enteros int64,
+    reales float64, 'imagen' como texto y los códigos como binario.
+    """
+    fields = []
+    for name, value in record.items():
+        if name == 'imagen':
+            fields.append(pa.field(name, pa.string()))
+        elif name.startswith('codigo_'):
+            fields.append(pa.field(name, pa.binary()))
+        elif name in FLOAT_COLUMNS or name.startswith(('t_', 'cpu_')):
+            fields.append(pa.field(name, pa.float64()))
+        elif isinstance(value, (bool, np.bool_)):
+            fields.append(pa.field(name, pa.bool_()))
+        elif isinstance(value, (int, np.integer)):
+            fields.append(pa.field(name, pa.int64()))
+        else:
+            fields.append(pa.field(name, pa.float64()))
+    return pa.schema(fields)
+
+class MetricsWriter:
+    """
+    Escritor columnar de métricas: Parquet (o Arrow IPC si la ruta termina en
+    .arrow/.feather/.ipc) con columnas numéricas tipadas y los códigos
+    F8/F4/VCC/3OT empaquetados a 2-3 bits por símbolo en columnas binarias,
+    junto a su longitud en símbolos.
+
+    Las filas se acumulan hasta `row_group_size` y se escriben como un grupo
+    de filas, de modo que un lote largo no guarda los resultados en memoria
+    hasta el final. El esquema se fija con la primera fila: las columnas que
+    falten en filas posteriores quedan nulas.
+
+    Args:
+        save_path: Ruta del archivo de salida
+        row_group_size: Filas por grupo (por defecto COLUMNAR_CONFIG['row_group_size'])
+        codes: Si se guardan los códigos (por defecto COLUMNAR_CONFIG['codes'])
+    """
+
+    def __init__(self, save_path, row_group_size=None, codes=None):
+        if pa is None:
+            raise ImportError("La exportación columnar necesita pyarrow (pip install pyarrow)")
+        self.save_path = save_path
+        self.row_group_size = row_group_size or COLUMNAR_CONFIG['row_group_size']
+        self.codes = COLUMNAR_CONFIG['codes'] if codes is None else codes
+        self.rows_written = 0
+        self.schema = None
+        self._rows = []
+        self._writer = None
+
+        directory = os.path.dirname(save_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def write(self, case):
+        """Añade la fila de un caso; escribe un grupo de filas si se completa"""
+        record = metrics_record(case)
+        if self.codes:
+            record.update(_code_columns(case))
+        self._rows.append(record)
+        if len(self._rows) >= self.row_group_size:
+            self.flush()
+
+    def flush(self):
+        """Escribe las filas pendientes como un grupo de filas"""
+        if not self._rows:
+            return
+        if self._writer is None:
+            self.schema = _schema(self._rows[0])
+            if self.save_path.lower().endswith(IPC_EXTENSIONS):
+                self._writer = ipc.new_file(self.save_path, self.schema)
+            else:
+                self._writer = pq.ParquetWriter(self.save_path, self.schema,
+                                                compression=COLUMNAR_CONFIG['compression'])
+        self._writer.write_table(pa.Table.from_pylist(self._rows, schema=self.schema))
+        self.rows_written += len(self._rows)
+        self._rows = []
+
+    def close(self):
+        """Escribe lo pendiente y cierra el archivo"""
+        self.flush()
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+            logger.info("Métricas columnares guardadas en: %s (%d filas)", self.save_path, self.rows_written)
+
+def save_metrics_columnar(cases_data, save_path, row_group_size=None):
+    """
+    Guarda las métricas de `cases_data` con MetricsWriter.
+
+    Args:
+        cases_data: Iterable con datos de casos
+        save_path: Ruta .parquet (o .arrow/.feather)
+        row_group_size: Filas por grupo
+    """
+    with MetricsWriter(save_path, row_group_size) as writer:
+        for case in cases_data:
+            writer.write(case)
+
+def read_metrics_columnar(path, decode_codes=False, columns=None):
+    """
+    Lee un archivo de MetricsWriter en un DataFrame.
+
+    Args:
+        path: Ruta .parquet (o .arrow/.feather)
+        decode_codes: Si se convierten los códigos empaquetados en cadenas
+        columns: Columnas a leer (None = todas)
+
+    Returns:
+        pandas.DataFrame: Una fila por imagen
+    """
+    if pa is None:
+        raise ImportError("La lectura columnar necesita pyarrow (pip install pyarrow)")
+    if path.lower().endswith(IPC_EXTENSIONS):
+        with ipc.open_file(path) as reader:
+            table = reader.read_all()
+        if columns is not None:
+            table = table.select(columns)
+    else:
+        table = pq.read_table(path, columns=columns)
+    df = table.to_pandas()
+
+    if decode_codes:
+        for key, (bits, scale) in CODE_BITS.items():
+            column, length = f'codigo_{key}', f'longitud_{key}'
+            if column in df and length in df:
+                df[column] = [unpack_code(data, n, bits, scale) for data, n in zip(df[column], df[length])]
+    return df
@@ -1,5 +1,5 @@
 import numpy as np
-from scipy.ndimage import gaussian_filter
+from scipy.ndimage import gaussian_filter, fourier_gaussian
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -454,33 +454,93 @@ def create_spiral_holes(size):
     
     return (field > 0.5).astype(float)
 
-def generate_vector_field(field):
+def downsample_field(field, factor):
     """
-    Genera un campo vectorial basado en el gradiente del campo escalar
+    Reduce un campo promediando bloques de factor x factor píxeles (el borde
+    se completa repitiendo la última fila/columna).
     
     Args:
         field: Campo escalar 2D
+        factor: Factor de reducción entero
         
     Returns:
-        Tupla (u, v) con componentes del campo vectorial
+        Campo float32 de tamaño ceil(h/factor) x ceil(w/factor)
     """
+    h, w = field.shape
+    rows, cols = -(-h // factor), -(-w // factor)
+    padded = np.pad(field, ((0, rows * factor - h), (0, cols * factor - w)), mode='edge')
+    return padded.reshape(rows, factor, cols, factor).mean(axis=(1, 3), dtype=np.float32)
+
+def smooth_field(field, sigma):
+    """
+    Suavizado gaussiano. Para sigma >= TOPOLOGY_CONFIG['fft_sigma'] se hace
+    en el dominio de la frecuencia, cuyo coste no depende de sigma; el borde
+    se refleja igual que en gaussian_filter.
+    
+    Args:
+        field: Campo escalar 2D float32
+        sigma: Desviación estándar en píxeles
+        
+    Returns:
+        Campo suavizado float32
+    """
+    if sigma < TOPOLOGY_CONFIG['fft_sigma']:
+        return gaussian_filter(field, sigma=sigma)
+    
+    pad = int(4 * sigma + 0.5)
+    padded = np.pad(field, pad, mode='symmetric')
+    spectrum = fourier_gaussian(np.fft.rfft2(padded), sigma=sigma, n=padded.shape[1])
+    smoothed = np.fft.irfft2(spectrum, s=padded.shape)
+    return smoothed[pad:pad + field.shape[0], pad:pad + field.shape[1]].astype(np.float32)
+
+def generate_vector_field(field, max_size=None, sigma=None):
+    """
+    Genera un campo vectorial basado en el gradiente del campo escalar.
+    
+    Con `max_size` el campo se calcula a la resolución a la que se va a
+    dibujar: el campo escalar se reduce por bloques hasta que su lado mayor
+    no supera `max_size` y sigma se escala en la misma proporción. La
+    reducción se limita para que el lado menor conserve al menos 2 píxeles
+    (np.gradient los necesita), así que una imagen muy estrecha puede
+    quedar por encima de `max_size`.
+    
+    Args:
+        field: Campo escalar 2D
+        max_size: Lado mayor del campo resultante en píxeles (None = resolución completa)
+        sigma: Suavizado en píxeles de la imagen original
+               (por defecto TOPOLOGY_CONFIG['vector_field_sigma'])
+        
+    Returns:
+        Tupla (u, v) con componentes float32 del campo vectorial
+    """
+    field = np.asarray(field, dtype=np.float32)
+    sigma = TOPOLOGY_CONFIG['vector_field_sigma'] if sigma is None else sigma
+    
+    # Reducir a la resolución de render
+    factor = 1 if max_size is None else max(1, -(-max(field.shape) // max_size))
+    factor = min(factor, max(1, min(field.shape) // 2))
+    if factor > 1:
+        field = downsample_field(field, factor)
+    
     # Suavizar el campo para mejores gradientes
-    smoothed_field = gaussian_filter(field.astype(float), sigma=2.0)
+    smoothed_field = smooth_field(field, sigma / factor)
     
     # Calcular gradiente
     grad_y, grad_x = np.gradient(smoothed_field)
     
     # Normalizar y añadir componente rotacional para visualización
-    norm = np.sqrt(grad_x**2 + grad_y**2) + 1e-8
+    norm = np.sqrt(grad_x**2 + grad_y**2) + np.float32(1e-8)
+    grad_x /= norm
+    grad_y /= norm
     
     # Campo vectorial normalizado con componente tangencial
-    u = grad_x / norm + 0.3 * (-grad_y / norm)
-    v = grad_y / norm + 0.3 * (grad_x / norm)
+    u = grad_x - np.float32(0.3) * grad_y
+    v = grad_y + np.float32(0.3) * grad_x
     
     # Aplicar máscara del campo original
     mask = field > 0.1
-    u = u * mask
-    v = v * mask
+    u *= mask
+    v *= mask
     
     return u, v
 
@@ -2,6 +2,23 @@ import numpy as np
 from PIL import Image
 import cv2
 import os
+import logging
+
+try:
+    import tifffile
+except ImportError:  # dependencia opcional: lectura de TIFF por bandas
+    tifffile = None
+
+logger = logging.getLogger(__name__)
+
+# Filas por bloque al leer imágenes por partes
+CHUNK_ROWS = 256
+
+# Ajustes de preprocess_binary_image (forman parte de la clave de la caché)
+PREPROCESS_SETTINGS = {
+    'kernel': (3, 3),
+    'operations': ('open', 'close'),
+}
 
 def read_binary_image(image_path, threshold=127):
     """
@@ -28,25 +45,192 @@ def read_binary_image(image_path, threshold=127):
                 img = img.convert('L')
             # Convertir a numpy array
             img_array = np.array(img)
-            print(f"Imagen leída exitosamente con PIL: {image_path}")
-            print(f"Dimensiones: {img_array.shape}")
+            logger.debug("Imagen leída exitosamente con PIL: %s", image_path)
+            logger.debug("Dimensiones: %s", img_array.shape)
     except Exception as e:
-        print(f"Error al leer con PIL: {str(e)}")
+        logger.warning("Error al leer con PIL: %s", e)
         try:
             # Intentar con OpenCV si PIL falla
             img = cv2.imread(str(image_path), cv2.IMREAD_GRAYSCALE)
             if img is None:
                 raise ValueError(f"OpenCV no pudo leer la imagen: {image_path}")
             img_array = img
-            print(f"Imagen leída exitosamente con OpenCV: {image_path}")
-            print(f"Dimensiones: {img_array.shape}")
+            logger.debug("Imagen leída exitosamente con OpenCV: %s", image_path)
+            logger.debug("Dimensiones: %s", img_array.shape)
         except Exception as e:
-            print(f"Error al leer con OpenCV: {str(e)}")
+            logger.error("Error al leer con OpenCV: %s", e)
             raise ValueError(f"No se pudo leer la imagen con ningún método. Ruta: {image_path}")
     
-    # Binarizar
-    binary_image = (img_array > threshold).astype(np.uint8)
+    # Binarizar: la máscara booleana se reinterpreta como uint8 sin otra copia
+    binary_image = (img_array > threshold).view(np.uint8)
+    
+    return binary_image
+
+def open_memmap_image(image_path, shape=None, dtype=np.uint8, offset=0):
+    """
+    Abre una máscara .npy o un archivo raw como array mapeado en memoria,
+    sin cargarla: solo se leen del disco las regiones que se indexan.
+    
+    Args:
+        image_path: Ruta a un archivo .npy o raw (filas contiguas)
+        shape: (alto, ancho) del archivo raw; se ignora para .npy
+        dtype: Tipo de dato de los píxeles del archivo raw
+        offset: Bytes de cabecera a saltar en el archivo raw
+        
+    Returns:
+        numpy.memmap: Imagen 2D de solo lectura
+    """
+    image_path = os.path.normpath(image_path)
+    
+    if not os.path.exists(image_path):
+        raise ValueError(f"La imagen no existe en la ruta: {image_path}")
+    
+    if image_path.lower().endswith('.npy'):
+        image = np.load(image_path, mmap_mode='r')
+    else:
+        if shape is None:
+            raise ValueError(f"Se necesita la forma (alto, ancho) para leer el archivo raw: {image_path}")
+        image = np.memmap(image_path, dtype=dtype, mode='r', offset=offset, shape=tuple(shape))
+    
+    if image.ndim != 2:
+        raise ValueError(f"La imagen debe ser 2D, tiene forma {image.shape}: {image_path}")
+    
+    logger.debug("Imagen mapeada en memoria: %s %s", image_path, image.shape)
+    return image
+
+def _to_gray(segment):
+    """Convierte un bloque (filas, columnas[, canales]) a escala de grises"""
+    if segment.ndim == 2:
+        return segment
+    if segment.shape[-1] == 1:
+        return segment[..., 0]
+    # Misma aritmética entera que PIL en convert('L') (pesos 0.299/0.587/0.114
+    # en punto fijo de 16 bits, con redondeo), de modo que la lectura por bandas
+    # binariza igual que read_binary_image
+    rgb = segment[..., :3].astype(np.uint32)
+    gray = (rgb[..., 0] * 19595 + rgb[..., 1] * 38470 + rgb[..., 2] * 7471 + 0x8000) >> 16
+    return gray.astype(segment.dtype)
+
+def _iter_tiff_bands(image_path, page):
+    """
+    Recorre una página TIFF banda a banda (tiras o filas de teselas) con
+    tifffile, en orden de filas. Las teselas o tiras vacías (sin datos en el
+    archivo) quedan con el valor de relleno de la página, como en
+    tifffile.imread.
+    """
+    with tifffile.TiffFile(image_path) as tif:
+        tiff_page = tif.pages[page]
+        height, width = tiff_page.shape[:2]
+        if tiff_page.is_tiled:
+            band_rows, segments_per_band = tiff_page.tilelength, -(-width // tiff_page.tilewidth)
+        else:
+            band_rows, segments_per_band = tiff_page.rowsperstrip or height, 1
+
+        # Los segmentos llegan en orden de posición en el archivo (las teselas
+        # vacías, primero): cada banda se completa aparte y se devuelve cuando
+        # lo están ella y las anteriores
+        bands, remaining = {}, {}
+        next_row = 0
+        for segment, indices, _ in tiff_page.segments(sort=True):
+            row, col = indices[-3], indices[-2]
+            if row not in bands:
+                bands[row] = np.full((min(band_rows, height - row), width), tiff_page.nodata,
+                                     dtype=tiff_page.dtype)
+                remaining[row] = segments_per_band
+            if segment is not None:
+                band = bands[row]
+                segment = _to_gray(segment[0])
+                cols = min(segment.shape[1], width - col)
+                band[:, col:col + cols] = segment[:band.shape[0], :cols]
+            remaining[row] -= 1
+            while remaining.get(next_row) == 0:
+                del remaining[next_row]
+                band = bands.pop(next_row)
+                yield next_row, band
+                next_row += band.shape[0]
+
+def _open_gray_chunks(image_path, chunk_rows, page, shape, dtype, offset):
+    """
+    Devuelve la forma de la imagen y un iterador perezoso de bloques de filas
+    en escala de grises, según el tipo de archivo.
+    """
+    extension = os.path.splitext(image_path)[1].lower()
+    
+    if extension == '.npy' or shape is not None:
+        image = open_memmap_image(image_path, shape=shape, dtype=dtype, offset=offset)
+        chunks = ((r0, image[r0:r0 + chunk_rows]) for r0 in range(0, image.shape[0], chunk_rows))
+        return image.shape, chunks
+    
+    if extension in ('.tif', '.tiff') and tifffile is not None:
+        with tifffile.TiffFile(image_path) as tif:
+            tiff_shape = tif.pages[page].shape[:2]
+        return tiff_shape, _iter_tiff_bands(image_path, page)
+    
+    # Resto de formatos (y TIFF sin tifffile): se decodifica una página entera
+    with Image.open(image_path) as img:
+        img.seek(page)
+        img_array = np.asarray(img.convert('L') if img.mode != 'L' else img)
+    chunks = ((r0, img_array[r0:r0 + chunk_rows]) for r0 in range(0, img_array.shape[0], chunk_rows))
+    return img_array.shape, chunks
+
+def iter_binary_chunks(image_path, threshold=127, chunk_rows=CHUNK_ROWS, page=0,
+                       shape=None, dtype=np.uint8, offset=0):
+    """
+    Lee una imagen por bloques de filas y binariza cada bloque por separado,
+    sin tener nunca la imagen completa en escala de grises en memoria
+    (salvo en formatos que solo se pueden decodificar enteros, como PNG).
+    
+    - .npy y raw (si se indica `shape`): np.memmap, bloques de `chunk_rows` filas
+    - TIFF con tifffile instalado: tira a tira o fila de teselas a fila de teselas
+    - Resto: página completa con PIL, binarizada por bloques
+    
+    Args:
+        image_path: Ruta a la imagen
+        threshold: Valor umbral para binarización (usar 0 para máscaras 0/1)
+        chunk_rows: Filas por bloque (los TIFF usan sus propias tiras)
+        page: Página de un TIFF multipágina
+        shape: (alto, ancho) de un archivo raw
+        dtype: Tipo de dato de los píxeles del archivo raw
+        offset: Bytes de cabecera a saltar en el archivo raw
+        
+    Yields:
+        tuple: (fila inicial, bloque booleano)
+    """
+    _, chunks = _open_gray_chunks(image_path, chunk_rows, page, shape, dtype, offset)
+    for r0, chunk in chunks:
+        yield r0, np.asarray(chunk) > threshold
+
+def read_binary_image_chunked(image_path, threshold=127, packed=False, chunk_rows=CHUNK_ROWS,
+                              page=0, shape=None, dtype=np.uint8, offset=0):
+    """
+    Lee una imagen completa con iter_binary_chunks sobre un único array de
+    salida reservado de antemano.
+    
+    Args:
+        image_path: Ruta a la imagen
+        threshold: Valor umbral para binarización (usar 0 para máscaras 0/1)
+        packed: Si True, devuelve los bits empaquetados por filas con
+                np.packbits (8 píxeles por byte); si False, un array bool
+        chunk_rows, page, shape, dtype, offset: Ver iter_binary_chunks
+        
+    Returns:
+        numpy.ndarray: Imagen bool (alto, ancho) o uint8 (alto, ceil(ancho/8))
+    """
+    image_path = os.path.normpath(image_path)
+    if not os.path.exists(image_path):
+        raise ValueError(f"La imagen no existe en la ruta: {image_path}")
+    
+    (height, width), chunks = _open_gray_chunks(image_path, chunk_rows, page, shape, dtype, offset)
+    if packed:
+        binary_image = np.empty((height, (width + 7) // 8), dtype=np.uint8)
+    else:
+        binary_image = np.empty((height, width), dtype=bool)
+    
+    for r0, chunk in chunks:
+        chunk = np.asarray(chunk) > threshold
+        binary_image[r0:r0 + chunk.shape[0]] = np.packbits(chunk, axis=1) if packed else chunk
     
+    logger.debug("Imagen leída por bloques: %s %s", image_path, (height, width))
     return binary_image
 
 def validate_binary_image(binary_image):
@@ -61,12 +245,12 @@ def validate_binary_image(binary_image):
     """
     # Verificar que sea un array de numpy
     if not isinstance(binary_image, np.ndarray):
-        print("Error: La imagen no es un array de numpy")
+        logger.warning("Error: La imagen no es un array de numpy")
         return False
     
     # Verificar que sea 2D
     if len(binary_image.shape) != 2:
-        print(f"Error: La imagen no es 2D. Forma actual: {binary_image.shape}")
+        logger.warning("Error: La imagen no es 2D. Forma actual: %s", binary_image.shape)
         return False
     
     # Verificar que solo contenga 0s y 1s
@@ -74,7 +258,7 @@ def validate_binary_image(binary_image):
     if not np.array_equal(unique_values, np.array([0, 1])) and \
        not np.array_equal(unique_values, np.array([0])) and \
        not np.array_equal(unique_values, np.array([1])):
-        print(f"Error: La imagen contiene valores no binarios. Valores encontrados: {unique_values}")
+        logger.warning("Error: La imagen contiene valores no binarios. Valores encontrados: %s", unique_values)
         return False
     
     return True
@@ -93,8 +277,9 @@ def preprocess_binary_image(binary_image):
     processed = binary_image.astype(bool).astype(np.uint8)
     
     # Eliminar ruido pequeño (opcional)
-    kernel = np.ones((3,3), np.uint8)
-    processed = cv2.morphologyEx(processed, cv2.MORPH_OPEN, kernel)
-    processed = cv2.morphologyEx(processed, cv2.MORPH_CLOSE, kernel)
+    kernel = np.ones(PREPROCESS_SETTINGS['kernel'], np.uint8)
+    operations = {'open': cv2.MORPH_OPEN, 'close': cv2.MORPH_CLOSE}
+    for operation in PREPROCESS_SETTINGS['operations']:
+        processed = cv2.morphologyEx(processed, operations[operation], kernel)
     
     return processed 
\ No newline at end of file
@@ -0,0 +1,241 @@
+import numpy as np
+from collections import deque
+from scipy import ndimage
+from .topology_metrics import validate_euler_formulas
+from .tiled_topology import TABLA_COMPLEJO_CELULAR, UnionFind, ESTRUCTURA_8
+
+# Desplazamientos de los 8 vecinos de un píxel
+VECINOS_8 = [(-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1)]
+
+class IncrementalTopology:
+    """
+    Mantiene V, E, F, χ y β₀ de una máscara mientras se cambian píxeles
+    sueltos, sin recalcular la imagen completa.
+
+    - V, E y F se actualizan en O(1) por píxel con los códigos de los cuatro
+      bloques 2x2 que contienen al píxel (TABLA_COMPLEJO_CELULAR), es decir,
+      mirando solo su vecindario 3x3.
+    - β₀ (conectividad-8 del material) se actualiza con union-find al añadir
+      píxeles. Al quitar un píxel cuyos vecinos activos no están conectados
+      entre sí dentro del vecindario 3x3, la componente puede partirse y se
+      reetiqueta localmente con una búsqueda en anchura.
+    - β₁ se obtiene como β₀ - χ.
+
+    V, E y F se toman de la salida de validate_euler_formulas. β₀ y β₁ son
+    los del complejo de píxeles cerrados: material conectividad-8 y agujeros
+    conectividad-4 (β₁ = β₀ - χ). Coinciden con los de validate_euler_formulas
+    cuando el píxel [0, 0] es poro (compute_betti_numbers_2d invierte la
+    imagen en caso contrario) y la imagen es consistente (sus agujeros usan
+    conectividad-8, así que dos poros unidos solo en diagonal cuentan como
+    uno).
+
+    Args:
+        binary_image: Imagen binaria inicial donde 1=material, 0=poro
+        metrics: Salida de validate_euler_formulas de la imagen inicial
+                 (se calcula si no se indica)
+    """
+
+    def __init__(self, binary_image, metrics=None):
+        binary = np.asarray(binary_image) > 0.5
+        if metrics is None:
+            metrics = validate_euler_formulas(binary)
+
+        # Imagen con un marco de ceros para que todo píxel tenga vecindario 3x3
+        self._image = np.pad(binary, 1, mode='constant', constant_values=False)
+        self.vertices = int(metrics['vertices'])
+        self.edges = int(metrics['edges'])
+        self.faces = int(metrics['faces'])
+
+        labels, num_components = ndimage.label(self._image, structure=ESTRUCTURA_8)
+        self._labels = labels.astype(np.int64)
+        self._union_find = UnionFind()
+        self._union_find.add(num_components)
+        self.beta0 = num_components
+
+    @property
+    def image(self):
+        """Máscara booleana actual (vista sin el marco)"""
+        return self._image[1:-1, 1:-1]
+
+    @property
+    def euler(self):
+        return self.vertices - self.edges + self.faces
+
+    @property
+    def beta1(self):
+        return self.beta0 - self.euler
+
+    def _quad_codes(self, pi, pj):
+        """Códigos de los cuatro bloques 2x2 que contienen al píxel (pi, pj) del marco"""
+        window = self._image[pi - 1:pi + 2, pj - 1:pj + 2].astype(np.int64)
+        top_left = window[:-1, :-1]
+        top_right = window[:-1, 1:]
+        bottom_left = window[1:, :-1]
+        bottom_right = window[1:, 1:]
+        return (top_left | (top_right << 1) | (bottom_left << 2) | (bottom_right << 3)).ravel()
+
+    def set_pixel(self, i, j, value):
+        """
+        Cambia el píxel (i, j) y actualiza V, E, F y β₀.
+
+        Args:
+            i, j: Fila y columna del píxel
+            value: Nuevo valor (verdadero = material)
+
+        Returns:
+            bool: True si el píxel cambió
+        """
+        value = bool(value)
+        height, width = self.image.shape
+        if not (0 <= i < height and 0 <= j < width):
+            raise IndexError(f"Píxel ({i}, {j}) fuera de la imagen {self.image.shape}")
+
+        pi, pj = i + 1, j + 1
+        if self._image[pi, pj] == value:
+            return False
+
+        before = self._quad_codes(pi, pj)
+        self._image[pi, pj] = value
+        after = self._quad_codes(pi, pj)
+
+        dV, dE, dF = (TABLA_COMPLEJO_CELULAR[after] - TABLA_COMPLEJO_CELULAR[before]).sum(axis=0)
+        self.vertices += int(dV)
+        self.edges += int(dE)
+        self.faces += int(dF)
+
+        if value:
+            self._add_to_components(pi, pj)
+        else:
+            self._remove_from_components(pi, pj)
+        return True
+
+    def flip(self, i, j):
+        """Invierte el píxel (i, j)"""
+        self.set_pixel(i, j, not self._image[i + 1, j + 1])
+
+    def _active_neighbors(self, pi, pj):
+        return [(pi + di, pj + dj) for di, dj in VECINOS_8 if self._image[pi + di, pj + dj]]
+
+    def _add_to_components(self, pi, pj):
+        """Nuevo píxel de material: etiqueta nueva unida a las de sus vecinos"""
+        union_find = self._union_find
+        label = union_find.add(1) + 1
+        self._labels[pi, pj] = label
+
+        roots = {union_find.find(int(self._labels[p])) for p in self._active_neighbors(pi, pj)}
+        for root in roots:
+            union_find.union(label, root)
+        self.beta0 += 1 - len(roots)
+
+    def _remove_from_components(self, pi, pj):
+        """Píxel de material eliminado: comprueba si su componente se parte"""
+        self._labels[pi, pj] = 0
+        neighbors = self._active_neighbors(pi, pj)
+        if not neighbors:
+            self.beta0 -= 1
+            return
+
+        groups = self._ring_groups(pi, pj, neighbors)
+        if len(groups) == 1:
+            return
+
+        # Grupos del anillo desconectados localmente: se busca desde el
+        # primero y, si no alcanza a los demás, la componente se ha partido
+        first, *rest = groups
+        visited, connected = self._flood(first, rest)
+        if connected:
+            return
+
+        # La parte del primer grupo conserva sus etiquetas; cada una de las
+        # demás partes recibe una etiqueta nueva
+        pending = [g for g in rest if g.isdisjoint(visited)]
+        while pending:
+            visited, _ = self._flood(pending.pop(0), [])
+            pending = [g for g in pending if g.isdisjoint(visited)]
+            label = self._union_find.add(1) + 1
+            for p in visited:
+                self._labels[p] = label
+            self.beta0 += 1
+
+    def _ring_groups(self, pi, pj, neighbors):
+        """Agrupa los vecinos activos que están conectados entre sí dentro del anillo 3x3"""
+        remaining = set(neighbors)
+        groups = []
+        while remaining:
+            stack = [remaining.pop()]
+            group = set(stack)
+            while stack:
+                ci, cj = stack.pop()
+                for di, dj in VECINOS_8:
+                    q = (ci + di, cj + dj)
+                    if q in remaining and abs(q[0] - pi) <= 1 and abs(q[1] - pj) <= 1:
+                        remaining.discard(q)
+                        group.add(q)
+                        stack.append(q)
+            groups.append(group)
+        return groups
+
+    def _flood(self, seeds, targets):
+        """
+        Búsqueda en anchura (conectividad-8) por el material desde los píxeles
+        `seeds`, que se detiene en cuanto alcanza todos los grupos `targets`.
+
+        Returns:
+            tuple: (píxeles visitados, True si se alcanzaron todos los grupos)
+        """
+        owner = {p: k for k, group in enumerate(targets) for p in group}
+        missing = set(range(len(targets)))
+        visited = set(seeds)
+        queue = deque(seeds)
+
+        while queue:
+            ci, cj = queue.popleft()
+            for di, dj in VECINOS_8:
+                q = (ci + di, cj + dj)
+                if q in visited or not self._image[q]:
+                    continue
+                visited.add(q)
+                queue.append(q)
+                if q in owner:
+                    missing.discard(owner[q])
+                    if not missing:
+                        return visited, True
+        return visited, False
+
+    def metrics(self):
+        """
+        Returns:
+            dict: vertices, edges, faces, beta0, beta1, euler_vef y euler_poincare
+        """
+        return {
+            'vertices': self.vertices,
+            'edges': self.edges,
+            'faces': self.faces,
+            'beta0': self.beta0,
+            'beta1': self.beta1,
+            'euler_vef': self.euler,
+            'euler_poincare': self.beta0 - self.beta1
+        }
+
+    def verify(self):
+        """
+        Compara el estado incremental con un recálculo completo de la máscara
+        actual: V, E, F y χ con validate_euler_formulas, β₀ etiquetando el
+        material (conectividad-8) y β₁ etiquetando los poros (conectividad-4)
+        que no tocan el borde, sin deducir β₁ de χ.
+
+        Returns:
+            dict: Claves que no coinciden con (incremental, recalculado);
+                  vacío si todo coincide
+        """
+        expected = validate_euler_formulas(self.image.astype(np.uint8))
+        _, expected['beta0'] = ndimage.label(self._image, structure=ESTRUCTURA_8)
+        # Con el marco de ceros, el poro exterior es la única componente que toca el borde
+        _, num_pores = ndimage.label(~self._image)
+        expected['beta1'] = num_pores - 1
+        expected['euler_poincare'] = expected['beta0'] - expected['beta1']
+
+        current = self.metrics()
+        return {key: (current[key], expected[key])
+                for key in ('vertices', 'edges', 'faces', 'beta0', 'beta1', 'euler_vef', 'euler_poincare')
+                if current[key] != expected[key]}
@@ -0,0 +1,142 @@
+import time
+import logging
+import tracemalloc
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+class StageProfiler:
+    """
+    Mide el tiempo de reloj, el tiempo de CPU y el pico de memoria asignada
+    (tracemalloc) de cada etapa del análisis de una imagen.
+
+    Si `enabled` es False, stage() no mide nada y timings queda vacío, así que
+    puede usarse siempre sin coste cuando el perfilado no se pidió.
+
+    Uso:
+        profiler = StageProfiler(enabled=True)
+        with profiler.stage('betti'):
+            ...
+        profiler.close()
+        profiler.timings  # {'betti': {'wall_s': ..., 'cpu_s': ..., 'peak_bytes': ...}}
+    """
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.timings = {}
+        self._started_tracing = False
+        if enabled and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+
+    @contextmanager
+    def stage(self, name):
+        """Mide el bloque como la etapa `name` (acumula si se repite)"""
+        if not self.enabled:
+            yield
+            return
+
+        base_memory, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - wall_start
+            cpu = time.process_time() - cpu_start
+            _, peak = tracemalloc.get_traced_memory()
+
+            entry = self.timings.setdefault(name, {'wall_s': 0.0, 'cpu_s': 0.0, 'peak_bytes': 0})
+            entry['wall_s'] += wall
+            entry['cpu_s'] += cpu
+            entry['peak_bytes'] = max(entry['peak_bytes'], peak - base_memory)
+
+    def close(self):
+        """Detiene tracemalloc si lo inició este perfilador y devuelve los tiempos"""
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+        return self.timings
+
+def warm_context(ctx, profiler):
+    """
+    Calcula los artefactos del contexto en el orden del análisis, midiendo
+    cada uno como una etapa, para que las métricas posteriores los reutilicen.
+
+    Args:
+        ctx: AnalysisContext de la imagen
+        profiler: StageProfiler (puede estar desactivado)
+    """
+    with profiler.stage('betti'):
+        ctx.betti
+    with profiler.stage('f8'):
+        ctx.f8
+    with profiler.stage('f4'):
+        ctx.f4
+    with profiler.stage('vcc'):
+        ctx.vcc
+    with profiler.stage('3ot'):
+        ctx.ot3
+
+def aggregate_timings(results):
+    """
+    Suma los tiempos por etapa de un lote de resultados con clave 'timings'.
+
+    Args:
+        results: Lista de resultados de análisis
+
+    Returns:
+        dict: Por etapa, {'wall_s', 'cpu_s', 'peak_bytes' (máximo), 'images'}
+              en el orden en que aparecen las etapas
+    """
+    totals = {}
+    for result in results:
+        for stage, t in result.get('timings', {}).items():
+            entry = totals.setdefault(stage, {'wall_s': 0.0, 'cpu_s': 0.0, 'peak_bytes': 0, 'images': 0})
+            entry['wall_s'] += t['wall_s']
+            entry['cpu_s'] += t['cpu_s']
+            entry['peak_bytes'] = max(entry['peak_bytes'], t['peak_bytes'])
+            entry['images'] += 1
+    return totals
+
+def format_timings_report(results, width=40):
+    """
+    Construye un reporte agregado por etapa con una barra proporcional al
+    tiempo total de cada una (desglose tipo flame graph).
+
+    Args:
+        results: Lista de resultados con clave 'timings'
+        width: Ancho en caracteres de la barra de la etapa más lenta
+
+    Returns:
+        str: Reporte en texto (vacío si no hay tiempos)
+    """
+    totals = aggregate_timings(results)
+    if not totals:
+        return ''
+
+    total_wall = sum(t['wall_s'] for t in totals.values()) or 1.0
+    slowest = max(t['wall_s'] for t in totals.values()) or 1.0
+    name_width = max(len(stage) for stage in totals)
+
+    lines = [
+        f"{'Etapa':<{name_width}}  {'Reloj (s)':>10}  {'CPU (s)':>10}  {'Pico (MB)':>10}  {'%':>6}",
+        "-" * (name_width + 48 + width)
+    ]
+    for stage, t in sorted(totals.items(), key=lambda item: item[1]['wall_s'], reverse=True):
+        share = t['wall_s'] / total_wall
+        bar = '█' * max(1, round(width * t['wall_s'] / slowest)) if t['wall_s'] > 0 else ''
+        lines.append(f"{stage:<{name_width}}  {t['wall_s']:>10.4f}  {t['cpu_s']:>10.4f}  "
+                     f"{t['peak_bytes'] / 2**20:>10.2f}  {100 * share:>5.1f}%  {bar}")
+    lines.append("-" * (name_width + 48 + width))
+    lines.append(f"{'Total':<{name_width}}  {total_wall:>10.4f}  "
+                 f"{sum(t['cpu_s'] for t in totals.values()):>10.4f}")
+    return '\n'.join(lines)
+
+def log_timings_report(results):
+    """Registra el reporte agregado de tiempos por etapa si hay tiempos"""
+    report = format_timings_report(results)
+    if report:
+        logger.info("\nPerfil por etapa (%d imágenes):\n%s",
+                    sum(1 for r in results if r.get('timings')), report)
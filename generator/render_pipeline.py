@@ -0,0 +1,498 @@
+import os
+import sys
+import queue
+import logging
+import threading
+import numpy as np
+import matplotlib
+from matplotlib.figure import Figure
+from matplotlib.gridspec import GridSpec
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config.topology_config import VISUALIZATION_CONFIG, RENDER_CONFIG
+from .visualizer import (COLORS, CODE_SYMBOL_COLORS, CODE_TRACKS, create_topology_pattern, _abbreviate_code,
+                         _code_legend, _codes_info_text, _draw_code_track, quiver_grid,
+                         vector_field_size, create_comparison_plot)
+from .field_generator import generate_vector_field
+from .image_reader import read_binary_image, preprocess_binary_image
+
+logger = logging.getLogger(__name__)
+
+def _use_agg():
+    """Fuerza el backend no interactivo Agg (también para pyplot)"""
+    matplotlib.use('Agg', force=True)
+
+def _new_figure(figsize):
+    """Figura con su lienzo Agg, sin pasar por pyplot"""
+    fig = Figure(figsize=figsize)
+    FigureCanvasAgg(fig)
+    fig.patch.set_facecolor('white')
+    return fig
+
+def _image_extent(shape):
+    """Extensión de imshow con origin='lower' para una imagen de `shape`"""
+    return (-0.5, shape[1] - 0.5, -0.5, shape[0] - 0.5)
+
+def _set_bars(ax, bars, values, labels, offset, fmt):
+    """Actualiza las alturas de unas barras y las etiquetas de valor sobre ellas"""
+    for bar, label, value in zip(bars, labels, values):
+        bar.set_height(value)
+        label.set_y(value + offset)
+        label.set_text(fmt(value))
+    ax.relim()
+    ax.autoscale_view()
+
+class TopologyAnalysisFigure:
+    """
+    Plantilla de la figura de plot_topology_analysis: se construye una vez
+    (ejes, barras, tabla, barras de color) y update() solo cambia los datos
+    de los artistas para cada caso, en lugar de rehacer la figura.
+    """
+
+    def __init__(self):
+        fig = self.fig = _new_figure((15, 15))
+        gs = GridSpec(4, 2, figure=fig, height_ratios=[1, 1, 0.8, 1.2], hspace=0.4, wspace=0.3,
+                      top=0.93, bottom=0.03)
+        axes = [fig.add_subplot(gs[0, 0]), fig.add_subplot(gs[0, 1]), fig.add_subplot(gs[1, 0]),
+                fig.add_subplot(gs[1, 1]), fig.add_subplot(gs[2, :]), fig.add_subplot(gs[3, :])]
+        for ax in axes:
+            ax.set_facecolor(COLORS['background'])
+        ax1, ax2, ax3, ax4, ax5, ax6 = self.axes = axes
+
+        # 1. Campo original con topología
+        empty = np.zeros((1, 1))
+        self.field_image = ax1.imshow(empty, cmap='gray', origin='lower')
+        self.field_title = ax1.set_title('', fontsize=12, fontweight='bold')
+        self.field_label = ax1.set_xlabel('', fontsize=10, fontweight='bold')
+        fig.colorbar(self.field_image, ax=ax1, fraction=0.046, pad=0.04)
+
+        # 2. Campo vectorial (el quiver se crea con la primera malla)
+        self.background_image = ax2.imshow(empty, cmap='gray', origin='lower', alpha=0.7)
+        ax2.set_title('Campo Vectorial', fontsize=12, fontweight='bold')
+        self.quiver = None
+        self._quiver_shape = None
+
+        # 3. Comparación Euler y VCC
+        self.euler_bars = ax3.bar(['V-E+F', 'β₀-β₁', 'VCC'], [0, 0, 0],
+                                  color=[COLORS['comparison']['beta0'], COLORS['comparison']['beta1'],
+                                         COLORS['comparison']['euler']],
+                                  alpha=0.8, edgecolor='black', linewidth=1)
+        ax3.set_title('Comparación Euler y VCC', fontsize=12, fontweight='bold')
+        ax3.set_ylabel('Característica de Euler (χ)', fontsize=10, fontweight='bold')
+        ax3.grid(True, linestyle='--', alpha=0.3)
+        self.euler_labels = self._bar_labels(ax3, self.euler_bars)
+
+        # 4. VCC detallado
+        self.vcc_bars = ax4.bar(['N1', 'N3', 'N1-N3'], [0, 0, 0],
+                                color=[COLORS['bar_colors']['0'], COLORS['bar_colors']['1'],
+                                       COLORS['bar_colors']['2']],
+                                alpha=0.8, edgecolor='black', linewidth=1)
+        ax4.set_title('Análisis VCC Detallado', fontsize=12, fontweight='bold')
+        ax4.set_ylabel('Cantidad', fontsize=10, fontweight='bold')
+        ax4.grid(True, linestyle='--', alpha=0.3)
+        self.vcc_labels = self._bar_labels(ax4, self.vcc_bars)
+
+        # 5. 3OT por dirección
+        x = np.arange(3)
+        width = 0.25
+        self.ot3_bars = [
+            ax5.bar(x - width, [0] * 3, width, label='Segmentos',
+                    color=COLORS['bar_colors']['0'], edgecolor='black', linewidth=1),
+            ax5.bar(x, [0] * 3, width, label='Long. Media',
+                    color=COLORS['bar_colors']['1'], edgecolor='black', linewidth=1),
+            ax5.bar(x + width, [0] * 3, width, label='Long. Máx',
+                    color=COLORS['bar_colors']['2'], edgecolor='black', linewidth=1)
+        ]
+        self.ot3_title = ax5.set_title('', fontsize=12, fontweight='bold')
+        ax5.set_xticks(x)
+        ax5.set_xticklabels(['Horizontal (N2h)', 'Vertical (N2v)', 'Diagonal (N2d)'], fontsize=10)
+        ax5.legend(fontsize=10)
+        ax5.grid(True, linestyle='--', alpha=0.3)
+        self.ot3_labels = [ax5.text(i - width, 0, '', ha='center', va='bottom', fontweight='bold')
+                           for i in range(3)]
+
+        # 6. Tabla de métricas
+        ax6.axis('off')
+        rows = [['β₀ (Componentes)', 'Número de componentes conectados'],
+                ['β₁ (Agujeros)', 'Número de agujeros topológicos'],
+                ['χ (V-E+F)', 'Característica de Euler clásica'],
+                ['χ (β₀-β₁)', 'Característica de Euler-Poincaré'],
+                ['VCC (x)', 'Código de Corrección de Vértices'],
+                ['3OT Ratio', 'Ratio Direccional 3OT'],
+                ['Consistencia Euler', 'Concordancia entre fórmulas'],
+                ['Consistencia VCC', 'Concordancia VCC con Euler']]
+        self.table = ax6.table(cellText=[[name, '', description] for name, description in rows],
+                               colLabels=['Métrica', 'Valor', 'Descripción'],
+                               cellLoc='center', loc='center', colWidths=[0.3, 0.2, 0.5])
+        self.table.auto_set_font_size(False)
+        self.table.set_fontsize(9)
+        self.table.scale(1, 1.8)
+        for j in range(3):
+            self.table[(0, j)].set_facecolor('#40466e')
+            self.table[(0, j)].set_text_props(weight='bold', color='white')
+        for i in [6, 7]:
+            for j in range(3):
+                self.table[(i, j)].set_facecolor('#f0f0f0')
+
+        self.suptitle = fig.suptitle('', fontsize=16, fontweight='bold', y=0.98)
+
+    @staticmethod
+    def _bar_labels(ax, bars):
+        return [ax.text(bar.get_x() + bar.get_width() / 2, 0, '', ha='center', va='bottom', fontweight='bold')
+                for bar in bars]
+
+    def update(self, field, quiver, metrics, case_name=""):
+        """
+        Cambia los datos de la figura para un caso.
+
+        Args:
+            field: Campo escalar 2D
+            quiver: (X, Y, U, V) de quiver_grid
+            metrics: Diccionario con métricas topológicas
+            case_name: Nombre del caso para el título
+        """
+        ax1, ax2, ax3, ax4, ax5, _ = self.axes
+
+        # 1-2. Imágenes: mismos artistas con datos, extensión y escala nuevas
+        for image in (self.field_image, self.background_image):
+            image.set_data(field)
+            image.set_extent(_image_extent(field.shape))
+            image.set_clim(np.min(field), np.max(field))
+        self.field_title.set_text(f'Topología: {case_name}')
+        self.field_label.set_text(f'β₀={metrics["beta0"]}, β₁={metrics["beta1"]}')
+
+        X, Y, U, V = quiver
+        if self.quiver is not None and self._quiver_shape == (field.shape, np.shape(U)):
+            self.quiver.set_UVC(U, V)
+        else:
+            # La malla de flechas depende del tamaño de la imagen
+            if self.quiver is not None:
+                self.quiver.remove()
+            self.quiver = ax2.quiver(X, Y, U, V, color=VISUALIZATION_CONFIG['arrow_color'],
+                                     scale=VISUALIZATION_CONFIG['arrow_scale'], pivot='middle', alpha=0.8)
+            self._quiver_shape = (field.shape, np.shape(U))
+
+        # 3-4. Barras de Euler y VCC
+        vcc = metrics['vcc']
+        _set_bars(ax3, self.euler_bars, [metrics['euler_vef'], metrics['euler_poincare'], vcc['x']],
+                  self.euler_labels, 0.05, lambda value: f'{value:.2f}')
+        _set_bars(ax4, self.vcc_bars, [vcc['N1'], vcc['N3'], vcc['N1'] - vcc['N3']],
+                  self.vcc_labels, 0.05, lambda value: f'{value}')
+
+        # 5. 3OT
+        ot3 = metrics['3ot']
+        directions = ['horizontal', 'vertical', 'diagonal']
+        segments = [ot3['N2h'], ot3['N2v'], ot3['N2d']]
+        series = [segments,
+                  [ot3[d]['avg_length'] for d in directions],
+                  [ot3[d]['max_length'] for d in directions]]
+        for bars, values in zip(self.ot3_bars, series):
+            for bar, value in zip(bars, values):
+                bar.set_height(value)
+        for label, value in zip(self.ot3_labels, segments):
+            label.set_y(value + 0.5)
+            label.set_text(str(value))
+        ax5.relim()
+        ax5.autoscale_view()
+        self.ot3_title.set_text(f'Análisis 3OT - X = (N2h - N2v)/4 = {ot3["combined"]["X_value"]:.2f}')
+
+        # 6. Tabla
+        values = [f"{metrics['beta0']}", f"{metrics['beta1']}", f"{metrics['euler_vef']}",
+                  f"{metrics['euler_poincare']}", f"{vcc['x']:.2f}",
+                  f"{ot3['combined']['directional_ratio']:.2f}",
+                  '✓' if metrics['is_consistent'] else '✗', '✓' if vcc['is_consistent'] else '✗']
+        for i, value in enumerate(values, 1):
+            self.table[(i, 1)].get_text().set_text(value)
+        for i in [6, 7]:
+            consistent = '✓' in values[i]
+            self.table[(i, 1)].set_facecolor(COLORS['comparison']['consistent'] if consistent
+                                              else COLORS['comparison']['inconsistent'])
+            self.table[(i, 1)].set_text_props(color='white', weight='bold')
+
+        self.suptitle.set_text(f'Análisis Topológico Completo - {case_name}')
+
+    def save(self, save_path, dpi=None):
+        self.fig.savefig(save_path, dpi=dpi or RENDER_CONFIG['dpi'], facecolor='white')
+
+class TopologyPatternsFigure:
+    """
+    Plantilla de la figura de plot_topology_patterns: las dos imágenes de
+    patrones VCC y 3OT y sus textos se actualizan para cada caso.
+    """
+
+    def __init__(self):
+        fig = self.fig = _new_figure((15, 8))
+        gs = GridSpec(1, 2, figure=fig, wspace=0.3, top=0.88, bottom=0.2)
+        self.images = []
+        self.code_texts = []
+        for k, title in enumerate(['Patrón VCC', 'Patrón 3OT']):
+            ax = fig.add_subplot(gs[0, k])
+            ax.set_facecolor(COLORS['background'])
+            image = ax.imshow(np.zeros((256, 256)), cmap='viridis', origin='lower')
+            ax.set_title(title, fontsize=12, fontweight='bold')
+            fig.colorbar(image, ax=ax, fraction=0.046, pad=0.04)
+            self.images.append(image)
+            self.code_texts.append(ax.text(0.02, -0.1, '', transform=ax.transAxes, fontsize=10,
+                                           bbox=dict(facecolor='white', edgecolor='black', alpha=0.8)))
+        self.suptitle = fig.suptitle('', fontsize=16, fontweight='bold', y=0.97)
+        self.info = fig.text(0.02, 0.02, '', fontsize=10,
+                             bbox=dict(facecolor='white', edgecolor='black', alpha=0.8))
+
+    def update(self, codes, case_name=""):
+        """
+        Args:
+            codes: Diccionario con los códigos ('vcc' y 'ot3')
+            case_name: Nombre del caso para el título
+        """
+        for image, text, key in zip(self.images, self.code_texts, ('vcc', 'ot3')):
+            pattern = create_topology_pattern(codes[key]) if codes[key] else np.zeros((256, 256), np.uint8)
+            image.set_data(pattern)
+            image.set_clim(pattern.min(), pattern.max())
+            text.set_text(f'Código: {_abbreviate_code(codes[key])}')
+        self.suptitle.set_text(f'Patrones Topológicos - {case_name}' if case_name else '')
+        self.info.set_text(_codes_info_text(codes))
+
+    def save(self, save_path, dpi=None):
+        self.fig.savefig(save_path, dpi=dpi or RENDER_CONFIG['dpi'], facecolor='white')
+
+class TopologyCodesFigure:
+    """
+    Plantilla de la figura de plot_topology_codes: la figura, el título y el
+    texto informativo se crean una vez; en cada caso solo se vacían los dos
+    ejes y se dibujan de nuevo sus pistas.
+    """
+
+    def __init__(self):
+        fig = self.fig = _new_figure((15, 10))
+        gs = GridSpec(2, 1, figure=fig, hspace=0.8, top=0.9, bottom=0.24)
+        self.axes = [fig.add_subplot(gs[k, 0]) for k in range(2)]
+        self.suptitle = fig.suptitle('', fontsize=16, fontweight='bold', y=0.97)
+        self.info = fig.text(0.02, 0.01, '', fontsize=10,
+                             bbox=dict(facecolor='white', edgecolor='black', alpha=0.8))
+
+    def update(self, codes, case_name=""):
+        """
+        Args:
+            codes: Diccionario con los códigos ('vcc' y 'ot3')
+            case_name: Nombre del caso para el título
+        """
+        for ax, (key, n_symbols, title, legend_title) in zip(self.axes, CODE_TRACKS):
+            ax.clear()
+            ax.set_facecolor(COLORS['background'])
+            _draw_code_track(ax, codes[key], n_symbols, CODE_SYMBOL_COLORS)
+            ax.set_title(title, pad=20, fontsize=12, fontweight='bold')
+            _code_legend(ax, n_symbols, legend_title)
+        self.suptitle.set_text(f'Códigos Topológicos - {case_name}' if case_name else '')
+        self.info.set_text(_codes_info_text(codes))
+
+    def save(self, save_path, dpi=None):
+        self.fig.savefig(save_path, dpi=dpi or RENDER_CONFIG['dpi'], facecolor='white')
+
+# Plantillas de este proceso, creadas la primera vez que se usan
+_templates = {}
+
+def _template(kind):
+    if kind not in _templates:
+        _templates[kind] = {'analysis': TopologyAnalysisFigure, 'patterns': TopologyPatternsFigure,
+                            'codes': TopologyCodesFigure}[kind]()
+    return _templates[kind]
+
+def render_job(case, output_dir, figures=None, dpi=None):
+    """
+    Extrae de un resultado lo necesario para dibujarlo, de modo que el
+    trabajo sea pequeño al enviarlo a otro proceso: la imagen (o su ruta),
+    la malla del quiver si el campo vectorial ya está calculado, las métricas y
+    los códigos VCC/3OT.
+
+    Args:
+        case: Resultado de un caso (dict o TopologyResult) con 'name'
+              o 'path', 'metrics' y 'codes'
+        output_dir: Directorio donde guardar las figuras
+        figures: Figuras a dibujar (por defecto RENDER_CONFIG['figures'])
+        dpi: Resolución (por defecto RENDER_CONFIG['dpi'])
+
+    Returns:
+        dict: Trabajo para render_case
+    """
+    is_computed = getattr(case, 'is_computed', lambda key: key in case)
+    name = case.get('name') or os.path.splitext(os.path.basename(case.get('path', 'caso')))[0]
+
+    field = case.get('field')
+    if field is None and is_computed('binary_image'):
+        field = case['binary_image']
+
+    quiver = None
+    if is_computed('vector_field') and field is not None:
+        quiver = quiver_grid(*case['vector_field'], np.shape(field))
+
+    return {
+        'name': name,
+        'path': case.get('path'),
+        'field': field,
+        'quiver': quiver,
+        'metrics': case['metrics'],
+        'codes': {key: case['codes'][key] for key in ('vcc', 'ot3')},
+        'output_dir': output_dir,
+        'figures': tuple(figures or RENDER_CONFIG['figures']),
+        'dpi': dpi or RENDER_CONFIG['dpi']
+    }
+
+def render_case(job):
+    """
+    Dibuja las figuras de un caso con las plantillas de este proceso.
+
+    Args:
+        job: Trabajo de render_job
+
+    Returns:
+        list: Rutas de las figuras guardadas
+    """
+    name, output_dir, dpi = job['name'], job['output_dir'], job['dpi']
+    os.makedirs(output_dir, exist_ok=True)
+    paths = []
+
+    if 'analysis' in job['figures']:
+        field = job['field']
+        if field is None:
+            field = preprocess_binary_image(read_binary_image(job['path']))
+        quiver = job['quiver']
+        if quiver is None:
+            # Campo vectorial a la resolución del panel (media figura de 15 pulgadas)
+            u, v = generate_vector_field(field, max_size=vector_field_size(7.5, dpi))
+            quiver = quiver_grid(u, v, field.shape)
+
+        template = _template('analysis')
+        template.update(field, quiver, job['metrics'], name)
+        paths.append(os.path.join(output_dir, f'analysis_{name}.png'))
+        template.save(paths[-1], dpi)
+
+    if 'patterns' in job['figures']:
+        template = _template('patterns')
+        template.update(job['codes'], name)
+        paths.append(os.path.join(output_dir, f'patterns_{name}.png'))
+        template.save(paths[-1], dpi)
+
+    if 'codes' in job['figures']:
+        template = _template('codes')
+        template.update(job['codes'], name)
+        paths.append(os.path.join(output_dir, f'codes_{name}.png'))
+        template.save(paths[-1], dpi)
+
+    return paths
+
+def render_comparison(cases_data, save_path, dpi=None):
+    """create_comparison_plot con el backend Agg (para el pool de render)"""
+    create_comparison_plot(cases_data, save_path, dpi=dpi or RENDER_CONFIG['dpi'])
+    return [save_path]
+
+def _init_render_worker():
+    _use_agg()
+
+class RenderPipeline:
+    """
+    Etapa de visualización sin interfaz gráfica, desacoplada del análisis.
+
+    submit() deja cada resultado en una cola acotada y vuelve enseguida; un
+    hilo despachador la vacía y reparte los trabajos en un pool de procesos
+    con backend Agg (o los dibuja él mismo si workers es 0), de modo que el
+    análisis y la escritura de métricas no esperan a las figuras. Cada
+    proceso reutiliza sus plantillas de figura entre casos.
+
+    Args:
+        output_dir: Directorio de las figuras
+        workers: Procesos de render (por defecto RENDER_CONFIG['workers'];
+                 0 = en un hilo de este proceso)
+        figures: Figuras por caso ('analysis', 'patterns', 'codes')
+        dpi: Resolución (por defecto RENDER_CONFIG['dpi'])
+    """
+
+    def __init__(self, output_dir, workers=None, figures=None, dpi=None):
+        self.output_dir = output_dir
+        self.workers = RENDER_CONFIG['workers'] if workers is None else workers
+        self.figures = figures
+        self.dpi = dpi
+        self.paths = []
+        self.errors = []
+
+        if self.workers:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_render_worker)
+        else:
+            self._executor = None
+            _use_agg()
+        self._queue = queue.Queue(maxsize=RENDER_CONFIG['queue_size'])
+        self._thread = threading.Thread(target=self._dispatch, daemon=True)
+        self._thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def submit(self, case):
+        """Encola las figuras de un caso (bloquea solo si la cola está llena)"""
+        self._queue.put((case.get('name', case.get('path')),
+                         render_case, (render_job(case, self.output_dir, self.figures, self.dpi),)))
+
+    def submit_comparison(self, cases_data, save_path):
+        """Encola el gráfico comparativo de todos los casos"""
+        cases = [{'name': case['name'], 'metrics': case['metrics']} for case in cases_data]
+        self._queue.put(('comparación', render_comparison, (cases, save_path, self.dpi)))
+
+    def _dispatch(self):
+        pending = {}
+        max_pending = 2 * (self.workers or 1)
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            name, function, args = item
+            if self._executor is None:
+                self._collect(name, function, args)
+                continue
+            if len(pending) >= max_pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    self._collect_future(pending.pop(future), future)
+            try:
+                future = self._executor.submit(function, *args)
+            except Exception as e:
+                # Pool roto (BrokenProcessPool) o cerrado: el trabajo se anota
+                # como error y se sigue vaciando la cola para que submit() no
+                # se quede bloqueado
+                self._failed(name, e)
+                continue
+            pending[future] = name
+        for future, name in pending.items():
+            self._collect_future(name, future)
+
+    def _collect(self, name, function, args):
+        try:
+            self.paths.extend(function(*args))
+        except Exception as e:
+            self._failed(name, e)
+
+    def _collect_future(self, name, future):
+        try:
+            self.paths.extend(future.result())
+        except Exception as e:
+            self._failed(name, e)
+
+    def _failed(self, name, error):
+        logger.warning("No se pudo dibujar %s: %s", name, error)
+        self.errors.append((name, str(error)))
+
+    def close(self):
+        """
+        Espera a que se terminen todas las figuras encoladas.
+
+        Returns:
+            list: Rutas de las figuras guardadas
+        """
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+            if self._executor is not None:
+                self._executor.shutdown()
+        return self.paths
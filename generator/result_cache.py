@@ -0,0 +1,160 @@
+import os
+import sys
+import time
+import pickle
+import sqlite3
+import hashlib
+import logging
+import numpy as np
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config.topology_config import CACHE_CONFIG
+from .image_reader import PREPROCESS_SETTINGS
+
+logger = logging.getLogger(__name__)
+
+# Se incrementa cuando cambia el formato o el cálculo de los resultados
+# guardados, para que las entradas antiguas dejen de coincidir
+CACHE_VERSION = 1
+
+# Partes del resultado que solo dependen del contenido de la máscara
+CACHED_KEYS = ('pixels', 'metrics', 'connectivity', 'codes', 'equalities')
+
+def mask_key(binary_image, threshold, preprocess=PREPROCESS_SETTINGS):
+    """
+    Clave de caché de una máscara: hash SHA-256 de sus bits, su forma, el
+    umbral de binarización y los ajustes de preprocesado.
+
+    Args:
+        binary_image: Imagen binarizada antes del preprocesado
+        threshold: Umbral con el que se binarizó
+        preprocess: Ajustes de preprocesado aplicados después
+
+    Returns:
+        str: Clave hexadecimal
+    """
+    binary_image = np.asarray(binary_image)
+    h = hashlib.sha256()
+    h.update(repr((CACHE_VERSION, binary_image.shape, threshold, sorted(preprocess.items()))).encode())
+    h.update(np.packbits(binary_image != 0).tobytes())
+    return h.hexdigest()
+
+class ResultCache:
+    """
+    Caché persistente de resultados de análisis en SQLite, con expulsión LRU
+    cuando el tamaño total supera `max_bytes` y contadores de aciertos y fallos.
+
+    Varios procesos pueden compartir el mismo archivo: cada uno abre su propia
+    conexión (ver open_cache) y SQLite serializa las escrituras.
+
+    Args:
+        path: Archivo SQLite (por defecto CACHE_CONFIG['path'])
+        max_bytes: Tamaño máximo de los resultados guardados
+                   (por defecto CACHE_CONFIG['max_bytes'])
+    """
+
+    def __init__(self, path=None, max_bytes=None):
+        self.path = path or CACHE_CONFIG['path']
+        self.max_bytes = max_bytes or CACHE_CONFIG['max_bytes']
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, timeout=30)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                value BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                last_access REAL NOT NULL
+            )
+        """)
+        self._conn.commit()
+
+    def get(self, key):
+        """
+        Devuelve el resultado guardado bajo `key` (y lo marca como usado) o None.
+        """
+        row = self._conn.execute("SELECT value FROM entries WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        with self._conn:
+            self._conn.execute("UPDATE entries SET last_access = ? WHERE key = ?", (time.time(), key))
+        return pickle.loads(row[0])
+
+    def put(self, key, value):
+        """
+        Guarda `value` bajo `key` y expulsa las entradas usadas hace más tiempo
+        hasta que el total quepa en max_bytes.
+        """
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(blob) > self.max_bytes:
+            logger.debug("Resultado demasiado grande para la caché (%d bytes)", len(blob))
+            return
+
+        with self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO entries (key, value, size, last_access) VALUES (?, ?, ?, ?)",
+                               (key, blob, len(blob), time.time()))
+            self._evict()
+
+    def _evict(self):
+        """Borra las entradas menos usadas recientemente mientras se supere max_bytes"""
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        expired = []
+        for key, size in self._conn.execute("SELECT key, size FROM entries ORDER BY last_access"):
+            if total <= self.max_bytes:
+                break
+            expired.append((key,))
+            total -= size
+        self._conn.executemany("DELETE FROM entries WHERE key = ?", expired)
+        self.evictions += len(expired)
+
+    def stats(self):
+        """
+        Returns:
+            dict: Aciertos, fallos, tasa de aciertos, expulsiones, entradas y bytes
+        """
+        entries, size = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'evictions': self.evictions,
+            'entries': entries,
+            'bytes': size
+        }
+
+    def clear(self):
+        """Borra todas las entradas"""
+        with self._conn:
+            self._conn.execute("DELETE FROM entries")
+
+    def close(self):
+        self._conn.close()
+
+# Una conexión por proceso y archivo, reutilizada entre imágenes
+_open_caches = {}
+
+def open_cache(path=None):
+    """
+    Devuelve la caché de `path` de este proceso, abriéndola la primera vez.
+
+    Args:
+        path: Archivo SQLite (por defecto CACHE_CONFIG['path'])
+
+    Returns:
+        ResultCache: Caché abierta
+    """
+    path = path or CACHE_CONFIG['path']
+    if path not in _open_caches:
+        _open_caches[path] = ResultCache(path)
+    return _open_caches[path]
@@ -0,0 +1,287 @@
+import numpy as np
+from .tiled_topology import UnionFind
+from .image_reader import iter_binary_chunks, CHUNK_ROWS
+
+def _runs_from_dense(binary, row_offset=0):
+    """Tramos de píxeles activos de cada fila de un bloque denso: (filas, inicios, finales)"""
+    binary = np.asarray(binary, dtype=bool)
+    height = binary.shape[0]
+    padded = np.zeros((height, binary.shape[1] + 2), dtype=np.int8)
+    padded[:, 1:-1] = binary
+    rows, cols = np.nonzero(np.diff(padded, axis=1))
+    # Las transiciones de cada fila alternan inicio (0->1) y final (1->0)
+    return rows[::2] + row_offset, cols[::2], cols[1::2]
+
+class RLEMask:
+    """
+    Máscara binaria codificada por tramos (run-length encoding): para cada
+    fila, los intervalos [inicio, final) de píxeles activos, ordenados por
+    fila y columna. Ocupa memoria proporcional al número de tramos, de modo
+    que es muy compacta en máscaras con mucho fondo.
+
+    Las métricas de este módulo trabajan directamente sobre los tramos y el
+    solapamiento entre tramos de filas consecutivas, sin reconstruir la
+    imagen densa.
+
+    Args:
+        rows: Fila de cada tramo
+        starts: Columna inicial de cada tramo
+        ends: Columna final (excluida) de cada tramo
+        shape: (alto, ancho) de la imagen
+    """
+
+    def __init__(self, rows, starts, ends, shape):
+        self.rows = np.asarray(rows, dtype=np.int64)
+        self.starts = np.asarray(starts, dtype=np.int64)
+        self.ends = np.asarray(ends, dtype=np.int64)
+        self.shape = tuple(shape)
+
+    @classmethod
+    def from_array(cls, image, threshold=0.5):
+        """
+        Codifica una imagen 2D densa.
+
+        Args:
+            image: Imagen 2D (píxel activo si > threshold)
+            threshold: Umbral de binarización
+
+        Returns:
+            RLEMask: Máscara codificada
+        """
+        image = np.asarray(image)
+        binary = image if image.dtype == bool else image > threshold
+        return cls(*_runs_from_dense(binary), binary.shape)
+
+    @classmethod
+    def from_chunks(cls, chunks, shape):
+        """
+        Codifica una imagen a partir de bloques de filas (fila inicial, bloque
+        booleano), como los de iter_binary_chunks, sin la imagen completa.
+        """
+        return cls.from_runs([_runs_from_dense(chunk, r0) for r0, chunk in chunks], shape)
+
+    @classmethod
+    def from_runs(cls, parts, shape):
+        """Une listas de tramos (filas, inicios, finales) ya ordenadas por fila"""
+        if not parts:
+            return cls([], [], [], shape)
+        rows, starts, ends = (np.concatenate(p) for p in zip(*parts))
+        return cls(rows, starts, ends, shape)
+
+    def to_array(self):
+        """Reconstruye la imagen densa booleana"""
+        image = np.zeros(self.shape, dtype=bool)
+        for r, s, e in zip(self.rows, self.starts, self.ends):
+            image[r, s:e] = True
+        return image
+
+    @property
+    def num_runs(self):
+        return len(self.starts)
+
+    @property
+    def nbytes(self):
+        return self.rows.nbytes + self.starts.nbytes + self.ends.nbytes
+
+    @property
+    def area(self):
+        """Número de píxeles activos"""
+        return int(np.sum(self.ends - self.starts))
+
+    def complement(self):
+        """Tramos de poro (intervalos entre tramos de material y bordes de cada fila)"""
+        height, width = self.shape
+        key = _row_keys(self.rows, self.starts, width)
+
+        # Candidatos: el inicio de cada fila y el final de cada tramo
+        cand_rows = np.concatenate([np.arange(height), self.rows])
+        cand_starts = np.concatenate([np.zeros(height, dtype=np.int64), self.ends])
+        order = np.argsort(_row_keys(cand_rows, cand_starts, width), kind='stable')
+        cand_rows, cand_starts = cand_rows[order], cand_starts[order]
+
+        # Cada poro termina donde empieza el siguiente tramo de la fila (o en el ancho)
+        nxt = np.searchsorted(key, _row_keys(cand_rows, cand_starts, width), side='left')
+        has_next = nxt < self.num_runs
+        same_row = np.zeros_like(has_next)
+        same_row[has_next] = self.rows[nxt[has_next]] == cand_rows[has_next]
+        cand_ends = np.full(cand_rows.shape, width, dtype=np.int64)
+        cand_ends[same_row] = self.starts[nxt[same_row]]
+
+        keep = cand_ends > cand_starts
+        return RLEMask(cand_rows[keep], cand_starts[keep], cand_ends[keep], self.shape)
+
+def _row_keys(rows, cols, width):
+    """Clave que ordena posiciones por (fila, columna), admitiendo columnas en [-2, ancho+2]"""
+    return rows * (width + 5) + (cols + 2)
+
+def _overlap_pairs(a, b, expand=0, row_shift=1):
+    """
+    Pares (i, j) de tramos de `a` en la fila r y de `b` en la fila r+row_shift
+    cuyos intervalos se solapan al ensanchar cada tramo `expand` columnas
+    (0 = vecindad-4, 1 = vecindad-8).
+
+    Returns:
+        tuple: Índices de tramos en `a` y en `b`
+    """
+    width = a.shape[1]
+    b_rows = b.rows - row_shift
+    end_keys = _row_keys(b_rows, b.ends, width)
+    start_keys = _row_keys(b_rows, b.starts, width)
+
+    # Tramos de b con final > inicio_a - expand e inicio < final_a + expand
+    lo = np.searchsorted(end_keys, _row_keys(a.rows, a.starts - expand, width), side='right')
+    hi = np.searchsorted(start_keys, _row_keys(a.rows, a.ends + expand, width), side='left')
+    counts = np.maximum(hi - lo, 0)
+
+    i = np.repeat(np.arange(len(counts)), counts)
+    first = np.repeat(lo, counts)
+    within = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    return i, first + within
+
+def _overlap_lengths(a, b, i, j, expand=0):
+    """Longitud del solapamiento de cada par (i, j) con los tramos ensanchados `expand`"""
+    return np.minimum(a.ends[i], b.ends[j]) + expand - np.maximum(a.starts[i], b.starts[j])
+
+def rle_vertices_edges_faces(rle):
+    """
+    Cuenta V, E y F con los mismos criterios que count_vertices_edges_faces_corrected.
+
+    - F: suma de longitudes de los tramos
+    - E = 4F - pares horizontales (longitud - 1 por tramo) - pares verticales
+      (solapamiento entre tramos de filas consecutivas)
+    - V: cada tramo [s, e) toca los vértices s..e de las dos líneas de la
+      retícula que lo limitan; V = 2 Σ(e - s + 1) menos lo que comparten los
+      tramos de filas consecutivas (solapamiento ensanchado una columna)
+
+    Args:
+        rle: RLEMask
+
+    Returns:
+        tuple: (V, E, F)
+    """
+    F = rle.area
+    horizontal = F - rle.num_runs
+
+    i, j = _overlap_pairs(rle, rle, expand=0)
+    vertical = int(_overlap_lengths(rle, rle, i, j).sum())
+    E = 4 * F - horizontal - vertical
+
+    i, j = _overlap_pairs(rle, rle, expand=1)
+    shared_vertices = int(_overlap_lengths(rle, rle, i, j, expand=1).sum())
+    V = 2 * (F + rle.num_runs) - shared_vertices
+
+    return V, E, F
+
+def rle_perimeter(rle):
+    """
+    Píxeles activos con algún 4-vecino inactivo, igual que compute_perimeter.
+
+    Un píxel es interior si no está en un extremo de su tramo y tanto la fila
+    de arriba como la de abajo están activas en su columna: se intersecan los
+    interiores de los tramos con los tramos de la fila anterior y después con
+    los de la siguiente.
+
+    Args:
+        rle: RLEMask
+
+    Returns:
+        int: Número de píxeles de borde
+    """
+    inner = RLEMask(rle.rows, rle.starts + 1, rle.ends - 1, rle.shape)
+    keep = inner.ends > inner.starts
+    inner = RLEMask(inner.rows[keep], inner.starts[keep], inner.ends[keep], rle.shape)
+
+    for row_shift in (-1, 1):
+        i, j = _overlap_pairs(inner, rle, expand=0, row_shift=row_shift)
+        inner = RLEMask(inner.rows[i], np.maximum(inner.starts[i], rle.starts[j]),
+                        np.minimum(inner.ends[i], rle.ends[j]), rle.shape)
+        keep = inner.ends > inner.starts
+        inner = RLEMask(inner.rows[keep], inner.starts[keep], inner.ends[keep], rle.shape)
+
+    return rle.area - inner.area
+
+def _run_components(rle):
+    """Etiqueta (raíz de union-find) de cada tramo uniendo tramos 8-vecinos de filas consecutivas"""
+    union_find = UnionFind()
+    offset = union_find.add(rle.num_runs)
+    for a, b in zip(*_overlap_pairs(rle, rle, expand=1)):
+        union_find.union(int(a) + offset + 1, int(b) + offset + 1)
+    return union_find.roots()[offset + 1:]
+
+def rle_betti_numbers(rle):
+    """
+    Calcula (β₀, β₁) con las convenciones de compute_betti_numbers_2d
+    (conectividad-8 para material y poros, inversión si el píxel [0, 0] es
+    material), uniendo tramos de filas consecutivas con union-find.
+
+    Args:
+        rle: RLEMask
+
+    Returns:
+        tuple: (β₀, β₁) números de Betti (componentes, agujeros)
+    """
+    material, pores = rle, rle.complement()
+    if material.num_runs and material.rows[0] == 0 and material.starts[0] == 0:
+        material, pores = pores, material
+
+    beta0 = len(np.unique(_run_components(material)))
+
+    # Los poros que tocan el borde de la imagen no son agujeros
+    height, width = rle.shape
+    pore_roots = _run_components(pores)
+    on_border = ((pores.rows == 0) | (pores.rows == height - 1) |
+                 (pores.starts == 0) | (pores.ends == width))
+    beta1 = len(np.setdiff1d(np.unique(pore_roots), pore_roots[on_border]))
+
+    return beta0, beta1
+
+def rle_metrics(rle):
+    """
+    Métricas básicas sobre la máscara codificada, con las claves de
+    validate_euler_formulas más 'area_fraction' y 'perimeter'.
+
+    Args:
+        rle: RLEMask
+
+    Returns:
+        dict: Métricas topológicas
+    """
+    V, E, F = rle_vertices_edges_faces(rle)
+    beta0, beta1 = rle_betti_numbers(rle)
+    euler_vef = V - E + F
+    euler_betti = beta0 - beta1
+    height, width = rle.shape
+
+    return {
+        'vertices': V,
+        'edges': E,
+        'faces': F,
+        'beta0': beta0,
+        'beta1': beta1,
+        'euler_vef': euler_vef,
+        'euler_poincare': euler_betti,
+        'is_consistent': euler_vef == euler_betti,
+        'difference': abs(euler_vef - euler_betti),
+        'area_fraction': F / (height * width),
+        'perimeter': rle_perimeter(rle)
+    }
+
+def read_rle_image(image_path, threshold=127, chunk_rows=CHUNK_ROWS, **kwargs):
+    """
+    Lee una imagen por bloques de filas (iter_binary_chunks) y la codifica
+    por tramos sin tener la imagen binaria completa en memoria.
+
+    Args:
+        image_path: Ruta a la imagen
+        threshold: Valor umbral para binarización
+        chunk_rows: Filas por bloque
+        **kwargs: page, shape, dtype u offset de iter_binary_chunks
+
+    Returns:
+        RLEMask: Máscara codificada
+    """
+    parts, height, width = [], 0, 0
+    for r0, chunk in iter_binary_chunks(image_path, threshold=threshold, chunk_rows=chunk_rows, **kwargs):
+        parts.append(_runs_from_dense(chunk, r0))
+        height, width = r0 + chunk.shape[0], chunk.shape[1]
+    return RLEMask.from_runs(parts, (height, width))
@@ -0,0 +1,112 @@
+import logging
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config.topology_config import LOGGING_CONFIG
+
+# Logger dedicado a los volcados de códigos: solo se activa con dump_codes
+CODES_LOGGER_NAME = 'generator.codes'
+
+VERBOSITY_LEVELS = {
+    0: logging.WARNING,
+    1: logging.INFO,
+    2: logging.DEBUG
+}
+
+logger = logging.getLogger(__name__)
+codes_logger = logging.getLogger(CODES_LOGGER_NAME)
+
+# Manejadores añadidos por configure_logging, para reemplazarlos al reconfigurar
+_handlers = {}
+
+def configure_logging(verbosity=None, dump_codes=None, stream=None, loggers=None):
+    """
+    Configura el registro de una ejecución.
+
+    El manejador se añade a los loggers del paquete y de los scripts, que
+    dejan de propagar al raíz: los manejadores que la aplicación tenga en el
+    logger raíz no se eliminan ni duplican los mensajes. Llamarla de nuevo
+    reemplaza solo el manejador que añadió la llamada anterior.
+
+    Args:
+        verbosity: 0=solo advertencias, 1=progreso, 2=detalle
+                   (por defecto LOGGING_CONFIG['verbosity'])
+        dump_codes: Si se vuelcan las cadenas de códigos completas
+                    (por defecto LOGGING_CONFIG['dump_codes'])
+        stream: Flujo de salida (por defecto sys.stdout)
+        loggers: Nombres de los loggers a configurar
+                 (por defecto LOGGING_CONFIG['loggers'])
+    """
+    if verbosity is None:
+        verbosity = LOGGING_CONFIG['verbosity']
+    if dump_codes is None:
+        dump_codes = LOGGING_CONFIG['dump_codes']
+    if loggers is None:
+        loggers = LOGGING_CONFIG['loggers']
+
+    level = VERBOSITY_LEVELS[max(0, min(verbosity, 2))]
+
+    handler = logging.StreamHandler(stream or sys.stdout)
+    handler.setFormatter(logging.Formatter(LOGGING_CONFIG['format']))
+
+    for name in loggers:
+        target = logging.getLogger(name)
+        if name in _handlers:
+            target.removeHandler(_handlers[name])
+        target.addHandler(handler)
+        target.setLevel(level)
+        target.propagate = False
+        _handlers[name] = handler
+
+    # Los códigos se registran en DEBUG; se silencian salvo que se pidan
+    codes_logger.setLevel(logging.DEBUG if dump_codes else logging.CRITICAL + 1)
+
+def log_codes(label, code):
+    """
+    Registra una cadena de códigos solo si el volcado está activado,
+    sin construir el mensaje en caso contrario.
+
+    Args:
+        label: Nombre del código (p. ej. 'VCC')
+        code: Cadena de códigos
+    """
+    if codes_logger.isEnabledFor(logging.DEBUG):
+        codes_logger.debug("%s: %s", label, code)
+
+def summarize_run(results, elapsed):
+    """
+    Calcula y registra los contadores de una ejecución.
+
+    Args:
+        results: Lista de resultados con los códigos en result['codes'] (o
+                 sus longitudes en result['code_lengths'])
+        elapsed: Tiempo total en segundos
+
+    Returns:
+        dict: Contadores (imágenes, segundos, imágenes/s, bytes de códigos)
+    """
+    code_bytes = {'f8': 0, 'f4': 0, 'vcc': 0, 'ot3': 0}
+    for result in results:
+        for key in code_bytes:
+            if 'code_lengths' in result:
+                code_bytes[key] += result['code_lengths'][key]
+            else:
+                code_bytes[key] += len(result['codes'][key])
+
+    counters = {
+        'images': len(results),
+        'elapsed': elapsed,
+        'images_per_second': len(results) / elapsed if elapsed > 0 else 0.0,
+        'code_bytes': sum(code_bytes.values()),
+        'code_bytes_by_type': code_bytes
+    }
+
+    logger.info("\nResumen de la ejecución:")
+    logger.info("  Imágenes analizadas: %d", counters['images'])
+    logger.info("  Tiempo total: %.2f s (%.2f imágenes/s)",
+                counters['elapsed'], counters['images_per_second'])
+    logger.info("  Bytes de códigos generados: %d (F8=%d, F4=%d, VCC=%d, 3OT=%d)",
+                counters['code_bytes'], code_bytes['f8'], code_bytes['f4'],
+                code_bytes['vcc'], code_bytes['ot3'])
+
+    return counters
@@ -0,0 +1,118 @@
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait, FIRST_COMPLETED
+from .binary_mask import popcount, shift_right
+from .topology_base import compute_betti_numbers_2d
+
+# Columnas de la tabla de resultados de analyze_stack
+STACK_COLUMNS = ['slice', 'vertices', 'edges', 'faces', 'euler_vef',
+                 'beta0', 'beta1', 'euler_poincare', 'area_fraction']
+
+def stack_vertices_edges_faces(batch):
+    """
+    Cuenta V, E y F de todos los cortes de un bloque (B, H, W) a la vez,
+    con los mismos criterios que count_vertices_edges_faces_corrected.
+
+    Las filas se empaquetan en bits y las cuentas se hacen con popcount,
+    desplazamientos y AND/OR por corte, como en BinaryMask.
+
+    Args:
+        batch: Array booleano (B, H, W)
+
+    Returns:
+        tuple: Arrays (V, E, F) de B elementos
+    """
+    packed = np.packbits(batch, axis=-1)
+    F = popcount(packed, axis=(1, 2))
+    pairs = (popcount(packed & shift_right(packed), axis=(1, 2)) +
+             popcount(packed[:, :-1] & packed[:, 1:], axis=(1, 2)))
+    E = 4 * F - pairs
+
+    # Un byte más por fila para el vértice a la derecha del último píxel
+    extended = np.pad(packed, ((0, 0), (0, 0), (0, 1)))
+    row_or = extended | shift_right(extended)
+    V = (popcount(row_or[:, 0], axis=1) + popcount(row_or[:, -1], axis=1) +
+         popcount(row_or[:, :-1] | row_or[:, 1:], axis=(1, 2)))
+
+    return V, E, F
+
+def stack_betti_numbers(batch):
+    """
+    Números de Betti de cada corte con compute_betti_numbers_2d.
+
+    Args:
+        batch: Array booleano (B, H, W)
+
+    Returns:
+        numpy.ndarray: Array (B, 2) con (β₀, β₁) de cada corte
+    """
+    return np.array([compute_betti_numbers_2d(s.view(np.uint8)) for s in batch],
+                    dtype=np.int64).reshape(-1, 2)
+
+def analyze_stack(stack, batch_size=64, workers=None, use_processes=True, threshold=0.5):
+    """
+    Calcula V/E/F/χ, β₀/β₁ y la fracción de área de todos los cortes de una
+    pila (N, H, W), p. ej. un volumen de TC o una secuencia de vídeo.
+
+    V/E/F se calculan vectorizados por bloques de `batch_size` cortes en este
+    proceso; el etiquetado de β₀/β₁ de cada bloque se reparte en un pool de
+    procesos o hilos, con un número acotado de bloques en vuelo para que
+    solo haya unos pocos bloques de la pila en memoria (sirve con np.memmap).
+
+    Args:
+        stack: Array (N, H, W) o memmap con los cortes
+        batch_size: Cortes por bloque
+        workers: Procesos o hilos para el etiquetado (None = en este proceso)
+        use_processes: ProcessPoolExecutor si True, ThreadPoolExecutor si False
+        threshold: Umbral de binarización (píxel activo si > threshold)
+
+    Returns:
+        pandas.DataFrame: Una fila por corte con las columnas de STACK_COLUMNS
+    """
+    if stack.ndim != 3:
+        raise ValueError(f"La pila debe tener forma (N, H, W), tiene {stack.shape}")
+
+    num_slices, height, width = stack.shape
+    columns = {name: np.zeros(num_slices, dtype=np.int64) for name in STACK_COLUMNS}
+    columns['slice'] = np.arange(num_slices)
+
+    def read_batch(start):
+        batch = np.asarray(stack[start:start + batch_size])
+        return batch if batch.dtype == bool else batch > threshold
+
+    def store_vef(start, batch):
+        V, E, F = stack_vertices_edges_faces(batch)
+        rows = slice(start, start + len(batch))
+        columns['vertices'][rows], columns['edges'][rows], columns['faces'][rows] = V, E, F
+
+    def store_betti(start, betti):
+        rows = slice(start, start + len(betti))
+        columns['beta0'][rows], columns['beta1'][rows] = betti[:, 0], betti[:, 1]
+
+    starts = range(0, num_slices, batch_size)
+    if workers is None:
+        for start in starts:
+            batch = read_batch(start)
+            store_vef(start, batch)
+            store_betti(start, stack_betti_numbers(batch))
+    else:
+        pool = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+        with pool(max_workers=workers) as executor:
+            max_pending = 2 * workers
+            pending = {}
+            for start in starts:
+                if len(pending) >= max_pending:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        store_betti(pending.pop(future), future.result())
+                batch = read_batch(start)
+                pending[executor.submit(stack_betti_numbers, batch)] = start
+                store_vef(start, batch)
+            for future, start in pending.items():
+                store_betti(start, future.result())
+
+    columns['euler_vef'] = columns['vertices'] - columns['edges'] + columns['faces']
+    columns['euler_poincare'] = columns['beta0'] - columns['beta1']
+    columns['area_fraction'] = columns['faces'] / (height * width) if height * width else 0.0
+
+    return pd.DataFrame(columns, columns=STACK_COLUMNS)
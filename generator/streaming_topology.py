@@ -0,0 +1,222 @@
+import numpy as np
+from .tiled_topology import UnionFind
+
+def _row_runs(row):
+    """Tramos [inicio, final) de píxeles activos de una fila booleana"""
+    padded = np.zeros(len(row) + 2, dtype=np.int8)
+    padded[1:-1] = row
+    cols = np.flatnonzero(np.diff(padded))
+    return cols[::2], cols[1::2]
+
+def _touching_runs(prev_starts, prev_ends, starts, ends):
+    """
+    Pares (i, j) de tramos de la fila anterior y de la actual que son
+    vecinos-8 (se solapan al ensanchar una columna).
+    """
+    lo = np.searchsorted(prev_ends, starts - 1, side='right')
+    hi = np.searchsorted(prev_starts, ends + 1, side='left')
+    counts = np.maximum(hi - lo, 0)
+
+    j = np.repeat(np.arange(len(counts)), counts)
+    within = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    return np.repeat(lo, counts) + within, j
+
+def _line_vertices(upper, lower):
+    """Vértices de la línea de la retícula entre dos filas que tocan algún píxel activo"""
+    line = upper | lower
+    return int(line[0]) + int(line[-1]) + int(np.count_nonzero(line[:-1] | line[1:]))
+
+class _RunLayer:
+    """
+    Componentes conectividad-8 abiertas (que llegan a la última fila) de una
+    clase de píxeles: los tramos de la última fila con la componente de cada
+    uno, y si cada componente toca el borde de la imagen.
+    """
+
+    def __init__(self):
+        self.starts = np.zeros(0, dtype=np.int64)
+        self.ends = np.zeros(0, dtype=np.int64)
+        self.component = np.zeros(0, dtype=np.int64)
+        self.on_border = np.zeros(0, dtype=bool)
+        self.closed = 0
+        self.closed_inside = 0
+
+    @property
+    def num_open(self):
+        return len(self.on_border)
+
+    def push(self, starts, ends, run_on_border):
+        """Une los tramos de una fila nueva con las componentes abiertas y cierra las que no continúan"""
+        num_open, num_runs = self.num_open, len(starts)
+        union_find = UnionFind()
+        union_find.add(num_open + num_runs)
+        for i, j in zip(*_touching_runs(self.starts, self.ends, starts, ends)):
+            union_find.union(int(self.component[i]) + 1, num_open + int(j) + 1)
+        roots = union_find.roots()[1:]
+        open_roots, run_roots = roots[:num_open], roots[num_open:]
+
+        # Componentes sin ningún tramo en la fila nueva: quedan cerradas
+        alive = np.isin(open_roots, run_roots)
+        self.closed += int(np.count_nonzero(~alive))
+        self.closed_inside += int(np.count_nonzero(~alive & ~self.on_border))
+
+        # Se renumeran las componentes que siguen abiertas como 0..k-1
+        merged, component = np.unique(run_roots, return_inverse=True)
+        on_border = np.zeros(len(merged), dtype=bool)
+        np.logical_or.at(on_border, component, run_on_border)
+        np.logical_or.at(on_border, np.searchsorted(merged, open_roots[alive]), self.on_border[alive])
+
+        self.starts, self.ends = starts, ends
+        self.component, self.on_border = component, on_border
+
+class StreamingTopology:
+    """
+    Analiza una máscara que llega fila a fila (p. ej. de una cámara de línea)
+    sin guardar la imagen: solo conserva la fila anterior y un union-find de
+    las componentes abiertas, de modo que la memoria es O(ancho).
+
+    - V, E y F se acumulan con cada fila nueva y su vecina anterior, con los
+      mismos criterios que count_vertices_edges_faces_corrected.
+    - β₀ y β₁ se obtienen uniendo los tramos de material y de poro de cada
+      fila con los de la anterior (conectividad-8). Una componente que no
+      continúa en la fila nueva se cierra y se cuenta; un poro cerrado es un
+      agujero si nunca tocó el borde. Se sigue la convención de
+      compute_betti_numbers_2d de invertir la imagen si el píxel [0, 0] es
+      material.
+
+    Al terminar, finish() devuelve los mismos valores que validate_euler_formulas
+    sobre la imagen completa.
+    """
+
+    def __init__(self):
+        self.width = None
+        self.rows = 0
+        self.vertices = 0  # sin la línea inferior de la última fila
+        self.edges = 0
+        self.faces = 0
+        self._previous = None
+        self._invert = False
+        self._material = _RunLayer()
+        self._pores = _RunLayer()
+
+    def push(self, row):
+        """
+        Añade la siguiente fila de la máscara.
+
+        Args:
+            row: Fila 1D (píxel activo si > 0.5)
+
+        Returns:
+            dict: Cuentas acumuladas hasta esta fila (row, vertices, edges,
+                  faces, euler_vef), como si la imagen terminara en ella
+        """
+        row = np.asarray(row)
+        row = row if row.dtype == bool else row > 0.5
+        if row.ndim != 1:
+            raise ValueError(f"Cada fila debe ser 1D, tiene forma {row.shape}")
+
+        if self.width is None:
+            self.width = len(row)
+            self._previous = np.zeros(self.width, dtype=bool)
+            self._invert = bool(row[0]) if self.width else False
+        elif len(row) != self.width:
+            raise ValueError(f"La fila {self.rows} tiene {len(row)} píxeles, se esperaban {self.width}")
+
+        previous = self._previous
+        area = int(np.count_nonzero(row))
+        pairs = int(np.count_nonzero(row[1:] & row[:-1])) + int(np.count_nonzero(previous & row))
+        self.faces += area
+        self.edges += 4 * area - pairs
+        if self.width:
+            self.vertices += _line_vertices(previous, row)
+        self._push_components(row)
+
+        self._previous = row.copy()
+        self.rows += 1
+        return self.running()
+
+    def _push_components(self, row):
+        material_starts, material_ends = _row_runs(row)
+        pore_starts, pore_ends = _row_runs(~row)
+        if self._invert:
+            material_starts, material_ends, pore_starts, pore_ends = pore_starts, pore_ends, material_starts, material_ends
+
+        self._material.push(material_starts, material_ends, np.zeros(len(material_starts), dtype=bool))
+        pore_on_border = (pore_starts == 0) | (pore_ends == self.width) | (self.rows == 0)
+        self._pores.push(pore_starts, pore_ends, pore_on_border)
+
+    def running(self):
+        """
+        Returns:
+            dict: Cuentas V/E/F/χ de las filas recibidas hasta ahora
+        """
+        vertices = self.vertices
+        if self.rows and self.width:
+            vertices += _line_vertices(self._previous, np.zeros_like(self._previous))
+        return {
+            'row': self.rows - 1,
+            'vertices': vertices,
+            'edges': self.edges,
+            'faces': self.faces,
+            'euler_vef': vertices - self.edges + self.faces
+        }
+
+    def finish(self):
+        """
+        Cierra la imagen tras la última fila: las componentes de material que
+        siguen abiertas cuentan para β₀ y los poros abiertos tocan el borde
+        inferior, así que no son agujeros.
+
+        Returns:
+            dict: Mismas claves que validate_euler_formulas
+        """
+        counts = self.running()
+        beta0 = self._material.closed + self._material.num_open
+        beta1 = self._pores.closed_inside
+        euler_vef = counts['euler_vef']
+        euler_betti = beta0 - beta1
+
+        return {
+            'vertices': counts['vertices'],
+            'edges': counts['edges'],
+            'faces': counts['faces'],
+            'beta0': beta0,
+            'beta1': beta1,
+            'euler_vef': euler_vef,
+            'euler_poincare': euler_betti,
+            'is_consistent': euler_vef == euler_betti,
+            'difference': abs(euler_vef - euler_betti)
+        }
+
+def scan_rows(rows, scanner=None):
+    """
+    Recorre un iterable de filas y produce las cuentas acumuladas tras cada
+    una. Las filas se consumen de una en una, así que sirve con generadores
+    infinitos o de cámara; pasar un `scanner` propio permite llamar a su
+    finish() al final para obtener β₀ y β₁.
+
+    Args:
+        rows: Iterable de filas 1D (o array 2D, que se recorre por filas)
+        scanner: StreamingTopology a usar (se crea uno nuevo si no se indica)
+
+    Yields:
+        dict: Cuentas acumuladas (ver StreamingTopology.push)
+    """
+    scanner = scanner if scanner is not None else StreamingTopology()
+    for row in rows:
+        yield scanner.push(row)
+
+def stream_euler_betti(rows):
+    """
+    Consume todas las filas de un iterable y devuelve las métricas finales.
+
+    Args:
+        rows: Iterable de filas 1D
+
+    Returns:
+        dict: Mismas claves que validate_euler_formulas
+    """
+    scanner = StreamingTopology()
+    for _ in scan_rows(rows, scanner):
+        pass
+    return scanner.finish()
@@ -0,0 +1,336 @@
+import numpy as np
+import sys
+import os
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from scipy import ndimage
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config.topology_config import TILING_CONFIG
+from .topology_base import histograma_bloques_2x2
+
+# Contribución (V, E, F) de cada bloque 2x2 de la imagen rodeada por un marco
+# de ceros, con los bits de histograma_bloques_2x2 (1=sup-izq, 2=sup-der,
+# 4=inf-izq, 8=inf-der). Cada bloque representa el vértice de la retícula en
+# su centro, la arista vertical y la horizontal que salen hacia arriba y hacia
+# la izquierda de ese vértice, y el píxel superior izquierdo:
+#   V: el vértice toca algún píxel activo       (código != 0)
+#   E: arista vertical entre sup-izq y sup-der  (bits 1|2)
+#      arista horizontal entre sup-izq e inf-izq (bits 1|4)
+#   F: el píxel superior izquierdo está activo  (bit 1)
+# Así cada vértice, arista y cara del complejo se cuenta exactamente una vez,
+# igual que en count_vertices_edges_faces_corrected.
+_CODES = np.arange(16)
+TABLA_COMPLEJO_CELULAR = np.stack([
+    (_CODES != 0).astype(np.int64),
+    ((_CODES & 3) != 0).astype(np.int64) + ((_CODES & 5) != 0).astype(np.int64),
+    (_CODES & 1).astype(np.int64)
+], axis=1)
+
+def iter_tile_bounds(shape, tile_size=None):
+    """
+    Recorre la imagen en teselas de tamaño fijo.
+
+    Args:
+        shape: (alto, ancho) de la imagen
+        tile_size: Lado de las teselas (por defecto TILING_CONFIG['tile_size'])
+
+    Yields:
+        tuple: (r0, r1, c0, c1) límites de cada tesela (r1 y c1 excluidos)
+    """
+    tile_size = tile_size or TILING_CONFIG['tile_size']
+    height, width = shape
+    for r0 in range(0, height, tile_size):
+        for c0 in range(0, width, tile_size):
+            yield r0, min(r0 + tile_size, height), c0, min(c0 + tile_size, width)
+
+def read_tile_with_overlap(image, bounds, threshold=0.5):
+    """
+    Lee una tesela con un píxel de solape hacia arriba y hacia la izquierda y
+    la binariza. Los lados que coinciden con el borde de la imagen se completan
+    con ceros (el marco de fondo que rodea la imagen).
+
+    Args:
+        image: Array 2D (ndarray o memmap) con la imagen completa
+        bounds: (r0, r1, c0, c1) de la tesela
+        threshold: Umbral de binarización (píxel activo si > threshold)
+
+    Returns:
+        numpy.ndarray: Tesela booleana de (r1-r0+1) x (c1-c0+1) píxeles
+    """
+    height, width = image.shape
+    r0, r1, c0, c1 = bounds
+    tile = np.asarray(image[max(r0 - 1, 0):r1, max(c0 - 1, 0):c1]) > threshold
+    pad = ((int(r0 == 0), int(r1 == height)), (int(c0 == 0), int(c1 == width)))
+    return np.pad(tile, pad, mode='constant', constant_values=False)
+
+def tiled_quad_histogram(image, tile_size=None, threshold=0.5):
+    """
+    Histograma de códigos 2x2 de la imagen con marco de ceros, acumulado
+    tesela a tesela.
+
+    Cada tesela aporta los bloques cuyo píxel inferior derecho cae dentro de
+    ella (más la fila y columna del marco en las teselas del borde inferior y
+    derecho). El solape de un píxel aporta la fila y la columna que comparte
+    con la tesela vecina, de modo que los bloques que cruzan la costura se
+    cuentan una sola vez y la suma es exacta.
+
+    Args:
+        image: Array 2D (ndarray o memmap, p. ej. de open_memmap_image)
+        tile_size: Lado de las teselas (por defecto TILING_CONFIG['tile_size'])
+        threshold: Umbral de binarización (píxel activo si > threshold)
+
+    Returns:
+        numpy.ndarray: Histograma de 16 posiciones
+    """
+    histograma = np.zeros(16, dtype=np.int64)
+    for bounds in iter_tile_bounds(image.shape, tile_size):
+        histograma += histograma_bloques_2x2(read_tile_with_overlap(image, bounds, threshold))
+    return histograma
+
+def tiled_vertices_edges_faces(image, tile_size=None, threshold=0.5):
+    """
+    Cuenta V, E y F del complejo celular de la imagen sin cargarla completa.
+
+    Args:
+        image: Array 2D (ndarray o memmap, p. ej. de open_memmap_image)
+        tile_size: Lado de las teselas (por defecto TILING_CONFIG['tile_size'])
+        threshold: Umbral de binarización (píxel activo si > threshold)
+
+    Returns:
+        tuple: (V, E, F), iguales a count_vertices_edges_faces_corrected
+    """
+    histograma = tiled_quad_histogram(image, tile_size, threshold)
+    V, E, F = (int(x) for x in histograma @ TABLA_COMPLEJO_CELULAR)
+    return V, E, F
+
+def tiled_euler_characteristic(image, tile_size=None, threshold=0.5):
+    """
+    Calcula χ = V - E + F por teselas. Como χ es aditiva, basta con sumar
+    las contribuciones de los bloques 2x2 de cada tesela; el resultado es
+    exacto y coincide con euler_characteristic_2d.
+
+    Args:
+        image: Array 2D (ndarray o memmap, p. ej. de open_memmap_image)
+        tile_size: Lado de las teselas (por defecto TILING_CONFIG['tile_size'])
+        threshold: Umbral de binarización (píxel activo si > threshold)
+
+    Returns:
+        int: Característica de Euler
+    """
+    V, E, F = tiled_vertices_edges_faces(image, tile_size, threshold)
+    return V - E + F
+
+# Conectividad-8 para material y poros, como en compute_betti_numbers_2d
+ESTRUCTURA_8 = np.ones((3, 3), dtype=bool)
+
+class UnionFind:
+    """
+    Conjuntos disjuntos sobre etiquetas enteras que crecen a medida que
+    llegan teselas. Se usa para unir las etiquetas de componentes que se
+    tocan a través de las costuras entre teselas.
+    """
+
+    def __init__(self):
+        self.parent = [0]  # la etiqueta 0 no se usa
+
+    def add(self, count):
+        """Añade `count` etiquetas nuevas y devuelve el desplazamiento de la primera menos uno"""
+        offset = len(self.parent) - 1
+        self.parent.extend(range(offset + 1, offset + 1 + count))
+        return offset
+
+    def find(self, x):
+        parent = self.parent
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]  # compresión por división a la mitad
+            x = parent[x]
+        return x
+
+    def union(self, a, b):
+        ra, rb = self.find(a), self.find(b)
+        if ra != rb:
+            self.parent[max(ra, rb)] = min(ra, rb)
+
+    def roots(self):
+        """Raíz de cada etiqueta como array (con compresión completa de caminos)"""
+        parent = np.asarray(self.parent, dtype=np.int64)
+        while True:
+            grandparent = parent[parent]
+            if np.array_equal(grandparent, parent):
+                return parent
+            parent = grandparent
+
+def label_tile(tile, invert=False):
+    """
+    Etiqueta el material y los poros de una tesela por separado (conectividad-8)
+    y devuelve solo lo necesario para unirla con sus vecinas: las etiquetas y
+    valores de sus cuatro bordes.
+
+    Las etiquetas del material son 1..n_fg y las de los poros n_fg+1..n_fg+n_bg.
+
+    Args:
+        tile: Tesela booleana (True=material)
+        invert: Si se intercambian material y poros
+
+    Returns:
+        dict: 'n_fg', 'n_bg' y, para 'top', 'bottom', 'left', 'right',
+              las etiquetas del borde y sus valores en '<borde>_value'
+    """
+    tile = np.asarray(tile, dtype=bool)
+    if invert:
+        tile = ~tile
+
+    labels, n_fg = ndimage.label(tile, structure=ESTRUCTURA_8)
+    background, n_bg = ndimage.label(~tile, structure=ESTRUCTURA_8)
+    labels = labels.astype(np.int64)
+    labels[~tile] = background[~tile] + n_fg
+
+    edges = {
+        'top': np.s_[0, :],
+        'bottom': np.s_[-1, :],
+        'left': np.s_[:, 0],
+        'right': np.s_[:, -1],
+    }
+    result = {'n_fg': n_fg, 'n_bg': n_bg}
+    for name, index in edges.items():
+        result[name] = labels[index].copy()
+        result[f'{name}_value'] = tile[index].copy()
+    return result
+
+def _merge_strips(union_find, labels_a, values_a, labels_b, values_b, offsets=(-1, 0, 1)):
+    """
+    Une las etiquetas de dos bordes enfrentados: el píxel i de un borde toca
+    los píxeles i-1, i e i+1 del otro (conectividad-8) y se unen si tienen el
+    mismo valor (material con material, poro con poro).
+    """
+    n = len(labels_a)
+    pairs = []
+    for d in offsets:
+        a = slice(max(0, -d), n - max(0, d))
+        b = slice(max(0, d), n + min(0, d))
+        same = values_a[a] == values_b[b]
+        pairs.append(np.stack([labels_a[a][same], labels_b[b][same]], axis=1))
+    pairs = np.unique(np.concatenate(pairs), axis=0)
+    for a, b in pairs:
+        union_find.union(int(a), int(b))
+
+def _merge_tile(union_find, tiles, key):
+    """Une los bordes de la tesela `key` con los de sus vecinas ya etiquetadas"""
+    ti, tj = key
+    tile = tiles[key]
+
+    def neighbor(di, dj):
+        return tiles.get((ti + di, tj + dj))
+
+    # Vecinas laterales y verticales
+    for (di, dj), (mine, theirs) in {(0, -1): ('left', 'right'), (0, 1): ('right', 'left'),
+                                      (-1, 0): ('top', 'bottom'), (1, 0): ('bottom', 'top')}.items():
+        other = neighbor(di, dj)
+        if other is not None:
+            _merge_strips(union_find, tile[mine], tile[f'{mine}_value'],
+                          other[theirs], other[f'{theirs}_value'])
+
+    # Vecinas en diagonal: solo se tocan por la esquina
+    for (di, dj), (mine_edge, mine_i, theirs_edge, theirs_i) in {
+            (-1, -1): ('top', 0, 'bottom', -1), (-1, 1): ('top', -1, 'bottom', 0),
+            (1, -1): ('bottom', 0, 'top', -1), (1, 1): ('bottom', -1, 'top', 0)}.items():
+        other = neighbor(di, dj)
+        if other is not None and tile[f'{mine_edge}_value'][mine_i] == other[f'{theirs_edge}_value'][theirs_i]:
+            union_find.union(int(tile[mine_edge][mine_i]), int(other[theirs_edge][theirs_i]))
+
+def _neighborhood(key, grid_shape):
+    """Claves de la tesela `key` y de sus vecinas (conectividad-8) dentro de la rejilla"""
+    ti, tj = key
+    rows, cols = grid_shape
+    return [(i, j) for i in range(max(ti - 1, 0), min(ti + 2, rows))
+            for j in range(max(tj - 1, 0), min(tj + 2, cols))]
+
+def tiled_betti_numbers(image, tile_size=None, threshold=0.5, workers=None):
+    """
+    Calcula (β₀, β₁) por teselas con las mismas convenciones que
+    compute_betti_numbers_2d (conectividad-8, inversión si el píxel [0, 0]
+    es material).
+
+    Cada tesela se etiqueta por separado, en este proceso o en procesos
+    trabajadores, y las etiquetas que se tocan a través de las costuras se
+    unen con union-find. Los poros que tocan el borde de la imagen se marcan
+    como fondo y no cuentan como agujeros. En memoria solo se mantienen unas
+    pocas teselas y los bordes de las teselas pendientes de unir, de modo que
+    el pico de memoria depende del tamaño de tesela y no del de la imagen
+    (aparte del union-find, que crece con el número de etiquetas).
+
+    Args:
+        image: Array 2D (ndarray o memmap, p. ej. de open_memmap_image)
+        tile_size: Lado de las teselas (por defecto TILING_CONFIG['tile_size'])
+        threshold: Umbral de binarización (píxel activo si > threshold)
+        workers: Número de procesos para etiquetar teselas (None = en este proceso)
+
+    Returns:
+        tuple: (β₀, β₁) números de Betti (componentes, agujeros)
+    """
+    tile_size = tile_size or TILING_CONFIG['tile_size']
+    height, width = image.shape
+    grid_shape = (-(-height // tile_size), -(-width // tile_size))
+    invert = bool(image[0, 0] > threshold)
+
+    union_find = UnionFind()
+    tiles = {}        # bordes de las teselas con vecinas pendientes
+    arrived = set()
+    is_fg = [False]   # la etiqueta 0 no se usa
+    border = []
+
+    def add_tile(bounds, tile):
+        r0, r1, c0, c1 = bounds
+        key = (r0 // tile_size, c0 // tile_size)
+        offset = union_find.add(tile['n_fg'] + tile['n_bg'])
+        is_fg.extend([True] * tile['n_fg'] + [False] * tile['n_bg'])
+
+        for name in ('top', 'bottom', 'left', 'right'):
+            tile[name] = tile[name] + offset
+
+        # Poros en el borde de la imagen: fondo, no agujeros
+        for name, on_border in (('top', r0 == 0), ('bottom', r1 == height),
+                                ('left', c0 == 0), ('right', c1 == width)):
+            if on_border:
+                border.append(tile[name][~tile[f'{name}_value']])
+
+        tiles[key] = tile
+        arrived.add(key)
+        _merge_tile(union_find, tiles, key)
+
+        # Una tesela ya no hace falta cuando han llegado todas sus vecinas
+        for other in _neighborhood(key, grid_shape):
+            if other in tiles and arrived.issuperset(_neighborhood(other, grid_shape)):
+                del tiles[other]
+
+    def read_tile(bounds):
+        r0, r1, c0, c1 = bounds
+        return np.asarray(image[r0:r1, c0:c1]) > threshold
+
+    if workers is None:
+        for bounds in iter_tile_bounds(image.shape, tile_size):
+            add_tile(bounds, label_tile(read_tile(bounds), invert))
+    else:
+        # Se leen las teselas en este proceso y se etiquetan en los trabajadores,
+        # con un número acotado de teselas en vuelo
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            max_pending = 2 * (workers or os.cpu_count())
+            pending = {}
+            for bounds in iter_tile_bounds(image.shape, tile_size):
+                if len(pending) >= max_pending:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        add_tile(pending.pop(future), future.result())
+                pending[executor.submit(label_tile, read_tile(bounds), invert)] = bounds
+            for future in list(pending):
+                add_tile(pending.pop(future), future.result())
+
+    roots = union_find.roots()
+    is_fg = np.asarray(is_fg, dtype=bool)
+    beta0 = len(np.unique(roots[is_fg]))
+
+    border_roots = np.unique(roots[np.concatenate(border)]) if border else np.array([], dtype=np.int64)
+    is_fg[0] = True  # excluir la etiqueta 0 de los poros
+    background_roots = np.unique(roots[~is_fg])
+    beta1 = len(np.setdiff1d(background_roots, border_roots))
+
+    return beta0, beta1
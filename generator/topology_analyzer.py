@@ -1,6 +1,11 @@
 import numpy as np
-from .topology_base import compute_betti_numbers_2d, calcular_V_E_F
+import logging
+from .topology_base import (compute_betti_numbers_2d, histograma_bloques_2x2,
+                            V_E_F_desde_histograma)
 from .test_images import get_test_images, visualizar_imagenes_prueba
+from .run_logging import configure_logging
+
+logger = logging.getLogger(__name__)
 
 def analizar_imagen_topologica(imagen):
     """
@@ -15,11 +20,10 @@ def analizar_imagen_topologica(imagen):
     # Calcular números de Betti
     N, H = compute_betti_numbers_2d(imagen)
     
-    # Calcular V, E, F
-    V, E, F = calcular_V_E_F(imagen)
+    # Calcular V, E, F y χ desde un único histograma de bloques 2x2
+    V, E, F, chi_vef = V_E_F_desde_histograma(histograma_bloques_2x2(imagen))
     
-    # Calcular característica de Euler de dos formas
-    chi_vef = V - E + F
+    # Característica de Euler por números de Betti
     chi_NH = N - H
     
     return {
@@ -40,29 +44,29 @@ def analizar_imagenes_prueba():
     imagenes = get_test_images()
     resultados = {}
     
-    print("\nANÁLISIS TOPOLÓGICO DE IMÁGENES DE PRUEBA")
-    print("=" * 50)
+    logger.info("\nANÁLISIS TOPOLÓGICO DE IMÁGENES DE PRUEBA")
+    logger.info("=" * 50)
     
     for nombre, imagen in imagenes.items():
-        print(f"\nAnalizando: {nombre}")
-        print("-" * 30)
+        logger.info("\nAnalizando: %s", nombre)
+        logger.info("-" * 30)
         
         metricas = analizar_imagen_topologica(imagen)
         resultados[nombre] = metricas
         
-        print(f"Números de Betti:")
-        print(f"  N (β₀) = {metricas['N']} componentes")
-        print(f"  H (β₁) = {metricas['H']} agujeros")
+        logger.info("Números de Betti:")
+        logger.info("  N (β₀) = %s componentes", metricas['N'])
+        logger.info("  H (β₁) = %s agujeros", metricas['H'])
         
-        print(f"\nComplejo simplicial:")
-        print(f"  V = {metricas['V']} vértices")
-        print(f"  E = {metricas['E']} aristas")
-        print(f"  F = {metricas['F']} caras")
+        logger.info("\nComplejo simplicial:")
+        logger.info("  V = %s vértices", metricas['V'])
+        logger.info("  E = %s aristas", metricas['E'])
+        logger.info("  F = %s caras", metricas['F'])
         
-        print(f"\nCaracterística de Euler:")
-        print(f"  χ (V-E+F) = {metricas['chi_vef']}")
-        print(f"  χ (N-H) = {metricas['chi_NH']}")
-        print(f"  Consistencia: {'✓' if metricas['consistente'] else '✗'}")
+        logger.info("\nCaracterística de Euler:")
+        logger.info("  χ (V-E+F) = %s", metricas['chi_vef'])
+        logger.info("  χ (N-H) = %s", metricas['chi_NH'])
+        logger.info("  Consistencia: %s", '✓' if metricas['consistente'] else '✗')
     
     # Visualizar las imágenes
     fig = visualizar_imagenes_prueba(imagenes)
@@ -70,6 +74,7 @@ def analizar_imagenes_prueba():
     return resultados, fig
 
 if __name__ == "__main__":
+    configure_logging()
     resultados, fig = analizar_imagenes_prueba()
     import matplotlib.pyplot as plt
     plt.show() 
\ No newline at end of file
@@ -34,51 +34,76 @@ def compute_betti_numbers_2d(imagen_binaria):
 
     return num_componentes, num_agujeros
 
-def calcular_V_E_F(imagen_binaria):
+# Contribución (V, E, F) de cada bloque 2x2 según su código de 4 bits.
+# Bits del código: 1=superior-izquierdo, 2=superior-derecho,
+#                  4=inferior-izquierdo, 8=inferior-derecho
+TABLA_BLOQUES_2X2 = np.array([
+    [0, 0, 0],  # 0000 vacío
+    [1, 1, 1],  # 0001 un píxel
+    [1, 1, 1],  # 0010 un píxel
+    [0, 2, 1],  # 0011 dos píxeles adyacentes (fila superior)
+    [1, 1, 1],  # 0100 un píxel
+    [0, 2, 1],  # 0101 dos píxeles adyacentes (columna izquierda)
+    [2, 2, 1],  # 0110 diagonal
+    [1, 3, 1],  # 0111 tres píxeles
+    [1, 1, 1],  # 1000 un píxel
+    [2, 2, 1],  # 1001 diagonal
+    [0, 2, 1],  # 1010 dos píxeles adyacentes (columna derecha)
+    [1, 3, 1],  # 1011 tres píxeles
+    [0, 2, 1],  # 1100 dos píxeles adyacentes (fila inferior)
+    [1, 3, 1],  # 1101 tres píxeles
+    [1, 3, 1],  # 1110 tres píxeles
+    [0, 4, 1],  # 1111 bloque lleno
+], dtype=np.int64)
+
+def histograma_bloques_2x2(imagen_binaria):
     """
-    Calcula el número de vértices (V), aristas (E) y caras (F) en una imagen binaria
-    usando análisis de bloques 2x2.
+    Codifica cada bloque 2x2 de la imagen como un entero de 4 bits y cuenta
+    cuántas veces aparece cada código, en una sola pasada vectorizada.
     
     Args:
         imagen_binaria: Imagen binaria donde 1=material, 0=poro
         
     Returns:
-        tuple: (V, E, F) número de vértices, aristas y caras
+        numpy.ndarray: Histograma de 16 posiciones con la frecuencia de cada código
     """
-    # Vértices: contamos píxeles que son "esquinas"
-    V = 0
-    E = 0
-    F = 0
-    imagen = imagen_binaria.copy()
+    imagen = np.asarray(imagen_binaria) != 0
+    if imagen.shape[0] < 2 or imagen.shape[1] < 2:
+        return np.zeros(16, dtype=np.int64)
 
-    filas, cols = imagen.shape
-    for i in range(filas - 1):
-        for j in range(cols - 1):
-            # Tomar bloque 2x2
-            bloque = imagen[i:i+2, j:j+2].flatten()
-            suma = np.sum(bloque)
+    codigos = (imagen[:-1, :-1].astype(np.uint8) |
+               (imagen[:-1, 1:].astype(np.uint8) << 1) |
+               (imagen[1:, :-1].astype(np.uint8) << 2) |
+               (imagen[1:, 1:].astype(np.uint8) << 3))
 
-            # F cuenta regiones con al menos 1 píxel activo
-            if suma > 0:
-                F += 1
+    return np.bincount(codigos.ravel(), minlength=16)
 
-            if suma == 1:
-                V += 1
-                E += 1
-            elif suma == 2:
-                if (bloque[0] == bloque[3] and bloque[0] == 1) or (bloque[1] == bloque[2] and bloque[1] == 1):
-                    # diagonal
-                    V += 2
-                    E += 2
-                else:
-                    V += 0
-                    E += 2
-            elif suma == 3:
-                V += 1
-                E += 3
-            elif suma == 4:
-                E += 4
+def V_E_F_desde_histograma(histograma):
+    """
+    Deriva V, E, F y la característica de Euler a partir del histograma de
+    códigos 2x2 producido por histograma_bloques_2x2.
+    
+    Args:
+        histograma: Histograma de 16 posiciones de códigos 2x2
+        
+    Returns:
+        tuple: (V, E, F, χ) con χ = V - E + F
+    """
+    V, E, F = (int(x) for x in histograma @ TABLA_BLOQUES_2X2)
+    return V, E, F, V - E + F
 
+def calcular_V_E_F(imagen_binaria):
+    """
+    Calcula el número de vértices (V), aristas (E) y caras (F) en una imagen binaria
+    usando análisis de bloques 2x2.
+    
+    Args:
+        imagen_binaria: Imagen binaria donde 1=material, 0=poro
+        
+    Returns:
+        tuple: (V, E, F) número de vértices, aristas y caras
+    """
+    V, E, F, _ = V_E_F_desde_histograma(histograma_bloques_2x2(imagen_binaria))
     return V, E, F
 
 def count_vertices_edges_faces_corrected(binary_image):
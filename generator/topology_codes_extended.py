@@ -1,107 +1,168 @@
 import numpy as np
 import cv2
-from .topology_base import compute_betti_numbers_2d
+import logging
+from .analysis_context import as_context
+from .run_logging import log_codes
 
-def get_f8_code(binary_image):
+logger = logging.getLogger(__name__)
+
+# Código Freeman de cada desplazamiento (dx, dy), indexado como [dy + 1, dx + 1].
+# 255 marca desplazamientos sin código (punto repetido).
+F8_DIRECTION_TABLE = np.array([
+    [3, 2, 1],      # dy = -1: Noroeste, Norte, Noreste
+    [4, 255, 0],    # dy =  0: Oeste, -, Este
+    [5, 6, 7]       # dy =  1: Suroeste, Sur, Sureste
+], dtype=np.uint8)
+
+def freeman_chain_code(contour):
     """
-    Genera el código F8 (Freeman) a partir de una imagen binaria.
-    El código F8 considera los 8 vecinos y genera una cadena de direcciones.
+    Genera el código Freeman de un contorno de OpenCV de forma vectorizada.
     
     Args:
-        binary_image: Imagen binaria donde 1=material, 0=poro
+        contour: Contorno de OpenCV con forma (n, 1, 2) y puntos (x, y)
         
     Returns:
-        str: Cadena que representa el código F8 de Freeman
+        numpy.ndarray: Códigos 0-7 como uint8
     """
-    # Tabla de movimientos relativos y su código Freeman (8 direcciones)
-    freeman_table = {
-        (1, 0): '0',    # Este
-        (1, -1): '1',   # Noreste
-        (0, -1): '2',   # Norte
-        (-1, -1): '3',  # Noroeste
-        (-1, 0): '4',   # Oeste
-        (-1, 1): '5',   # Suroeste
-        (0, 1): '6',    # Sur
-        (1, 1): '7'     # Sureste
-    }
+    points = contour.reshape(-1, 2).astype(np.int64)
+    d = np.diff(points, axis=0)
+    dx, dy = d[:, 0], d[:, 1]
+    
+    # Descartar desplazamientos que no son de un solo paso
+    valid = (np.abs(dx) <= 1) & (np.abs(dy) <= 1)
+    codes = F8_DIRECTION_TABLE[dy[valid] + 1, dx[valid] + 1]
+    return codes[codes != 255]
+
+def chains_to_string(chains):
+    """
+    Une los códigos de varios contornos en una única cadena de dígitos.
     
-    def freeman_chain_code(contorno):
-        """Genera el código Freeman para un contorno dado"""
-        code = []
-        for i in range(len(contorno) - 1):
-            y1, x1 = contorno[i][0][1], contorno[i][0][0]
-            y2, x2 = contorno[i + 1][0][1], contorno[i + 1][0][0]
-            dy = y2 - y1
-            dx = x2 - x1
-            direction = (dx, dy)
-            if direction in freeman_table:
-                code.append(freeman_table[direction])
-        return ''.join(code)
-    
-    # Asegurar que la imagen sea del tipo correcto
-    binary_image = binary_image.astype(np.uint8) * 255
+    Args:
+        chains: Lista de arrays uint8 con códigos 0-9
+        
+    Returns:
+        str: Cadena con todos los códigos concatenados
+    """
+    if not chains:
+        return ''
+    return (np.concatenate(chains) + ord('0')).tobytes().decode('ascii')
+
+def string_to_chains(code):
+    """
+    Convierte una cadena de dígitos en una lista con un único array uint8.
+    Permite pasar códigos como texto a las funciones que trabajan por contorno.
     
-    # Encontrar contornos (tanto externos como internos)
-    contours, hierarchy = cv2.findContours(binary_image, cv2.RETR_TREE, cv2.CHAIN_APPROX_NONE)
+    Args:
+        code: Cadena de dígitos 0-9, o lista de arrays (se devuelve igual)
+        
+    Returns:
+        list: Lista de arrays uint8 (vacía si la cadena es vacía)
+    """
+    if not isinstance(code, str):
+        return code
+    if not code:
+        return []
+    return [np.frombuffer(code.encode('ascii'), dtype=np.uint8) - ord('0')]
+
+def get_f8_contours(binary_image):
+    """
+    Genera el código F8 (Freeman) de cada contorno de una imagen binaria y
+    el índice de ese contorno en la lista de OpenCV (y en su jerarquía).
     
-    # Si no hay contornos, retornar cadena vacía
-    if not contours:
-        return ''
+    Args:
+        binary_image: Imagen binaria donde 1=material, 0=poro, o AnalysisContext
+        
+    Returns:
+        tuple: (chains, indices) con un array uint8 por contorno con área > 0
+               y código no vacío, y el índice de cada uno en los contornos
+    """
+    # Encontrar contornos (tanto externos como internos)
+    contours, hierarchy = as_context(binary_image).contours
     
-    # Obtener el código Freeman para cada contorno
-    f8_codes = []
+    chains = []
+    indices = []
     for i, contour in enumerate(contours):
         # Verificar si es un contorno válido (área > 0)
         if cv2.contourArea(contour) > 0:
             code = freeman_chain_code(contour)
-            if code:  # Solo añadir códigos no vacíos
-                f8_codes.append(code)
+            if code.size:  # Solo añadir códigos no vacíos
+                chains.append(code)
+                indices.append(i)
     
-    # Unir todos los códigos en orden
-    return ''.join(f8_codes)
+    return chains, indices
 
-def f8_to_f4(f8_code, metodo='filtrar'):
+def get_f8_chains(binary_image):
     """
-    Convierte el código F8 a F4 usando un método específico de conversión.
+    Genera el código F8 (Freeman) de cada contorno de una imagen binaria.
+    
+    Args:
+        binary_image: Imagen binaria donde 1=material, 0=poro, o AnalysisContext
+        
+    Returns:
+        list: Un array uint8 por contorno con área > 0 y código no vacío
+    """
+    return as_context(binary_image).f8_contours[0]
+
+def get_f8_code(binary_image):
+    """
+    Genera el código F8 (Freeman) a partir de una imagen binaria.
+    El código F8 considera los 8 vecinos y genera una cadena de direcciones.
     
     Args:
-        f8_code: Código F8 como string
+        binary_image: Imagen binaria donde 1=material, 0=poro, o AnalysisContext
+        
+    Returns:
+        str: Cadena que representa el código F8 de Freeman
+    """
+    # Unir los códigos de todos los contornos en orden
+    return chains_to_string(as_context(binary_image).f8_chains)
+
+# Tablas F8 -> F4 indexadas por el código F8 (255 = se descarta)
+F8_TO_F4_TABLES = {
+    # Aproxima las diagonales a la dirección principal anterior
+    'aproximar': np.array([0, 0, 2, 2, 4, 4, 6, 6], dtype=np.uint8),
+    # Solo mantiene las direcciones principales (Este, Norte, Oeste, Sur)
+    'filtrar': np.array([0, 255, 2, 255, 4, 255, 6, 255], dtype=np.uint8),
+}
+
+def f8_chains_to_f4(f8_chains, metodo='filtrar'):
+    """
+    Convierte los códigos F8 de cada contorno a F4 con una tabla de búsqueda.
+    
+    Args:
+        f8_chains: Lista de arrays uint8 con el código F8 de cada contorno
         metodo: Método de conversión ('aproximar' o 'filtrar')
         
     Returns:
-        str: Código F4
-    """
-    if metodo == 'aproximar':
-        # Mapeo que aproxima las diagonales a la dirección más cercana
-        mapa_f8_f4 = {
-            '0': '0',  # Este (→)
-            '1': '0',  # Noreste (↗) → Este (→)
-            '2': '2',  # Norte (↑)
-            '3': '2',  # Noroeste (↖) → Norte (↑)
-            '4': '4',  # Oeste (←)
-            '5': '4',  # Suroeste (↙) → Oeste (←)
-            '6': '6',  # Sur (↓)
-            '7': '6'   # Sureste (↘) → Sur (↓)
-        }
-    elif metodo == 'filtrar':
-        # Mapeo que solo mantiene las direcciones principales
-        mapa_f8_f4 = {
-            '0': '0',  # Este (→)
-            '2': '2',  # Norte (↑)
-            '4': '4',  # Oeste (←)
-            '6': '6'   # Sur (↓)
-        }
-    else:
+        list: Lista de arrays uint8 con el código F4 de cada contorno no vacío
+    """
+    if metodo not in F8_TO_F4_TABLES:
         raise ValueError(f"Método de conversión '{metodo}' no válido. Use 'aproximar' o 'filtrar'.")
+    table = F8_TO_F4_TABLES[metodo]
+    
+    f4_chains = []
+    for chain in f8_chains:
+        f4 = table[chain]
+        f4 = f4[f4 != 255]
+        if f4.size:
+            f4_chains.append(f4)
+    return f4_chains
+
+def f8_to_f4(f8_code, metodo='filtrar'):
+    """
+    Convierte el código F8 a F4 usando un método específico de conversión.
     
-    # Convertir cada dígito del código F8
-    codigo_f4 = []
-    for digito in f8_code:
-        if digito in mapa_f8_f4:
-            codigo_f4.append(mapa_f8_f4[digito])
-    
-    # Unir los dígitos en una cadena
-    return ''.join(codigo_f4)
+    Args:
+        f8_code: Código F8 como string o lista de arrays por contorno
+        metodo: Método de conversión ('aproximar' o 'filtrar')
+        
+    Returns:
+        str: Código F4 (lista de arrays si se pasó una lista de arrays)
+    """
+    f4_chains = f8_chains_to_f4(string_to_chains(f8_code), metodo)
+    if isinstance(f8_code, str):
+        return chains_to_string(f4_chains)
+    return f4_chains
 
 def compute_euler_from_freeman_chain(f8_code):
     """
@@ -203,77 +264,114 @@ def verify_euler_equalities(metrics):
         'todas_igualdades_cumplen': all(verificaciones.values())
     }
 
+# Código VCC según el giro entre segmentos F4 consecutivos, indexado por
+# (actual - anterior) % 8: 0 recto, 2 izquierda (1), 6 derecha (-1 -> 3), resto 180° (2)
+VCC_TURN_TABLE = np.array([0, 2, 1, 2, 2, 2, 3, 2], dtype=np.uint8)
+
+# Transiciones 3OT: estado siguiente [estado, símbolo VCC] con H=0, V=1, D=2
+OT3_TRANSITION_TABLE = np.array([
+    [0, 1, 0, 2],   # Desde horizontal
+    [1, 2, 1, 0],   # Desde vertical
+    [2, 0, 2, 1]    # Desde diagonal
+], dtype=np.uint8)
+
+# Las transiciones son un desplazamiento cíclico del estado (mod 3), así que
+# la fila de H da el incremento de cada símbolo y el estado es una suma acumulada.
+# El primer símbolo se aplica también desde H para fijar el estado inicial.
+OT3_STEP = OT3_TRANSITION_TABLE[0].astype(np.int64)
+
+def f4_chains_to_vcc(f4_chains):
+    """
+    Convierte los códigos F4 de cada contorno a VCC sin calcular giros entre
+    contornos distintos.
+    
+    Args:
+        f4_chains: Lista de arrays uint8 con el código F4 de cada contorno
+        
+    Returns:
+        list: Lista de arrays uint8 con el código VCC (0, 1, 2, 3=-1)
+    """
+    vcc_chains = []
+    for chain in f4_chains:
+        if chain.size > 1:
+            vcc_chains.append(VCC_TURN_TABLE[np.diff(chain.astype(np.int16)) % 8])
+    return vcc_chains
+
+def vcc_chains_to_3ot(vcc_chains):
+    """
+    Convierte los códigos VCC de cada contorno a 3OT (0=H, 1=V, 2=D).
+    
+    Args:
+        vcc_chains: Lista de arrays uint8 con el código VCC de cada contorno
+        
+    Returns:
+        list: Lista de arrays uint8 con el código 3OT de cada contorno
+    """
+    return [(np.cumsum(OT3_STEP[chain]) % 3).astype(np.uint8)
+            for chain in vcc_chains if chain.size]
+
+def count_3ot_windows(ot3_chains, ventana=5):
+    """
+    Cuenta, con sumas acumuladas, las ventanas de `ventana` direcciones de cada
+    contorno con predominancia horizontal (N2h) o vertical (N2v).
+    
+    Args:
+        ot3_chains: Lista de arrays uint8 con el código 3OT de cada contorno
+        ventana: Tamaño de la ventana deslizante
+        
+    Returns:
+        tuple: (N2h, N2v)
+    """
+    N2h = 0
+    N2v = 0
+    for chain in ot3_chains:
+        if chain.size < ventana:
+            continue
+        zero = np.zeros(1, dtype=np.int64)
+        h_sum = np.concatenate([zero, np.cumsum(chain == 0)])
+        v_sum = np.concatenate([zero, np.cumsum(chain == 1)])
+        h = h_sum[ventana:] - h_sum[:-ventana]
+        v = v_sum[ventana:] - v_sum[:-ventana]
+        
+        N2h += int(np.count_nonzero((h >= 3) & (h > v)))
+        N2v += int(np.count_nonzero((v >= 3) & (v > h)))
+    
+    return N2h, N2v
+
 def compute_vcc(binary_image, f4_code):
     """
     Calcula el código VCC (Vertex Correction Code) a partir del código F4.
-    El VCC se basa en los cambios de dirección entre segmentos consecutivos:
+    El VCC se basa en los cambios de dirección entre segmentos consecutivos
+    del mismo contorno:
     0: sin cambio (recto)
     1: giro a la izquierda
     -1: giro a la derecha
     2: giro de 180°
     
     Args:
-        binary_image: Imagen binaria donde 1=material, 0=poro
-        f4_code: Código F4 de la imagen
+        binary_image: Imagen binaria donde 1=material, 0=poro, o AnalysisContext
+        f4_code: Código F4 de la imagen (string o lista de arrays por contorno)
         
     Returns:
         dict: Diccionario con los resultados del VCC
     """
-    def freeman4_to_vcc(codigo_f4):
-        """Convierte código F4 a VCC basado en cambios de dirección"""
-        vcc = []
-        # Convertir string a lista de enteros
-        f4_nums = [int(d) for d in codigo_f4]
-        
-        for i in range(1, len(f4_nums)):
-            anterior = f4_nums[i - 1]
-            actual = f4_nums[i]
-            # Calcular la diferencia de dirección (rotación circular)
-            diferencia = (actual - anterior) % 8
-            
-            # Mapear las diferencias a los códigos VCC
-            if diferencia == 0:
-                vcc.append('0')    # recto
-            elif diferencia == 2:
-                vcc.append('1')    # giro a la izquierda (+1)
-            elif diferencia == 6:
-                vcc.append('-1')   # giro a la derecha (-1)
-            else:
-                vcc.append('2')    # giro de 180° (cambio brusco)
-        
-        return vcc
+    # Generar el código VCC de cada contorno
+    vcc_chains = f4_chains_to_vcc(string_to_chains(f4_code))
     
-    def calcular_N1_N3(vcc):
-        """
-        Calcula N1 y N3 según la definición:
-        - N1: número de vértices para el que VCC=1
-        - N3: número de vértices para el que VCC=2
-        
-        Args:
-            vcc: Lista de códigos VCC
-            
-        Returns:
-            tuple: (N1, N3) número de vértices con VCC=1 y VCC=2 respectivamente
-        """
-        N1 = sum(1 for giro in vcc if giro == '1')  # Vértices con VCC=1
-        N3 = sum(1 for giro in vcc if giro == '2')  # Vértices con VCC=2
-        return N1, N3
-    
-    # Generar el código VCC como lista
-    vcc_list = freeman4_to_vcc(f4_code)
-    
-    # Calcular N1 y N3
-    N1, N3 = calcular_N1_N3(vcc_list)
+    # N1: vértices con VCC=1, N3: vértices con VCC=2
+    counts = np.bincount(np.concatenate(vcc_chains), minlength=4) if vcc_chains else np.zeros(4, dtype=np.int64)
+    N1 = int(counts[1])
+    N3 = int(counts[2])
     
     # Calcular x según la fórmula VCC
     x = (N1 - N3) / 4
     
     # Calcular Euler-Poincaré para verificación
-    beta0, beta1 = compute_betti_numbers_2d(binary_image)
+    beta0, beta1 = as_context(binary_image).betti
     euler_poincare = beta0 - beta1
     
-    # Convertir la lista VCC a string para mantener compatibilidad
-    vcc_code = ''.join(str(x) if x != '-1' else '3' for x in vcc_list)
+    # Cadena VCC ('3' representa el giro -1) para mantener compatibilidad
+    vcc_code = chains_to_string(vcc_chains)
     
     return {
         'N1': N1,
@@ -298,52 +396,17 @@ def vcc_to_3ot(vcc_code):
     Returns:
         list: Lista de direcciones (H, V, D)
     """
-    ot3 = []
-    # Determinar dirección inicial basada en el primer segmento
-    if vcc_code[0] == '0':  # Sin cambio
-        current_direction = 'H'
-    elif vcc_code[0] == '1':  # Giro izquierda
-        current_direction = 'V'
-    elif vcc_code[0] == '3':  # Giro derecha
-        current_direction = 'D'
-    else:  # Giro 180°
-        current_direction = 'H'
-    
-    ot3.append(current_direction)
-    
-    # Mapeo de transiciones de dirección
-    transitions = {
-        'H': {'0': 'H', '1': 'V', '3': 'D', '2': 'H'},  # Desde horizontal
-        'V': {'0': 'V', '1': 'D', '3': 'H', '2': 'V'},  # Desde vertical
-        'D': {'0': 'D', '1': 'H', '3': 'V', '2': 'D'}   # Desde diagonal
-    }
-    
-    # Procesar el resto del código
-    for i in range(1, len(vcc_code)):
-        vertex_type = vcc_code[i]
-        current_direction = transitions[current_direction][vertex_type]
-        ot3.append(current_direction)
-    
-    return ot3
+    letters = np.array(['H', 'V', 'D'])
+    return [d for chain in vcc_chains_to_3ot(string_to_chains(vcc_code))
+            for d in letters[chain].tolist()]
 
 def calcular_N2h_N2v(ot3, ventana=5):
     """
     Calcula N2h y N2v como la cantidad de ventanas en las que hay predominancia
     horizontal (H) o vertical (V) en secuencias de 5 direcciones.
     """
-    N2h = 0
-    N2v = 0
-    for i in range(len(ot3) - ventana + 1):
-        ventana_actual = ot3[i:i + ventana]
-        h = ventana_actual.count('H')
-        v = ventana_actual.count('V')
-        
-        if h >= 3 and h > v:
-            N2h += 1
-        elif v >= 3 and v > h:
-            N2v += 1
-
-    return N2h, N2v
+    states = np.array([{'H': 0, 'V': 1}.get(d, 2) for d in ot3], dtype=np.uint8)
+    return count_3ot_windows([states], ventana)
 
 
 def compute_3ot(binary_image, vcc_code):
@@ -361,32 +424,33 @@ def compute_3ot(binary_image, vcc_code):
     - N2h: número de patrones horizontales dominantes
     - N2v: número de patrones verticales dominantes
     
+    Las ventanas se evalúan dentro de cada contorno, nunca entre dos contornos.
+    
     Args:
-        binary_image: Imagen binaria donde 1=material, 0=poro
-        vcc_code: Código VCC de la imagen
+        binary_image: Imagen binaria donde 1=material, 0=poro, o AnalysisContext
+        vcc_code: Código VCC de la imagen (string o lista de arrays por contorno)
         
     Returns:
         dict: Diccionario con los resultados del 3OT
     """
-    # Generar código 3OT como lista
-    ot3_list = vcc_to_3ot(vcc_code)
+    # Generar código 3OT de cada contorno
+    ot3_chains = vcc_chains_to_3ot(string_to_chains(vcc_code))
     
     # Calcular N2h y N2v según los patrones
-    N2h, N2v = calcular_N2h_N2v(ot3_list)
+    N2h, N2v = count_3ot_windows(ot3_chains)
     
     # Contar segmentos diagonales
-    N2d = ot3_list.count('D')
+    N2d = int(sum(np.count_nonzero(chain == 2) for chain in ot3_chains))
     
     # Calcular X según la fórmula 3OT
     X = (N2h - N2v) / 4
     
     # Calcular Euler-Poincaré para verificación
-    beta0, beta1 = compute_betti_numbers_2d(binary_image)
+    beta0, beta1 = as_context(binary_image).betti
     euler_poincare = beta0 - beta1
     
-    # Convertir la lista 3OT a string para mantener compatibilidad
-    ot3_code = ''.join('0' if x == 'H' else '1' if x == 'V' else '2' for x in ot3_list)
-    
+    # Cadena 3OT (0=H, 1=V, 2=D) para mantener compatibilidad
+    ot3_code = chains_to_string(ot3_chains)
     # Información de segmentos por dirección
     horizontal_info = {
         'num_segments': N2h,
@@ -423,10 +487,10 @@ def compute_3ot(binary_image, vcc_code):
         'is_consistent': abs(X - euler_poincare) < 1e-10,
         'difference': abs(X - euler_poincare)
     }
-    print("Código VCC:", vcc_code)
-    print("Código 3OT:", ''.join(ot3_list))
-    print("Direcciones únicas en 3OT:", set(ot3_list))
-    print("N2h:", N2h, "N2v:", N2v)
+    # Volcado de códigos solo si se activó (configure_logging(dump_codes=True))
+    log_codes("Código VCC", vcc_code if isinstance(vcc_code, str) else chains_to_string(vcc_code))
+    log_codes("Código 3OT", ot3_code)
+    logger.debug("N2h: %d N2v: %d N2d: %d", N2h, N2v, N2d)
 
     
     return {
@@ -1,106 +1,22 @@
 import numpy as np
-from scipy.ndimage import label, binary_erosion, binary_dilation, generate_binary_structure
+from scipy.ndimage import label, binary_dilation, generate_binary_structure
 from skimage.morphology import skeletonize
 from skimage.measure import regionprops
-from .topology_base import compute_betti_numbers_2d
-from .topology_codes_extended import compute_vcc, compute_3ot
-from .topology_codes_extended import get_f8_code, f8_to_f4
+from .analysis_context import as_context
 
 def count_vertices_edges_faces_corrected(binary_image):
     """
     Cuenta vértices, aristas y caras usando el método de complejos celulares 2D
     
     Args:
-        binary_image: Imagen binaria
+        binary_image: Imagen binaria, BinaryMask o AnalysisContext
         
     Returns:
         tuple: (V, E, F) vértices, aristas, caras
     """
-    # Convertir a binario
-    binary_img = (binary_image > 0.5).astype(bool)
-    h, w = binary_img.shape
-    
-    # Contar caras (píxeles activos) - F
-    F = np.sum(binary_img)
-    
-    # Contar aristas - método corregido
-    # Aristas internas: conexiones entre píxeles adyacentes activos
-    E_internal = 0
-    
-    # Aristas horizontales internas
-    for i in range(h):
-        for j in range(w - 1):
-            if binary_img[i, j] and binary_img[i, j + 1]:
-                E_internal += 1
-    
-    # Aristas verticales internas
-    for i in range(h - 1):
-        for j in range(w):
-            if binary_img[i, j] and binary_img[i + 1, j]:
-                E_internal += 1
-    
-    # Aristas de borde: cada píxel activo contribuye con aristas al borde
-    E_boundary = 0
-    for i in range(h):
-        for j in range(w):
-            if binary_img[i, j]:
-                # Contar vecinos inactivos (contribuyen aristas de borde)
-                neighbors = []
-                if i > 0: neighbors.append(binary_img[i-1, j])
-                else: neighbors.append(False)  # borde superior
-                
-                if i < h-1: neighbors.append(binary_img[i+1, j])
-                else: neighbors.append(False)  # borde inferior
-                
-                if j > 0: neighbors.append(binary_img[i, j-1])
-                else: neighbors.append(False)  # borde izquierdo
-                
-                if j < w-1: neighbors.append(binary_img[i, j+1])
-                else: neighbors.append(False)  # borde derecho
-                
-                E_boundary += sum(1 for n in neighbors if not n)
-    
-    E = E_internal + E_boundary
-    
-    # Contar vértices - método corregido usando intersecciones de aristas
-    V = 0
-    
-    # Vértices internos: intersecciones entre píxeles activos
-    for i in range(h + 1):
-        for j in range(w + 1):
-            # Verificar los 4 píxeles alrededor de este vértice potencial
-            pixels = []
-            
-            # Píxel superior-izquierdo
-            if i > 0 and j > 0:
-                pixels.append(binary_img[i-1, j-1])
-            else:
-                pixels.append(False)
-            
-            # Píxel superior-derecho
-            if i > 0 and j < w:
-                pixels.append(binary_img[i-1, j])
-            else:
-                pixels.append(False)
-            
-            # Píxel inferior-izquierdo
-            if i < h and j > 0:
-                pixels.append(binary_img[i, j-1])
-            else:
-                pixels.append(False)
-            
-            # Píxel inferior-derecho
-            if i < h and j < w:
-                pixels.append(binary_img[i, j])
-            else:
-                pixels.append(False)
-            
-            # Contar píxeles activos
-            active_count = sum(pixels)
-            
-            # Un vértice existe si hay al menos un píxel activo
-            if active_count > 0:
-                V += 1
+    # Conteo sobre las filas empaquetadas en bits: F por popcount, E y V con
+    # desplazamientos y AND/OR entre píxeles vecinos (ver BinaryMask)
+    V, E, F = as_context(binary_image).mask.vertices_edges_faces()
     
     return V, E, F
 
@@ -109,7 +25,7 @@ def euler_characteristic_2d(binary_image):
     Calcula la característica de Euler usando χ = V - E + F (Método 1)
     
     Args:
-        binary_image: Imagen binaria
+        binary_image: Imagen binaria, BinaryMask o AnalysisContext
         
     Returns:
         int: Característica de Euler
@@ -122,12 +38,12 @@ def euler_poincare_2d(binary_image):
     Calcula la característica de Euler usando χ = β₀ - β₁ (Método 2 - Euler-Poincaré)
     
     Args:
-        binary_image: Imagen binaria
+        binary_image: Imagen binaria, BinaryMask o AnalysisContext
         
     Returns:
         int: Característica de Euler
     """
-    beta0, beta1 = compute_betti_numbers_2d(binary_image)
+    beta0, beta1 = as_context(binary_image).betti
     return beta0 - beta1
 
 def validate_euler_formulas(binary_image, tolerance=0):
@@ -135,15 +51,17 @@ def validate_euler_formulas(binary_image, tolerance=0):
     Compara las dos fórmulas de Euler y valida su consistencia
     
     Args:
-        binary_image: Imagen binaria
+        binary_image: Imagen binaria, BinaryMask o AnalysisContext
         tolerance: Tolerancia permitida entre las dos fórmulas
         
     Returns:
         dict: Diccionario con métricas y validación
     """
+    ctx = as_context(binary_image)
+    
     # Calcular usando ambas fórmulas
-    V, E, F = count_vertices_edges_faces_corrected(binary_image)
-    beta0, beta1 = compute_betti_numbers_2d(binary_image)
+    V, E, F = count_vertices_edges_faces_corrected(ctx)
+    beta0, beta1 = ctx.betti
     
     euler_vef = V - E + F
     euler_betti = beta0 - beta1
@@ -168,28 +86,23 @@ def compute_all_metrics(binary_image):
     Calcula todas las métricas topológicas para una imagen
     
     Args:
-        binary_image: Imagen binaria
+        binary_image: Imagen binaria, BinaryMask o AnalysisContext
         
     Returns:
         dict: Todas las métricas topológicas
     """
-    metrics = validate_euler_formulas(binary_image)
+    ctx = as_context(binary_image)
+    metrics = validate_euler_formulas(ctx)
     
     # Añadir información adicional
-    metrics['area_fraction'] = np.sum(binary_image > 0.5) / binary_image.size
-    metrics['perimeter'] = compute_perimeter(binary_image)
-    
-    # Generar códigos en secuencia F8 -> F4 -> VCC -> 3OT
-    f8_code = get_f8_code(binary_image)
-    f4_code = f8_to_f4(f8_code)
+    metrics['area_fraction'] = ctx.mask.area / ctx.size
+    metrics['perimeter'] = compute_perimeter(ctx)
     
-    # Añadir códigos topológicos
-    vcc_results = compute_vcc(binary_image, f4_code)
-    metrics['vcc'] = vcc_results
+    # Códigos en secuencia F8 -> F4 -> VCC -> 3OT (guardados en el contexto)
+    metrics['vcc'] = ctx.vcc
     
     # Calcular 3OT a partir de VCC
-    ot3_results = compute_3ot(binary_image, vcc_results['code_string'])
-    metrics['3ot'] = ot3_results
+    metrics['3ot'] = ctx.ot3
     
     return metrics
 
@@ -198,77 +111,35 @@ def compute_perimeter(binary_image):
     Calcula el perímetro de la imagen binaria
     
     Args:
-        binary_image: Imagen binaria
+        binary_image: Imagen binaria, BinaryMask o AnalysisContext
         
     Returns:
         float: Perímetro aproximado
     """
-    binary_img = (binary_image > 0.5).astype(bool)
-    
-    # Erosión para encontrar el borde
-    eroded = binary_erosion(binary_img)
-    boundary = binary_img & ~eroded
-    
-    return np.sum(boundary)
+    # Píxeles activos con algún 4-vecino inactivo (equivale a restar la
+    # erosión con la cruz 3x3), calculado sobre las filas empaquetadas
+    return as_context(binary_image).mask.perimeter()
 
 def analyze_connectivity(binary_image):
     """
     Analiza las propiedades de conectividad detalladas
     
     Args:
-        binary_image: Imagen binaria
+        binary_image: Imagen binaria, BinaryMask o AnalysisContext
         
     Returns:
         dict: Análisis de conectividad
     """
-    binary_img = (binary_image > 0.5).astype(bool)
-    labeled_array, num_components = label(binary_img)
+    ctx = as_context(binary_image)
+    binary_img = ctx.binary
+    labeled_array, num_components = ctx.labels
     
-    component_sizes = []
-    component_holes = []
+    # Tamaño de cada componente en una sola pasada
+    component_sizes = list(np.bincount(labeled_array.ravel(),
+                                       minlength=num_components + 1)[1:])
     
-    for i in range(1, num_components + 1):
-        component_mask = (labeled_array == i)
-        size = np.sum(component_mask)
-        component_sizes.append(size)
-        
-        # Contar agujeros en este componente usando el método corregido
-        # Extraer solo esta componente para análisis individual
-        coords = np.where(component_mask)
-        if len(coords[0]) == 0:
-            component_holes.append(0)
-            continue
-            
-        min_row, max_row = coords[0].min(), coords[0].max()
-        min_col, max_col = coords[1].min(), coords[1].max()
-        
-        # Extraer región con padding
-        padded_min_row = max(0, min_row - 1)
-        padded_max_row = min(binary_img.shape[0], max_row + 2)
-        padded_min_col = max(0, min_col - 1)
-        padded_max_col = min(binary_img.shape[1], max_col + 2)
-        
-        component_region = component_mask[padded_min_row:padded_max_row, 
-                                        padded_min_col:padded_max_col]
-        
-        # Analizar agujeros en el complemento
-        complement = ~component_region
-        labeled_holes, num_bg = label(complement)
-        
-        holes = 0
-        for hole_id in range(1, num_bg + 1):
-            hole_mask = (labeled_holes == hole_id)
-            
-            # Verificar si toca el borde
-            touches_border = (
-                np.any(hole_mask[0, :]) or np.any(hole_mask[-1, :]) or
-                np.any(hole_mask[:, 0]) or np.any(hole_mask[:, -1])
-            )
-            
-            if not touches_border:
-                holes += 1
-        
-        component_holes.append(holes)
+    # Agujeros de cada componente a partir de un único etiquetado del complemento
+    component_holes = count_component_holes(binary_img, labeled_array, num_components)
     
     return {
         'num_components': num_components,
@@ -276,4 +147,95 @@ def analyze_connectivity(binary_image):
         'component_holes': component_holes,
         'largest_component_size': max(component_sizes) if component_sizes else 0,
         'total_holes': sum(component_holes)
-    }
\ No newline at end of file
+    }
+
+def count_component_holes(binary_img, labeled_array, num_components):
+    """
+    Cuenta los agujeros de cada componente en tiempo aproximadamente lineal.
+    
+    Un agujero de la componente A es una región 4-conexa del complemento de A
+    que no toca el borde de la imagen (puede contener otras componentes
+    anidadas). Se etiqueta el fondo una sola vez y se construye el grafo de
+    adyacencia entre componentes y regiones de fondo, más un nodo virtual
+    unido a todo lo que toca el borde. Los agujeros de A son las partes en
+    que queda dividido ese grafo al quitar A, sin contar la que contiene el
+    nodo virtual, y se obtienen con un único recorrido DFS (puntos de
+    articulación de Tarjan).
+    
+    Args:
+        binary_img: Máscara booleana
+        labeled_array: Etiquetado 4-conexo de la máscara
+        num_components: Número de componentes del etiquetado
+        
+    Returns:
+        list: Número de agujeros de cada componente (en orden de etiqueta)
+    """
+    if num_components == 0:
+        return []
+    
+    background, num_background = label(~binary_img)
+    
+    # Nodos: componentes 0..n-1, fondo n..n+m-1, nodo de borde n+m
+    fg_nodes = labeled_array.astype(np.int64) - 1
+    bg_nodes = np.where(background > 0, background.astype(np.int64) + num_components - 1, -1)
+    border_node = num_components + num_background
+    num_nodes = border_node + 1
+    
+    # Aristas componente-fondo entre píxeles 4-vecinos
+    pairs = []
+    for a_fg, a_bg, b_fg, b_bg in (
+        (fg_nodes[:, :-1], bg_nodes[:, :-1], fg_nodes[:, 1:], bg_nodes[:, 1:]),
+        (fg_nodes[:-1, :], bg_nodes[:-1, :], fg_nodes[1:, :], bg_nodes[1:, :]),
+    ):
+        mask = (a_fg >= 0) & (b_bg >= 0)
+        pairs.append((a_fg[mask], b_bg[mask]))
+        mask = (a_bg >= 0) & (b_fg >= 0)
+        pairs.append((b_fg[mask], a_bg[mask]))
+    
+    # Aristas de los nodos que tocan el borde de la imagen hacia el nodo de borde
+    edge_pixels = np.concatenate([
+        fg_nodes[0, :], fg_nodes[-1, :], fg_nodes[:, 0], fg_nodes[:, -1],
+        bg_nodes[0, :], bg_nodes[-1, :], bg_nodes[:, 0], bg_nodes[:, -1]
+    ])
+    edge_pixels = edge_pixels[edge_pixels >= 0]
+    pairs.append((edge_pixels, np.full(edge_pixels.shape, border_node, dtype=np.int64)))
+    
+    src = np.concatenate([p[0] for p in pairs])
+    dst = np.concatenate([p[1] for p in pairs])
+    edges = np.unique(src * num_nodes + dst)
+    src, dst = edges // num_nodes, edges % num_nodes
+    
+    # Lista de adyacencia no dirigida en formato CSR
+    both_src = np.concatenate([src, dst])
+    both_dst = np.concatenate([dst, src])
+    order = np.argsort(both_src, kind='stable')
+    neighbors = both_dst[order].tolist()
+    offsets = np.concatenate([[0], np.cumsum(np.bincount(both_src, minlength=num_nodes))]).tolist()
+    
+    # DFS iterativo desde el nodo de borde calculando low-link
+    disc = [-1] * num_nodes
+    low = [0] * num_nodes
+    holes = [0] * num_components
+    disc[border_node] = low[border_node] = 0
+    counter = 1
+    stack = [(border_node, -1, offsets[border_node])]
+    while stack:
+        node, parent, pos = stack[-1]
+        if pos < offsets[node + 1]:
+            stack[-1] = (node, parent, pos + 1)
+            child = neighbors[pos]
+            if disc[child] == -1:
+                disc[child] = low[child] = counter
+                counter += 1
+                stack.append((child, node, offsets[child]))
+            elif child != parent:
+                low[node] = min(low[node], disc[child])
+        else:
+            stack.pop()
+            if parent >= 0:
+                low[parent] = min(low[parent], low[node])
+                # El subárbol de `node` queda separado al quitar `parent`
+                if parent < num_components and low[node] >= disc[parent]:
+                    holes[parent] += 1
+    
+    return holes
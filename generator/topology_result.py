@@ -0,0 +1,202 @@
+import os
+import sys
+from collections.abc import Mapping, MutableMapping
+from .analysis_context import as_context
+from .topology_metrics import (count_vertices_edges_faces_corrected, compute_all_metrics,
+                               analyze_connectivity)
+from .topology_codes_extended import compute_euler_from_freeman_chain, verify_euler_equalities
+from .field_generator import generate_vector_field
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config.topology_config import VISUALIZATION_CONFIG
+
+# Claves que TopologyResult calcula bajo demanda
+LAZY_KEYS = ('binary_image', 'vector_field', 'metrics', 'connectivity', 'codes', 'equalities')
+
+class TopologyCodes(Mapping):
+    """
+    Códigos F8/F4/VCC/3OT de un resultado, calculados al pedir cada uno (el
+    contexto comparte los pasos intermedios: pedir '3ot' calcula F8, F4 y VCC
+    una sola vez). Se accede como atributo (.f8) o como diccionario (['f8']).
+
+    Args:
+        ctx: AnalysisContext de la imagen
+        values: Códigos ya calculados (p. ej. recuperados de la caché)
+    """
+
+    _FACTORIES = {
+        'f8': lambda ctx: ctx.f8,
+        'f4': lambda ctx: ctx.f4,
+        'vcc': lambda ctx: ctx.vcc['code_string'],
+        'ot3': lambda ctx: ctx.ot3['code_string']
+    }
+
+    def __init__(self, ctx, values=None):
+        self._ctx = ctx
+        self._values = dict(values or {})
+
+    def __getitem__(self, key):
+        if key not in self._values:
+            self._values[key] = self._FACTORIES[key](self._ctx)
+        return self._values[key]
+
+    def __iter__(self):
+        return iter(self._FACTORIES)
+
+    def __len__(self):
+        return len(self._FACTORIES)
+
+    def chain_code(self, key):
+        """Código `key` empaquetado con un tramo por contorno (ChainCode)"""
+        from .chain_codes import ChainCode
+        return ChainCode.from_context(self._ctx, key)
+
+    @property
+    def f8(self):
+        return self['f8']
+
+    @property
+    def f4(self):
+        return self['f4']
+
+    @property
+    def vcc(self):
+        return self['vcc']
+
+    @property
+    def ot3(self):
+        return self['ot3']
+
+class TopologyResult(MutableMapping):
+    """
+    Resultado del análisis de una imagen que calcula cada parte la primera
+    vez que se pide y la guarda: quien solo lee β₀/β₁ no paga los códigos
+    de cadena, el campo vectorial ni las igualdades.
+
+    Las dependencias se comparten a través del AnalysisContext (etiquetado,
+    contornos, códigos) y de las propias propiedades (equalities usa metrics).
+    El acceso como diccionario de los llamadores existentes sigue
+    funcionando: result['metrics'], result['codes']['f8'], etc. Las claves
+    que no son de LAZY_KEYS (p. ej. 'cache_hit', 'timings') se guardan tal cual.
+    Como diccionario solo contiene las partes ya calculadas: `in`, keys() y
+    dict(result) no calculan nada.
+
+    Args:
+        binary_image: Imagen binaria preprocesada, BinaryMask o AnalysisContext
+        precomputed: Partes ya calculadas (p. ej. recuperadas de la caché)
+    """
+
+    def __init__(self, binary_image, precomputed=None):
+        self.context = as_context(binary_image)
+        self._cache = {}
+        self._extra = {}
+        precomputed = dict(precomputed or {})
+        if 'codes' in precomputed:
+            precomputed['codes'] = TopologyCodes(self.context, precomputed['codes'])
+        for key, value in precomputed.items():
+            self[key] = value
+
+    def _get(self, key, factory):
+        if key not in self._cache:
+            self._cache[key] = factory()
+        return self._cache[key]
+
+    @property
+    def binary_image(self):
+        return self.context.image
+
+    @property
+    def betti(self):
+        """Números de Betti (β₀, β₁)"""
+        if 'metrics' in self._cache:
+            return self._cache['metrics']['beta0'], self._cache['metrics']['beta1']
+        return self.context.betti
+
+    @property
+    def vertices_edges_faces(self):
+        """(V, E, F) del complejo celular"""
+        if 'metrics' in self._cache:
+            metrics = self._cache['metrics']
+            return metrics['vertices'], metrics['edges'], metrics['faces']
+        return self._get('vef', lambda: count_vertices_edges_faces_corrected(self.context))
+
+    @property
+    def euler_vef(self):
+        """χ = V - E + F"""
+        V, E, F = self.vertices_edges_faces
+        return V - E + F
+
+    @property
+    def euler_poincare(self):
+        """χ = β₀ - β₁"""
+        beta0, beta1 = self.betti
+        return beta0 - beta1
+
+    @property
+    def metrics(self):
+        """compute_all_metrics más la característica de Euler por rotaciones de la cadena F8"""
+        def factory():
+            metrics = compute_all_metrics(self.context)
+            metrics['freeman_chain'] = {
+                'euler_from_chain_rotation': compute_euler_from_freeman_chain(self.codes.f8)
+            }
+            return metrics
+        return self._get('metrics', factory)
+
+    @property
+    def connectivity(self):
+        return self._get('connectivity', lambda: analyze_connectivity(self.context))
+
+    @property
+    def codes(self):
+        """Códigos F8/F4/VCC/3OT (TopologyCodes, cada uno bajo demanda)"""
+        return self._get('codes', lambda: TopologyCodes(self.context))
+
+    @property
+    def equalities(self):
+        return self._get('equalities', lambda: verify_euler_equalities(self.metrics))
+
+    @property
+    def vector_field(self):
+        """Campo vectorial (u, v) de la imagen, con lado mayor VISUALIZATION_CONFIG['vector_field_size']"""
+        return self._get('vector_field', lambda: generate_vector_field(
+            self.binary_image, max_size=VISUALIZATION_CONFIG['vector_field_size']))
+
+    def is_computed(self, key):
+        """True si la parte `key` ya está calculada o guardada"""
+        return key in self._cache or key in self._extra or key == 'binary_image'
+
+    def __getitem__(self, key):
+        if key in LAZY_KEYS:
+            return getattr(self, key)
+        return self._extra[key]
+
+    def __setitem__(self, key, value):
+        if key == 'binary_image':
+            raise KeyError("La imagen de un TopologyResult no se puede reemplazar")
+        if key in LAZY_KEYS:
+            self._cache[key] = value
+        else:
+            self._extra[key] = value
+
+    def __delitem__(self, key):
+        if key in LAZY_KEYS:
+            self._cache.pop(key, None)
+        else:
+            del self._extra[key]
+
+    # `in`, la iteración y len() solo ven las partes ya calculadas, de modo que
+    # dict(result) o copy.copy(result) no fuerzan el resto; result[key] y los
+    # atributos siguen calculando bajo demanda
+    def __contains__(self, key):
+        return (key in LAZY_KEYS and self.is_computed(key)) or key in self._extra
+
+    def __iter__(self):
+        yield from (key for key in LAZY_KEYS if self.is_computed(key))
+        yield from self._extra
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        computed = [key for key in LAZY_KEYS if self.is_computed(key)]
+        return f"TopologyResult(shape={self.context.shape}, calculado={computed + list(self._extra)})"
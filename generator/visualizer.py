@@ -1,3 +1,4 @@
+import matplotlib
 import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
@@ -8,6 +9,12 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from config.topology_config import VISUALIZATION_CONFIG
 import cv2
+import logging
+from .run_logging import log_codes
+from .field_generator import generate_vector_field
+from .chain_codes import case_chain_codes, save_chain_codes
+
+logger = logging.getLogger(__name__)
 
 # Configuración global de estilo para todas las visualizaciones
 plt.style.use('default')
@@ -29,17 +36,67 @@ COLORS = {
     }
 }
 
+# Píxeles mínimos por símbolo para dibujar create_topology_pattern símbolo a símbolo
+PATTERN_MIN_CELL = 4
+
+# Colores por símbolo de plot_topology_codes
+CODE_SYMBOL_COLORS = [
+    '#1f77b4',  # Azul (VCC 0 / 3OT horizontal)
+    '#2ca02c',  # Verde (VCC 1 / 3OT vertical)
+    '#ff7f0e',  # Naranja (VCC 2 / 3OT diagonal)
+    '#d62728'   # Rojo (VCC 3 = -1)
+]
+
+# Pistas de plot_topology_codes: código, símbolos distintos, título y título de la leyenda
+CODE_TRACKS = [
+    ('vcc', 4, 'Código VCC (Vertex Correction Code)', 'Valores VCC'),
+    ('ot3', 3, 'Código 3OT (Three Orthogonal Topology)', 'Valores 3OT'),
+]
+
+def vector_field_size(panel_inches, dpi=None):
+    """
+    Lado mayor, en píxeles, con el que se dibuja un panel de `panel_inches`
+    pulgadas: calcular el campo vectorial a más resolución no se ve.
+    """
+    return int(np.ceil(panel_inches * (dpi or VISUALIZATION_CONFIG['dpi'])))
+
+def quiver_grid(u, v, shape):
+    """
+    Malla y componentes submuestreadas del quiver de un campo (u, v) sobre
+    una imagen de tamaño `shape`. El campo puede estar a menor resolución
+    que la imagen (generate_vector_field con max_size): las flechas quedan
+    cada VISUALIZATION_CONFIG['vector_field_step'] píxeles de la imagen, o
+    más separadas si no caben VISUALIZATION_CONFIG['vector_field_arrows']
+    flechas por lado.
+    
+    Returns:
+        tuple: (X, Y, U, V) en coordenadas de píxel de la imagen
+    """
+    scale_y = shape[0] / u.shape[0]
+    scale_x = shape[1] / u.shape[1]
+    image_step = max(VISUALIZATION_CONFIG['vector_field_step'],
+                     -(-max(shape) // VISUALIZATION_CONFIG['vector_field_arrows']))
+    step = max(1, int(round(image_step / scale_y)))
+    y_indices = np.arange(0, u.shape[0], step) * scale_y + (scale_y - 1) / 2
+    x_indices = np.arange(0, u.shape[1], step) * scale_x + (scale_x - 1) / 2
+    Y, X = np.meshgrid(y_indices, x_indices, indexing='ij')
+    return X, Y, u[::step, ::step], v[::step, ::step]
+
 def plot_topology_analysis(field, u, v, metrics, save_path, case_name=""):
     """
     Crea una visualización completa del análisis topológico
     
     Args:
         field: Campo escalar 2D
-        u, v: Componentes del campo vectorial
+        u, v: Componentes del campo vectorial (None = se calcula aquí a la
+              resolución del panel)
         metrics: Diccionario con métricas topológicas
         save_path: Ruta donde guardar la imagen
         case_name: Nombre del caso para el título
     """
+    if u is None or v is None:
+        u, v = generate_vector_field(field, max_size=vector_field_size(7.5))
+    
     fig = plt.figure(figsize=(15, 15))  # Aumentado para acomodar nuevos paneles
     fig.patch.set_facecolor('white')
     gs = GridSpec(4, 2, figure=fig, height_ratios=[1, 1, 0.8, 1.2], hspace=0.4, wspace=0.3)
@@ -55,13 +112,7 @@ def plot_topology_analysis(field, u, v, metrics, save_path, case_name=""):
     # 2. Campo vectorial
     ax2 = fig.add_subplot(gs[0, 1])
     ax2.set_facecolor(COLORS['background'])
-    step = VISUALIZATION_CONFIG['vector_field_step']
-    y_indices = np.arange(0, field.shape[0], step)
-    x_indices = np.arange(0, field.shape[1], step)
-    Y, X = np.meshgrid(y_indices, x_indices, indexing='ij')
-    
-    U = u[::step, ::step]
-    V = v[::step, ::step]
+    X, Y, U, V = quiver_grid(u, v, field.shape)
     
     ax2.imshow(field, cmap='gray', origin='lower', alpha=0.7)
     ax2.quiver(X, Y, U, V, 
@@ -194,13 +245,14 @@ def plot_topology_analysis(field, u, v, metrics, save_path, case_name=""):
                 bbox_inches='tight', facecolor='white')
     plt.close()
 
-def create_comparison_plot(cases_data, save_path):
+def create_comparison_plot(cases_data, save_path, dpi=None):
     """
     Crea un gráfico comparativo de múltiples casos
     
     Args:
         cases_data: Lista de diccionarios con datos de cada caso
         save_path: Ruta donde guardar el gráfico
+        dpi: Resolución (por defecto VISUALIZATION_CONFIG['dpi'])
     """
     fig, axes = plt.subplots(2, 2, figsize=(15, 12))
     fig.patch.set_facecolor('white')
@@ -303,7 +355,7 @@ def create_comparison_plot(cases_data, save_path):
                 fontsize=16, fontweight='bold', y=1.02)
     
     plt.tight_layout()
-    plt.savefig(save_path, dpi=VISUALIZATION_CONFIG['dpi'], 
+    plt.savefig(save_path, dpi=dpi or VISUALIZATION_CONFIG['dpi'], 
                 bbox_inches='tight', facecolor='white')
     plt.close()
 
@@ -312,22 +364,20 @@ def plot_vector_field_enhanced(u, v, mask, save_path, title="Campo Vectorial"):
     Visualización mejorada del campo vectorial
     
     Args:
-        u, v: Componentes del campo vectorial (ya enmascarados)
+        u, v: Componentes del campo vectorial (ya enmascarados, a la
+              resolución de la máscara o menor; None = se calcula aquí a la
+              resolución del panel)
         mask: Máscara de la topología
         save_path: Ruta donde guardar
         title: Título del gráfico
     """
-    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(15, 6))
+    if u is None or v is None:
+        u, v = generate_vector_field(mask, max_size=vector_field_size(7.5))
     
-    # Campo vectorial con topología
-    step = VISUALIZATION_CONFIG['vector_field_step']
-    y_indices = np.arange(0, mask.shape[0], step)
-    x_indices = np.arange(0, mask.shape[1], step)
-    Y, X = np.meshgrid(y_indices, x_indices, indexing='ij')
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(15, 6))
     
-    # Submuestrear los campos vectoriales ya enmascarados
-    U = u[::step, ::step]
-    V = v[::step, ::step]
+    # Campo vectorial con topología: submuestrear los campos ya enmascarados
+    X, Y, U, V = quiver_grid(u, v, mask.shape)
     
     # Subplot 1: Campo vectorial sobre topología
     ax1.imshow(mask, cmap='gray', origin='lower', alpha=0.8)
@@ -341,8 +391,10 @@ def plot_vector_field_enhanced(u, v, mask, save_path, title="Campo Vectorial"):
     
     # Subplot 2: Magnitud del campo vectorial (solo donde hay material)
     magnitude = np.sqrt(u**2 + v**2)
-    magnitude = magnitude * (mask > 0.5)  # Aplicar máscara a la magnitud
-    im2 = ax2.imshow(magnitude, cmap='plasma', origin='lower')
+    if magnitude.shape == mask.shape:
+        magnitude = magnitude * (mask > 0.5)  # Aplicar máscara a la magnitud
+    im2 = ax2.imshow(magnitude, cmap='plasma', origin='lower',
+                     extent=(-0.5, mask.shape[1] - 0.5, -0.5, mask.shape[0] - 0.5))
     ax2.set_title('Magnitud del Campo Vectorial')
     ax2.set_xlabel('X')
     ax2.set_ylabel('Y')
@@ -377,12 +429,14 @@ def create_individual_case_visualization(field, u, v, metrics, case_name, save_d
     
     Args:
         field: Campo escalar
-        u, v: Campo vectorial
+        u, v: Campo vectorial (None = se calcula una vez a la resolución de los paneles)
         metrics: Métricas topológicas
         case_name: Nombre del caso
         save_dir: Directorio donde guardar
     """
     os.makedirs(save_dir, exist_ok=True)
+    if u is None or v is None:
+        u, v = generate_vector_field(field, max_size=vector_field_size(7.5))
     
     # 1. Topología simple
     plt.figure(figsize=(8, 8))
@@ -404,70 +458,171 @@ def create_individual_case_visualization(field, u, v, metrics, case_name, save_d
                           f'{save_dir}/analysis_{case_name}.png', 
                           case_name)
 
-def save_metrics_to_csv(cases_data, save_path):
+def metrics_record(case):
     """
-    Guarda las métricas en un archivo CSV
+    Fila de métricas numéricas de un caso (sin los códigos), con los tiempos
+    por etapa si el análisis se perfiló. La comparten save_metrics_to_csv y
+    el escritor columnar.
     
     Args:
-        cases_data: Lista con datos de casos
-        save_path: Ruta del archivo CSV
+        case: Resultado de un caso (dict o TopologyResult)
+        
+    Returns:
+        dict: Columna -> valor
     """
-    records = []
-    for case in cases_data:
-        # Calcular número de píxeles
+    # Calcular número de píxeles (precalculado en los resultados por lotes;
+    # un TopologyResult solo tiene la imagen binaria)
+    if 'pixels' in case:
+        num_pixeles = case['pixels']
+    elif 'field' in case:
         num_pixeles = np.sum(case['field'])
+    else:
+        num_pixeles = np.sum(case['binary_image'])
+    
+    record = {
+        'imagen': case['name'],
+        'pixeles': num_pixeles,
+        'vertices': case['metrics']['vertices'],
+        'aristas': case['metrics']['edges'],
+        'caras': case['metrics']['faces'],
+        'componentes': case['metrics']['beta0'],
+        'agujeros': case['metrics']['beta1'],
+        'N1': case['metrics']['vcc']['N1'],
+        'N3': case['metrics']['vcc']['N3'],
+        'N2h': case['metrics']['3ot']['N2h'],
+        'N2v': case['metrics']['3ot']['N2v'],
+        'euler_vef': case['metrics']['euler_vef'],
+        'euler_poincare': case['metrics']['euler_poincare'],
+        'vcc_x': case['metrics']['vcc']['x'],
+        '3ot_x': case['metrics']['3ot']['combined']['X_value'],
+        'euler_freeman': case['metrics']['freeman_chain']['euler_from_chain_rotation']
+    }
+    
+    # Tiempos por etapa si el análisis se perfiló
+    for stage, t in case.get('timings', {}).items():
+        record[f't_{stage}_s'] = t['wall_s']
+        record[f'cpu_{stage}_s'] = t['cpu_s']
+        record[f'mem_{stage}_bytes'] = t['peak_bytes']
+    return record
+
+# Columnas de códigos en el CSV, en el orden en que se escriben tras 'agujeros'
+CSV_CODE_COLUMNS = {'codigo_f8': 'f8', 'codigo_f4': 'f4', 'codigo_vcc': 'vcc', 'codigo_3ot': 'ot3'}
+
+def save_case_chain_codes(case, codes_dir):
+    """
+    Guarda los códigos de un caso empaquetados (ChainCode) en
+    `codes_dir/<nombre>.chc`.
+    
+    Returns:
+        tuple: (ruta del archivo, dict tipo -> ChainCode)
+    """
+    path = os.path.join(codes_dir, f"{case['name']}.chc")
+    codes = case_chain_codes(case)
+    save_chain_codes(path, codes)
+    return path, codes
+
+def csv_record(case, save_path, codes_dir=None):
+    """
+    Fila del CSV de un caso: las columnas de metrics_record con los códigos
+    después de β₀/β₁, como en el formato original.
+    
+    Args:
+        case: Resultado de un caso
+        save_path: Ruta del archivo CSV (las rutas de los códigos son relativas a él)
+        codes_dir: Directorio de los códigos empaquetados (ver save_metrics_to_csv)
         
-        record = {
-            'imagen': case['name'],
-            'pixeles': num_pixeles,
-            'vertices': case['metrics']['vertices'],
-            'aristas': case['metrics']['edges'],
-            'caras': case['metrics']['faces'],
-            'componentes': case['metrics']['beta0'],
-            'agujeros': case['metrics']['beta1'],
-            'codigo_f8': case['codes']['f8'],
-            'codigo_f4': case['codes']['f4'],
-            'codigo_vcc': case['codes']['vcc'],
-            'codigo_3ot': case['codes']['ot3'],
-            'N1': case['metrics']['vcc']['N1'],
-            'N3': case['metrics']['vcc']['N3'],
-            'N2h': case['metrics']['3ot']['N2h'],
-            'N2v': case['metrics']['3ot']['N2v'],
-            'euler_vef': case['metrics']['euler_vef'],
-            'euler_poincare': case['metrics']['euler_poincare'],
-            'vcc_x': case['metrics']['vcc']['x'],
-            '3ot_x': case['metrics']['3ot']['combined']['X_value'],
-            'euler_freeman': case['metrics']['freeman_chain']['euler_from_chain_rotation']
-        }
-        records.append(record)
+    Returns:
+        dict: Columna -> valor
+    """
+    columns = list(metrics_record(case).items())
+    split = [name for name, _ in columns].index('agujeros') + 1
+    if codes_dir is None:
+        # Cadenas protegidas como texto para Excel (evita la notación científica)
+        codes = [(column, f'="{case["codes"][key]}"') for column, key in CSV_CODE_COLUMNS.items()]
+    else:
+        path, chain_codes = save_case_chain_codes(case, codes_dir)
+        codes = [('archivo_codigos', os.path.relpath(path, os.path.dirname(os.path.abspath(save_path))))]
+        codes += [(f'longitud_{key}', len(code)) for key, code in chain_codes.items()]
+    return dict(columns[:split] + codes + columns[split:])
+
+def save_metrics_to_csv(cases_data, save_path, codes_dir=None):
+    """
+    Guarda las métricas en un archivo CSV
     
+    Args:
+        cases_data: Lista con datos de casos
+        save_path: Ruta del archivo CSV
+        codes_dir: Directorio donde guardar los códigos empaquetados de cada
+                   caso (save_case_chain_codes); el CSV guarda entonces la
+                   ruta del archivo y la longitud de cada código en lugar de
+                   las cadenas completas (None = cadenas en el CSV)
+    """
     # Crear DataFrame y guardar
-    df = pd.DataFrame(records)
+    df = pd.DataFrame([csv_record(case, save_path, codes_dir) for case in cases_data])
     
     # Asegurar que el directorio existe
-    os.makedirs(os.path.dirname(save_path), exist_ok=True)
-    
-    # Evitar exportación como notación científica: forzamos a string
-    df['codigo_f8'] = df['codigo_f8'].astype(str)
-    df['codigo_f4'] = df['codigo_f4'].astype(str)
-    df['codigo_vcc'] = df['codigo_vcc'].astype(str)
-    df['codigo_3ot'] = df['codigo_3ot'].astype(str)
-
-    # Alternativa rápida: proteger como texto para Excel
-    for col in ['codigo_f8', 'codigo_f4', 'codigo_vcc', 'codigo_3ot']:
-        df[col] = df[col].apply(lambda x: f'="{x}"')
+    directory = os.path.dirname(save_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
         
     # Guardar CSV
     df.to_csv(save_path, index=False, encoding='utf-8')
-    print(f"\nMétricas guardadas en: {save_path}")
+    logger.info("\nMétricas guardadas en: %s", save_path)
 
-def create_summary_report(cases_data, save_path):
+class MetricsCSVWriter:
+    """
+    Escritor incremental del CSV de save_metrics_to_csv: cada write() añade
+    la fila de un caso al archivo (to_csv en modo 'a'), de modo que un lote
+    largo no guarda los resultados en memoria hasta el final.
+    
+    Las columnas se fijan con la primera fila, como en MetricsWriter: las
+    que falten en filas posteriores quedan vacías.
+    
+    Args:
+        save_path: Ruta del archivo CSV (se reemplaza al escribir la primera fila)
+        codes_dir: Directorio de los códigos empaquetados (ver save_metrics_to_csv)
+    """
+    
+    def __init__(self, save_path, codes_dir=None):
+        self.save_path = save_path
+        self.codes_dir = codes_dir
+        self.columns = None
+        self.rows_written = 0
+        
+        directory = os.path.dirname(save_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+    
+    def write(self, case):
+        """Añade la fila de un caso al CSV"""
+        record = csv_record(case, self.save_path, self.codes_dir)
+        first = self.columns is None
+        if first:
+            self.columns = list(record)
+        pd.DataFrame([record], columns=self.columns).to_csv(
+            self.save_path, mode='w' if first else 'a', header=first, index=False, encoding='utf-8')
+        self.rows_written += 1
+    
+    def close(self):
+        if self.columns is not None:
+            logger.info("\nMétricas guardadas en: %s (%d filas)", self.save_path, self.rows_written)
+
+def create_summary_report(cases_data, save_path, codes_dir=None):
     """
     Crea un reporte resumen en texto
     
     Args:
         cases_data: Lista con datos de casos
         save_path: Ruta del archivo de reporte
+        codes_dir: Directorio donde guardar los códigos empaquetados de cada
+                   caso; el reporte los referencia en lugar de copiar las
+                   cadenas (None = cadenas en el reporte)
     """
     with open(save_path, 'w', encoding='utf-8') as f:
         f.write("REPORTE DE ANÁLISIS TOPOLÓGICO\n")
@@ -478,11 +633,18 @@ def create_summary_report(cases_data, save_path):
             f.write("-" * 30 + "\n")
             m = case['metrics']
             
-            # Imprimir en terminal las cadenas de código
-            print(f"\nCódigos generados para {case['name']}:")
-            print(f"VCC: {m['vcc']['code_string']}")
-            print(f"3OT: {m['3ot']['code_string']}")
-            print("-" * 30)
+            # Códigos como cadena o como referencia al archivo empaquetado
+            code_text = {'vcc': m['vcc']['code_string'], 'ot3': m['3ot']['code_string']}
+            if codes_dir is not None:
+                path, chain_codes = save_case_chain_codes(case, codes_dir)
+                for key in code_text:
+                    code_text[key] = (f"{path} [{key}] ({len(chain_codes[key])} símbolos, "
+                                      f"{chain_codes[key].num_contours} contornos, "
+                                      f"{len(chain_codes[key].data)} bytes)")
+            
+            # Volcar las cadenas de código solo si se activó dump_codes
+            log_codes(f"VCC ({case['name']})", m['vcc']['code_string'])
+            log_codes(f"3OT ({case['name']})", m['3ot']['code_string'])
             
             # Métricas básicas
             f.write(f"Números de Betti:\n")
@@ -500,7 +662,7 @@ def create_summary_report(cases_data, save_path):
             f.write(f"  N3 (vértices con tres conexiones): {vcc['N3']}\n")
             f.write(f"  N1 - N3: {vcc['N1'] - vcc['N3']}\n")
             f.write(f"  x = (N1 - N3)/4: {vcc['x']:.2f}\n")
-            f.write(f"  Código binario: {vcc['code_string']}\n")
+            f.write(f"  Código binario: {code_text['vcc']}\n")
             f.write(f"  Verificación con Euler-Poincaré:\n")
             f.write(f"    VCC (x): {vcc['x']:.2f}\n")
             f.write(f"    E-P (β₀-β₁): {m['euler_poincare']}\n")
@@ -514,7 +676,7 @@ def create_summary_report(cases_data, save_path):
             f.write(f"  N2v (segmentos verticales): {ot3['N2v']}\n")
             f.write(f"  N2d (segmentos diagonales): {ot3['N2d']}\n")
             f.write(f"  X = (N2h - N2v)/4: {ot3['combined']['X_value']:.2f}\n")
-            f.write(f"  Código binario: {ot3['code_string']}\n")
+            f.write(f"  Código binario: {code_text['ot3']}\n")
             
             # Análisis por dirección
             directions = ['Horizontal', 'Vertical', 'Diagonal']
@@ -537,86 +699,150 @@ def create_summary_report(cases_data, save_path):
             
             f.write("\n" + "="*50 + "\n\n")
     
-    print(f"\nReporte guardado en: {save_path}")
+    logger.info("\nReporte guardado en: %s", save_path)
+
+def code_to_array(code):
+    """
+    Convierte un código (cadena de dígitos o lista de arrays por contorno)
+    en un único array uint8 de símbolos, sin recorrerlo carácter a carácter.
+    
+    Args:
+        code: Cadena de dígitos 0-9 o lista de arrays uint8
+        
+    Returns:
+        numpy.ndarray: Símbolos del código
+    """
+    if isinstance(code, str):
+        return np.frombuffer(code.encode('ascii'), dtype=np.uint8) - ord('0')
+    if isinstance(code, np.ndarray):
+        return code.astype(np.uint8, copy=False)
+    return np.concatenate(code).astype(np.uint8, copy=False) if len(code) else np.zeros(0, dtype=np.uint8)
+
+def code_histogram(code, n_symbols, bins, start=0, stop=None):
+    """
+    Agrupa los símbolos de un código en `bins` ventanas consecutivas y cuenta
+    cada símbolo por ventana.
+    
+    Args:
+        code: Código (ver code_to_array)
+        n_symbols: Número de símbolos distintos (4 para VCC, 3 para 3OT)
+        bins: Número máximo de ventanas
+        start, stop: Rango de posiciones del código a agrupar
+        
+    Returns:
+        tuple: (edges, counts) con los límites de las ventanas en posiciones
+               del código (bins+1) y las cuentas por ventana (bins, n_symbols)
+    """
+    symbols = code_to_array(code)[start:stop]
+    n = symbols.size
+    if n == 0:
+        return np.array([start]), np.zeros((0, n_symbols), dtype=np.int64)
+    bins = max(1, min(bins, n))
+    window = np.arange(n, dtype=np.int64) * bins // n
+    counts = np.bincount(window * n_symbols + symbols, minlength=bins * n_symbols)
+    edges = start - (-np.arange(bins + 1, dtype=np.int64) * n // bins)
+    return edges, counts.reshape(bins, n_symbols)
+
+def _stacked_symbol_image(counts, rows):
+    """
+    Imagen (rows, ventanas) con el índice del símbolo en cada píxel: cada
+    columna apila las proporciones de los símbolos de su ventana.
+    """
+    fractions = np.cumsum(counts, axis=1) / np.maximum(counts.sum(axis=1, keepdims=True), 1)
+    levels = (np.arange(rows) + 0.5) / rows
+    index = (levels[:, None, None] >= fractions[None, :, :]).sum(axis=2)
+    return np.minimum(index, counts.shape[1] - 1)
+
+def _abbreviate_code(code, limit=None):
+    """Texto del código recortado a `limit` símbolos para las anotaciones"""
+    limit = limit or VISUALIZATION_CONFIG['code_text_limit']
+    if len(code) <= limit:
+        return code
+    return f"{code[:limit]}… ({len(code)} símbolos)"
+
+def _draw_code_track(ax, code, n_symbols, colors, window=None):
+    """
+    Dibuja un código en `ax` con nivel de detalle: un símbolo por barra si el
+    rango visible tiene hasta VISUALIZATION_CONFIG['code_full_resolution']
+    símbolos, o un único imshow con el histograma de símbolos por ventana
+    (a lo sumo VISUALIZATION_CONFIG['code_max_bins']) si es más largo, de
+    modo que el coste de dibujo no crece con la longitud del código.
+    
+    Args:
+        ax: Ejes donde dibujar
+        code: Código (ver code_to_array)
+        n_symbols: Número de símbolos distintos
+        colors: Lista de colores por símbolo
+        window: Rango (inicio, fin) de posiciones a mostrar (None = todo)
+    """
+    symbols = code_to_array(code)
+    start, stop = window or (0, symbols.size)
+    start, stop = max(0, start), min(symbols.size, stop)
+    visible = symbols[start:stop]
+    
+    if visible.size <= VISUALIZATION_CONFIG['code_full_resolution']:
+        # Resolución completa: una barra y una etiqueta por símbolo
+        x = np.arange(start, stop)
+        labels = [str(d) for d in visible.tolist()]
+        bars = ax.bar(x, np.ones(visible.size), color=[colors[d] for d in visible.tolist()],
+                      edgecolor='black', linewidth=1)
+        ax.set_xticks(x)
+        ax.set_xticklabels(labels, fontsize=10)
+        ax.set_ylim(0, 1.5)
+        for bar, label in zip(bars, labels):
+            ax.text(bar.get_x() + bar.get_width()/2, bar.get_height() + 0.1,
+                    label, ha='center', va='bottom', fontweight='bold')
+    else:
+        # Histograma por ventana: proporción de cada símbolo apilada en cada columna
+        edges, counts = code_histogram(visible, n_symbols, VISUALIZATION_CONFIG['code_max_bins'])
+        palette = np.array([matplotlib.colors.to_rgb(colors[d]) for d in range(n_symbols)])
+        image = palette[_stacked_symbol_image(counts, rows=64)]
+        ax.imshow(image, aspect='auto', origin='lower', interpolation='nearest',
+                  extent=(start + edges[0] - 0.5, start + edges[-1] - 0.5, 0, 1))
+        ax.set_ylim(0, 1.05)
+        ax.set_xlabel(f'Posición (ventanas de ~{visible.size / counts.shape[0]:.0f} símbolos)', fontsize=10)
+        ax.set_ylabel('Proporción', fontsize=10)
+    
+    ax.grid(True, linestyle='--', alpha=0.3)
+
+def _code_legend(ax, n_symbols, title):
+    """Leyenda con un color por valor de un código"""
+    legend_elements = [plt.Rectangle((0,0),1,1, facecolor=CODE_SYMBOL_COLORS[i],
+                                   edgecolor='black', label=f'Valor {i}')
+                      for i in range(n_symbols)]
+    ax.legend(handles=legend_elements, title=title,
+              loc='upper right', bbox_to_anchor=(1, -0.1))
+
+def _codes_info_text(codes):
+    """Texto con la longitud y el inicio de los códigos VCC y 3OT"""
+    return f"""
+    Longitud de códigos: {len(codes['vcc'])}
+    VCC: {_abbreviate_code(codes['vcc'])}
+    3OT: {_abbreviate_code(codes['ot3'])}
+    """
 
-def plot_topology_codes(codes, save_path, case_name=""):
+def plot_topology_codes(codes, save_path, case_name="", window=None, dpi=None):
     """
-    Visualiza los códigos VCC y 3OT
+    Visualiza los códigos VCC y 3OT. Los códigos largos se dibujan como
+    histogramas de símbolos por ventana; con `window` se muestra un rango
+    del código a resolución completa si es lo bastante corto.
     
     Args:
         codes: Diccionario con los códigos
         save_path: Ruta donde guardar la visualización
         case_name: Nombre del caso (opcional)
+        window: Rango (inicio, fin) de posiciones a mostrar (None = todo)
+        dpi: Resolución (por defecto VISUALIZATION_CONFIG['dpi'])
     """
-    # Configuración de colores y estilos
-    background_color = '#f0f0f0'
-    bar_colors = {
-        # Colores para VCC (base 4)
-        '0': '#1f77b4',  # Azul
-        '1': '#2ca02c',  # Verde
-        '2': '#ff7f0e',  # Naranja
-        '3': '#d62728',  # Rojo
-        # Colores para 3OT (base 3)
-        'h': '#1f77b4',  # Azul para horizontal
-        'v': '#2ca02c',  # Verde para vertical
-        'd': '#ff7f0e'   # Naranja para diagonal
-    }
-    
     # Crear figura con dos subplots
     fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(15, 10))
     fig.patch.set_facecolor('white')
     
-    # Configurar el primer subplot para VCC
-    ax1.set_facecolor(background_color)
-    
-    vcc_code = list(codes['vcc'])
-    x = np.arange(len(vcc_code))
-    colors = [bar_colors[d] for d in vcc_code]
-    
-    bars = ax1.bar(x, [1]*len(vcc_code), color=colors, edgecolor='black', linewidth=1)
-    ax1.set_title('Código VCC (Vertex Correction Code)', pad=20, fontsize=12, fontweight='bold')
-    ax1.set_xticks(x)
-    ax1.set_xticklabels(vcc_code, fontsize=10)
-    ax1.set_ylim(0, 1.5)
-    ax1.grid(True, linestyle='--', alpha=0.3)
-    
-    # Añadir valores sobre las barras
-    for i, bar in enumerate(bars):
-        ax1.text(bar.get_x() + bar.get_width()/2, bar.get_height() + 0.1,
-                vcc_code[i], ha='center', va='bottom', fontweight='bold')
-    
-    # Crear leyenda para VCC
-    legend_elements = [plt.Rectangle((0,0),1,1, facecolor=bar_colors[str(i)], 
-                                   edgecolor='black', label=f'Valor {i}')
-                      for i in range(4)]  # 4 valores para VCC
-    ax1.legend(handles=legend_elements, title='Valores VCC',
-              loc='upper right', bbox_to_anchor=(1, -0.1))
-    
-    # Configurar el segundo subplot para 3OT
-    ax2.set_facecolor(background_color)
-    
-    ot3_code = list(codes['ot3'])
-    x = np.arange(len(ot3_code))
-    colors = [bar_colors[d] for d in ot3_code]
-    
-    bars = ax2.bar(x, [1]*len(ot3_code), color=colors, edgecolor='black', linewidth=1)
-    ax2.set_title('Código 3OT (Three Orthogonal Topology)', pad=20, fontsize=12, fontweight='bold')
-    ax2.set_xticks(x)
-    ax2.set_xticklabels(ot3_code, fontsize=10)
-    ax2.set_ylim(0, 1.5)
-    ax2.grid(True, linestyle='--', alpha=0.3)
-    
-    # Añadir valores sobre las barras
-    for i, bar in enumerate(bars):
-        ax2.text(bar.get_x() + bar.get_width()/2, bar.get_height() + 0.1,
-                ot3_code[i], ha='center', va='bottom', fontweight='bold')
-    
-    # Crear leyenda para 3OT
-    legend_elements = [plt.Rectangle((0,0),1,1, facecolor=bar_colors[str(i)], 
-                                   edgecolor='black', label=f'Valor {i}')
-                      for i in range(3)]  # 3 valores para 3OT
-    ax2.legend(handles=legend_elements, title='Valores 3OT',
-              loc='upper right', bbox_to_anchor=(1, -0.1))
+    for ax, (key, n_symbols, title, legend_title) in zip((ax1, ax2), CODE_TRACKS):
+        ax.set_facecolor(COLORS['background'])
+        _draw_code_track(ax, codes[key], n_symbols, CODE_SYMBOL_COLORS, window)
+        ax.set_title(title, pad=20, fontsize=12, fontweight='bold')
+        _code_legend(ax, n_symbols, legend_title)
     
     # Añadir título general
     if case_name:
@@ -624,22 +850,19 @@ def plot_topology_codes(codes, save_path, case_name=""):
                     fontsize=16, fontweight='bold', y=1.02)
     
     # Añadir información adicional
-    info_text = f"""
-    Longitud de códigos: {len(vcc_code)}
-    VCC: {codes['vcc']}
-    3OT: {codes['ot3']}
-    """
-    fig.text(0.02, 0.02, info_text, fontsize=10, 
+    fig.text(0.02, 0.02, _codes_info_text(codes), fontsize=10, 
              bbox=dict(facecolor='white', edgecolor='black', alpha=0.8))
     
     # Guardar la figura
-    plt.savefig(save_path, dpi=VISUALIZATION_CONFIG['dpi'], 
+    plt.savefig(save_path, dpi=dpi or VISUALIZATION_CONFIG['dpi'], 
                 bbox_inches='tight', facecolor='white')
     plt.close()
 
 def create_topology_pattern(code, size=(256, 256)):
     """
-    Crea una imagen binaria basada en un código topológico.
+    Crea una imagen binaria basada en un código topológico. Si el código no
+    cabe con al menos PATTERN_MIN_CELL píxeles por símbolo, devuelve en su
+    lugar el histograma de símbolos por columna (valor = símbolo + 1).
     
     Args:
         code: String con el código (VCC o 3OT)
@@ -650,8 +873,18 @@ def create_topology_pattern(code, size=(256, 256)):
     """
     pattern = np.zeros(size, dtype=np.uint8)
     h, w = size
+    if not len(code):
+        return pattern
     cell_width = w // len(code)
     
+    if cell_width < PATTERN_MIN_CELL:
+        symbols = code_to_array(code)
+        n_symbols = int(symbols.max()) + 1
+        _, counts = code_histogram(symbols, n_symbols, w)
+        columns = _stacked_symbol_image(counts, h) + 1
+        pattern[:, :columns.shape[1]] = columns
+        return pattern
+    
     for i, digit in enumerate(code):
         value = int(digit)
         if value == 0:
@@ -698,7 +931,7 @@ def plot_topology_patterns(codes, save_path, case_name=""):
     plt.colorbar(im1, ax=ax1, fraction=0.046, pad=0.04)
     
     # Añadir código como texto
-    ax1.text(0.02, -0.1, f'Código: {codes["vcc"]}', 
+    ax1.text(0.02, -0.1, f'Código: {_abbreviate_code(codes["vcc"])}', 
              transform=ax1.transAxes, fontsize=10,
              bbox=dict(facecolor='white', edgecolor='black', alpha=0.8))
     
@@ -711,7 +944,7 @@ def plot_topology_patterns(codes, save_path, case_name=""):
     plt.colorbar(im2, ax=ax2, fraction=0.046, pad=0.04)
     
     # Añadir código como texto
-    ax2.text(0.02, -0.1, f'Código: {codes["ot3"]}', 
+    ax2.text(0.02, -0.1, f'Código: {_abbreviate_code(codes["ot3"])}', 
              transform=ax2.transAxes, fontsize=10,
              bbox=dict(facecolor='white', edgecolor='black', alpha=0.8))
     
@@ -723,8 +956,8 @@ def plot_topology_patterns(codes, save_path, case_name=""):
     # Añadir información adicional
     info_text = f"""
     Longitud de códigos: {len(codes['vcc'])}
-    VCC: {codes['vcc']}
-    3OT: {codes['ot3']}
+    VCC: {_abbreviate_code(codes['vcc'])}
+    3OT: {_abbreviate_code(codes['ot3'])}
     """
     fig.text(0.02, 0.02, info_text, fontsize=10, 
              bbox=dict(facecolor='white', edgecolor='black', alpha=0.8))
@@ -1,5 +1,8 @@
 import os
 import sys
+import argparse
+import time
+import logging
 import numpy as np
 from datetime import datetime
 import matplotlib.pyplot as plt
@@ -7,131 +10,235 @@ import matplotlib.pyplot as plt
 # Añadir el directorio actual al path para importar módulos
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from generator.field_generator import generate_topology_case, generate_vector_field
+from generator.field_generator import generate_topology_case
 from generator.topology_metrics import compute_all_metrics, analyze_connectivity
 from generator.visualizer import (plot_topology_analysis, create_comparison_plot, 
                                  create_individual_case_visualization, 
-                                 save_metrics_to_csv, create_summary_report,
+                                 MetricsCSVWriter, create_summary_report,
                                  plot_vector_field_enhanced, plot_topology_codes, plot_topology_patterns)
-from generator.topology_codes_extended import (compute_euler_from_freeman_chain, get_f8_code, f8_to_f4, compute_vcc, compute_3ot,
+from generator.topology_codes_extended import (compute_euler_from_freeman_chain,
                                             normalize_code_length, verify_euler_equalities)
+from generator.analysis_context import AnalysisContext
+from generator.topology_result import TopologyResult
+from generator.render_pipeline import RenderPipeline
+from generator.columnar_export import MetricsWriter
+from generator.chain_codes import context_chain_codes
+from generator.batch_runner import analyze_case, iter_batch_results, run_batch, cache_entry, result_summary
+from generator.result_cache import mask_key
+from generator.run_logging import configure_logging, log_codes, summarize_run
+from generator.profiling import StageProfiler, warm_context, log_timings_report
 from generator.case_definitions import get_topology_cases, validate_case_topology
 from generator.image_reader import read_binary_image, validate_binary_image, preprocess_binary_image
 from generator.test_images import get_test_images, visualizar_imagenes_prueba
-from config.topology_config import IMAGE_CONFIG, VISUALIZATION_CONFIG
+from config.topology_config import IMAGE_CONFIG, VISUALIZATION_CONFIG, CACHE_CONFIG, COLUMNAR_CONFIG
 
-def analyze_binary_image(image_path):
+logger = logging.getLogger('main')
+
+def analyze_binary_image(image_path, profile=False, cache=None, log_summary=None):
     """
-    Analiza una imagen binaria y calcula todos los códigos y métricas topológicas.
+    Analiza una imagen binaria. Devuelve un TopologyResult que calcula cada
+    parte (β₀/β₁, métricas, conectividad, códigos, campo vectorial) al
+    pedirla por primera vez, de modo que quien lee solo unos campos no paga
+    el resto; el acceso como diccionario sigue funcionando.
+    
+    Con `profile` o `cache` se calcula todo al momento, para medir cada etapa
+    o guardar el resultado completo en la caché; el campo vectorial solo se
+    calcula cuando una figura lo pide.
     
     Args:
         image_path: Ruta a la imagen binaria
+        profile: Si se mide tiempo, CPU y pico de memoria de cada etapa
+                 (resultado en 'timings')
+        cache: ResultCache donde buscar y guardar el resultado (None = sin caché)
+        log_summary: Si se registra el resumen de log_image_analysis, que
+                     calcula métricas, códigos e igualdades (None = solo con
+                     el nivel DEBUG, p. ej. main.py -v)
         
     Returns:
-        dict: Resultados del análisis
+        TopologyResult: Resultados del análisis
     """
     # Normalizar la ruta del archivo
     image_path = os.path.abspath(os.path.normpath(image_path))
     
-    print(f"\nAnalizando imagen: {image_path}")
-    print("=" * 50)
+    logger.info("\nAnalizando imagen: %s", image_path)
+    logger.info("=" * 50)
     
     # Verificar que el archivo existe
     if not os.path.exists(image_path):
         raise ValueError(f"La imagen no existe en la ruta: {image_path}")
     
-    print(f"Ruta absoluta normalizada: {image_path}")
-    print(f"Directorio actual: {os.getcwd()}")
+    logger.debug("Ruta absoluta normalizada: %s", image_path)
+    logger.debug("Directorio actual: %s", os.getcwd())
+    
+    # Medición opcional de cada etapa
+    profiler = StageProfiler(enabled=profile)
     
-    # Leer y preprocesar imagen
     try:
-        binary_image = read_binary_image(image_path)
-        print("Imagen leída correctamente")
-        print(f"Dimensiones de la imagen: {binary_image.shape}")
-    except Exception as e:
-        print(f"Error al leer la imagen: {str(e)}")
-        raise
-    
-    if not validate_binary_image(binary_image):
-        raise ValueError("La imagen no es válida para análisis topológico")
-    
-    print("Imagen validada correctamente")
-    binary_image = preprocess_binary_image(binary_image)
-    print("Imagen preprocesada correctamente")
-    
-    # Generar campo vectorial
-    u, v = generate_vector_field(binary_image)
-    
-    # Calcular métricas topológicas básicas
-    metrics = compute_all_metrics(binary_image)
-    connectivity = analyze_connectivity(binary_image)
-    
-    # Generar códigos en secuencia F8 -> F4 -> VCC -> 3OT
-    f8_code = get_f8_code(binary_image)
-    f4_code = f8_to_f4(f8_code)
+        # Leer y preprocesar imagen
+        try:
+            with profiler.stage('read'):
+                binary_image = read_binary_image(image_path)
+            logger.debug("Imagen leída correctamente")
+            logger.debug("Dimensiones de la imagen: %s", binary_image.shape)
+        except Exception as e:
+            logger.error("Error al leer la imagen: %s", e)
+            raise
+        
+        # Buscar el resultado en la caché antes de analizar
+        entry = None
+        if cache is not None:
+            with profiler.stage('cache'):
+                key = mask_key(binary_image, threshold=127)
+                entry = cache.get(key)
+        
+        if entry is not None:
+            logger.debug("Resultado recuperado de la caché")
+            result = TopologyResult(entry['mask'], {k: entry[k] for k in ('metrics', 'connectivity', 'codes', 'equalities')})
+        else:
+            with profiler.stage('validate'):
+                if not validate_binary_image(binary_image):
+                    raise ValueError("La imagen no es válida para análisis topológico")
+            
+            logger.debug("Imagen validada correctamente")
+            with profiler.stage('preprocess'):
+                binary_image = preprocess_binary_image(binary_image)
+            logger.debug("Imagen preprocesada correctamente")
+            
+            # Contexto compartido: etiquetado, Betti, contornos y códigos se calculan una vez
+            result = TopologyResult(binary_image)
+            
+            if profile or cache is not None:
+                warm_context(result.context, profiler)
+                with profiler.stage('metrics'):
+                    result.metrics
+                with profiler.stage('connectivity'):
+                    result.connectivity
+                with profiler.stage('equalities'):
+                    result.equalities
+            
+            if cache is not None:
+                with profiler.stage('cache'):
+                    computed = {k: result[k] for k in ('metrics', 'connectivity', 'equalities')}
+                    computed['codes'] = dict(result.codes)
+                    cache.put(key, cache_entry({'pixels': np.sum(binary_image), **computed}, binary_image))
+    finally:
+        profiler.close()
+    
+    if cache is not None:
+        result['cache_hit'] = entry is not None
+    if profile:
+        result['timings'] = profiler.timings
+    
+    # El resumen necesita métricas y códigos: por defecto solo con -v, para
+    # que el resultado siga siendo perezoso con el nivel INFO del CLI
+    if log_summary is None:
+        log_summary = logger.isEnabledFor(logging.DEBUG)
+    if log_summary:
+        log_image_analysis(result)
+    
+    return result
 
-    euler_freeman_rot = compute_euler_from_freeman_chain(f8_code)
-    metrics['freeman_chain'] = {'euler_from_chain_rotation': euler_freeman_rot}
-    
-    # Calcular VCC a partir de F4
-    vcc_results = compute_vcc(binary_image, f4_code)
-    metrics['vcc'] = vcc_results
-    vcc_code = vcc_results['code_string']
-    
-    # Calcular 3OT a partir de VCC
-    ot3_results = compute_3ot(binary_image, vcc_code)
-    metrics['3ot'] = ot3_results
-    ot3_code = ot3_results['code_string']
-    
-    # Verificar igualdades
-    equalities = verify_euler_equalities(metrics)
-    
-    # Preparar resultado
-    result = {
-        'binary_image': binary_image,
-        'vector_field': (u, v),
-        'metrics': metrics,
-        'connectivity': connectivity,
-        'codes': {
-            'f8': f8_code,
-            'f4': f4_code,
-            'vcc': vcc_code,
-            'ot3': ot3_code
-        },
-        'equalities': equalities
-    }
+def log_image_analysis(result):
+    """
+    Muestra los códigos, las métricas principales y las igualdades de un
+    resultado de analyze_binary_image.
+    
+    Args:
+        result: TopologyResult o diccionario de resultados
+    """
+    metrics = result['metrics']
+    equalities = result['equalities']
+    codes = result['codes']
+    euler_freeman_rot = metrics['freeman_chain']['euler_from_chain_rotation']
     
     # Mostrar resultados
-    print("\nCódigos Topológicos:")
-    print(f"  F8: {f8_code}")
-    print(f"  F4: {f4_code}")
-    print(f"  VCC: {vcc_code}")
-    print(f"  3OT: {ot3_code}")
-    print(f"  Sumatoria de rotaciones locales: {euler_freeman_rot}")
+    logger.info("\nCódigos Topológicos:")
+    log_codes("  F8", codes['f8'])
+    log_codes("  F4", codes['f4'])
+    log_codes("  VCC", codes['vcc'])
+    log_codes("  3OT", codes['ot3'])
+    logger.info("  Sumatoria de rotaciones locales: %s", euler_freeman_rot)
 
     
-    print("\nMétricas Principales:")
-    print(f"  β₀ (Componentes) = {metrics['beta0']}")
-    print(f"  β₁ (Agujeros) = {metrics['beta1']}")
-    print(f"  χ (V-E+F) = {metrics['euler_vef']}")
-    print(f"  χ (β₀-β₁) = {metrics['euler_poincare']}")
-    print(f"  VCC (N1-N3)/4 = {metrics['vcc']['x']:.2f}")
-    print(f"  3OT (N2h-N2v)/4 = {metrics['3ot']['combined']['X_value']:.2f}")
+    logger.info("\nMétricas Principales:")
+    logger.info("  β₀ (Componentes) = %s", metrics['beta0'])
+    logger.info("  β₁ (Agujeros) = %s", metrics['beta1'])
+    logger.info("  χ (V-E+F) = %s", metrics['euler_vef'])
+    logger.info("  χ (β₀-β₁) = %s", metrics['euler_poincare'])
+    logger.info("  VCC (N1-N3)/4 = %.2f", metrics['vcc']['x'])
+    logger.info("  3OT (N2h-N2v)/4 = %.2f", metrics['3ot']['combined']['X_value'])
     
-    print("\nVerificación de Igualdades:")
+    logger.info("\nVerificación de Igualdades:")
     for name, value in equalities['verificaciones'].items():
-        print(f"  {name}: {'✓' if value else '✗'}")
+        logger.info("  %s: %s", name, '✓' if value else '✗')
     
     if not equalities['todas_igualdades_cumplen']:
-        print("\nDiferencias encontradas:")
+        logger.info("\nDiferencias encontradas:")
         for name, value in equalities['diferencias'].items():
-            print(f"  {name}: {value:.6f}")
+            logger.info("  %s: %.6f", name, value)
+
+def print_case_analysis(resultado):
+    """
+    Muestra el análisis detallado de un caso.
     
-    return result
+    Args:
+        resultado: Diccionario de resultados de un caso
+    """
+    metrics = resultado['metrics']
+    codes = resultado['codes']
+    
+    logger.info("Píxeles: %d", np.sum(resultado['field']))
+    logger.info("Vértices (V): %s", metrics['vertices'])
+    logger.info("Aristas (E): %s", metrics['edges'])
+    logger.info("Caras (F): %s", metrics['faces'])
+    logger.info("Componentes (N): %s", metrics['beta0'])
+    logger.info("Agujeros (H): %s", metrics['beta1'])
+    logger.info("\nCódigos Topológicos:")
+    logger.info("  Longitudes: F8=%d, F4=%d, VCC=%d, 3OT=%d",
+                len(codes['f8']), len(codes['f4']), len(codes['vcc']), len(codes['ot3']))
+    log_codes("  F8", codes['f8'])
+    log_codes("  F4", codes['f4'])
+    log_codes("  VCC", codes['vcc'])
+    log_codes("  3OT", codes['ot3'])
+    logger.info("\nAnálisis VCC:")
+    logger.info("  N1: %s", metrics['vcc']['N1'])
+    logger.info("  N3: %s", metrics['vcc']['N3'])
+    logger.info("  x = (N1 - N3)/4: %.2f", metrics['vcc']['x'])
+    logger.info("\nAnálisis 3OT:")
+    logger.info("  N2h: %s", metrics['3ot']['N2h'])
+    logger.info("  N2v: %s", metrics['3ot']['N2v'])
+    logger.info("  N2d: %s", metrics['3ot']['N2d'])
+    logger.info("  X = (N2h - N2v)/4: %.2f", metrics['3ot']['combined']['X_value'])
+    logger.info("\nCaracterísticas de Euler:")
+    logger.info("  χ = V - E + F = %.2f", metrics['euler_vef'])
+    logger.info("  χ = N - H = %.2f", metrics['euler_poincare'])
+    logger.info("  χ = (N1 - N3)/4 = %.2f", metrics['vcc']['x'])
+    logger.info("  χ = (N2h - N2v)/4 = %.2f", metrics['3ot']['combined']['X_value'])
+    logger.info("  χ = ΣR(i)/4 (Freeman Chain) = %.2f", metrics['freeman_chain']['euler_from_chain_rotation'])
+    logger.info("\nVerificación de igualdades:")
+    for name, value in resultado['equalities']['verificaciones'].items():
+        logger.info("  %s: %s", name, '✓' if value else '✗')
 
-def analyze_test_images():
+def analyze_test_images(workers=None, chunksize=1, profile=False, plots_dir=None, columnar_path=None,
+                        codes_dir=None):
     """
     Analiza todas las imágenes de prueba y guarda los resultados.
+    
+    Args:
+        workers: Número de procesos para el análisis en paralelo. None analiza
+                 las imágenes una a una en este proceso.
+        chunksize: Número de imágenes enviadas a cada proceso por tarea
+        profile: Si se miden las etapas de cada imagen (resultado en 'timings')
+                 y se registra el reporte agregado por etapa
+        plots_dir: Directorio de las figuras de cada caso (None = sin figuras),
+                   dibujadas en RenderPipeline sin frenar el análisis
+        columnar_path: Archivo Parquet (o .arrow/.feather) donde se añaden
+                       las métricas de cada caso al terminarlo (None = solo CSV);
+                       los resultados devueltos son entonces solo result_summary
+        codes_dir: Directorio de los códigos empaquetados de cada caso; el CSV
+                   los referencia en lugar de copiar las cadenas
+    
+    El CSV se escribe caso a caso con MetricsCSVWriter.
     """
     # Crear directorios de salida
     output_dir = "output"
@@ -142,108 +249,175 @@ def analyze_test_images():
     # Obtener imágenes de prueba
     imagenes = get_test_images()
     
-    print("\nANÁLISIS TOPOLÓGICO DE IMÁGENES DE PRUEBA")
-    print("=" * 80)
-    print(f"Fecha de ejecución: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    print(f"Total de imágenes a analizar: {len(imagenes)}")
-    print()
-    
-    # Lista para almacenar resultados
-    resultados = []
+    logger.info("\nANÁLISIS TOPOLÓGICO DE IMÁGENES DE PRUEBA")
+    logger.info("=" * 80)
+    logger.info("Fecha de ejecución: %s", datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+    logger.info("Total de imágenes a analizar: %d", len(imagenes))
+    logger.info("")
     
-    # Analizar cada imagen
+    # Guardar imágenes en test_images
     for nombre, imagen in imagenes.items():
-        print(f"\nAnalizando: {nombre}")
-        print("-" * 80)
-        
-        # Guardar imagen en test_images
         imagen_path = os.path.join(test_images_dir, f"{nombre}.png")
         plt.imsave(imagen_path, imagen, cmap='gray')
-        
-        # Generar campo vectorial
-        u, v = generate_vector_field(imagen)
-        
-        # Calcular métricas
-        metrics = compute_all_metrics(imagen)
-        connectivity = analyze_connectivity(imagen)
-        
-        # Generar códigos
-        f8_code = get_f8_code(imagen)
-        euler_freeman_rot = compute_euler_from_freeman_chain(f8_code)  # ← Primero lo calculás
-        f4_code = f8_to_f4(f8_code)
-        vcc_results = compute_vcc(imagen, f4_code)
-        ot3_results = compute_3ot(imagen, vcc_results['code_string'])
-
-        metrics['freeman_chain'] = {'euler_from_chain_rotation': euler_freeman_rot}  # ← NUEVO
-        
-        # Verificar igualdades
-        equalities = verify_euler_equalities(metrics)
-        
-        # Guardar resultado
-        resultado = {
-            'name': nombre,
-            'field': imagen,
-            'vector_field': (u, v),
-            'metrics': metrics,
-            'connectivity': connectivity,
-            'codes': {
-                'f8': f8_code,
-                'f4': f4_code,
-                'vcc': vcc_results['code_string'],
-                'ot3': ot3_results['code_string']
-            },
-            'equalities': equalities
-        }
+    
+    # Lista para almacenar resultados
+    resultados = []
+    pipeline = RenderPipeline(plots_dir) if plots_dir is not None else None
+    writer = MetricsWriter(columnar_path) if columnar_path is not None else None
+    csv_writer = MetricsCSVWriter(os.path.join(output_dir, "metricas.csv"), codes_dir=codes_dir)
+    
+    def store(resultado):
+        # Métricas al CSV (y al archivo columnar) en cuanto se tienen; con el
+        # escritor columnar solo se guarda lo que usan el resumen y el gráfico
+        # comparativo
+        csv_writer.write(resultado)
+        if pipeline is not None:
+            pipeline.submit(resultado)
+        if writer is not None:
+            writer.write(resultado)
+            resultado = result_summary(resultado)
         resultados.append(resultado)
-        
-        # Mostrar análisis detallado
-        print(f"Píxeles: {np.sum(imagen)}")
-        print(f"Vértices (V): {metrics['vertices']}")
-        print(f"Aristas (E): {metrics['edges']}")
-        print(f"Caras (F): {metrics['faces']}")
-        print(f"Componentes (N): {metrics['beta0']}")
-        print(f"Agujeros (H): {metrics['beta1']}")
-        print("\nCódigos Topológicos:")
-        print(f"  F8: {f8_code}")
-        print(f"  F4: {f4_code}")
-        print(f"  VCC: {vcc_results['code_string']}")
-        print(f"  3OT: {ot3_results['code_string']}")
-        print("\nAnálisis VCC:")
-        print(f"  N1: {metrics['vcc']['N1']}")
-        print(f"  N3: {metrics['vcc']['N3']}")
-        print(f"  x = (N1 - N3)/4: {metrics['vcc']['x']:.2f}")
-        print("\nAnálisis 3OT:")
-        print(f"  N2h: {metrics['3ot']['N2h']}")
-        print(f"  N2v: {metrics['3ot']['N2v']}")
-        print(f"  N2d: {metrics['3ot']['N2d']}")
-        print(f"  X = (N2h - N2v)/4: {metrics['3ot']['combined']['X_value']:.2f}")
-        print("\nCaracterísticas de Euler:")
-        print(f"  χ = V - E + F = {metrics['euler_vef']:.2f}")
-        print(f"  χ = N - H = {metrics['euler_poincare']:.2f}")
-        print(f"  χ = (N1 - N3)/4 = {metrics['vcc']['x']:.2f}")
-        print(f"  χ = (N2h - N2v)/4 = {metrics['3ot']['combined']['X_value']:.2f}")
-        print(f"  χ = ΣR(i)/4 (Freeman Chain) = {euler_freeman_rot:.2f}")
-        print("\nVerificación de igualdades:")
-        for name, value in equalities['verificaciones'].items():
-            print(f"  {name}: {'✓' if value else '✗'}")
-    
-    # Guardar métricas en CSV
-    save_metrics_to_csv(resultados, os.path.join(output_dir, "metricas.csv"))
-    
-    print("\nAnálisis completado exitosamente!")
-    print(f"Los resultados se encuentran en el directorio: {os.path.abspath(output_dir)}")
-    print(f"Las imágenes se encuentran en el directorio: {os.path.abspath(test_images_dir)}")
+    
+    if workers is not None:
+        # Análisis en paralelo: los resultados llegan en el orden de las imágenes
+        items = ((nombre, imagen, profile, codes_dir is not None) for nombre, imagen in imagenes.items())
+        for resultado in iter_batch_results(analyze_case, items, workers, chunksize):
+            logger.info("\nAnalizando: %s (%.3f s)", resultado['name'], resultado['wall_time'])
+            logger.info("-" * 80)
+            resultado['field'] = imagenes[resultado['name']]
+            print_case_analysis(resultado)
+            store(resultado)
+    else:
+        # Analizar cada imagen una a una
+        for nombre, imagen in imagenes.items():
+            logger.info("\nAnalizando: %s", nombre)
+            logger.info("-" * 80)
+            
+            profiler = StageProfiler(enabled=profile)
+            
+            # Calcular métricas sobre un contexto compartido
+            ctx = AnalysisContext(imagen)
+            warm_context(ctx, profiler)
+            with profiler.stage('metrics'):
+                metrics = compute_all_metrics(ctx)
+            with profiler.stage('connectivity'):
+                connectivity = analyze_connectivity(ctx)
+            
+            # Generar códigos
+            f8_code = ctx.f8
+            f4_code = ctx.f4
+            vcc_results = ctx.vcc
+            ot3_results = ctx.ot3
+
+            with profiler.stage('equalities'):
+                euler_freeman_rot = compute_euler_from_freeman_chain(f8_code)
+                metrics['freeman_chain'] = {'euler_from_chain_rotation': euler_freeman_rot}
+                
+                # Verificar igualdades
+                equalities = verify_euler_equalities(metrics)
+            profiler.close()
+            
+            # Guardar resultado
+            resultado = {
+                'name': nombre,
+                'field': imagen,
+                'metrics': metrics,
+                'connectivity': connectivity,
+                'codes': {
+                    'f8': f8_code,
+                    'f4': f4_code,
+                    'vcc': vcc_results['code_string'],
+                    'ot3': ot3_results['code_string']
+                },
+                'equalities': equalities
+            }
+            if codes_dir is not None:
+                # Códigos con un tramo por contorno, mientras el contexto existe
+                resultado['chain_codes'] = context_chain_codes(ctx)
+            if profile:
+                resultado['timings'] = profiler.timings
+            
+            # Mostrar análisis detallado
+            print_case_analysis(resultado)
+            store(resultado)
+    
+    csv_writer.close()
+    if writer is not None:
+        writer.close()
+    
+    if profile:
+        log_timings_report(resultados)
+    
+    # Las figuras se terminan después de guardar las métricas
+    if pipeline is not None:
+        pipeline.submit_comparison(resultados, os.path.join(plots_dir, "comparison.png"))
+        logger.info("Figuras guardadas: %d en %s", len(pipeline.close()), os.path.abspath(plots_dir))
+    
+    logger.info("\nAnálisis completado exitosamente!")
+    logger.info("Los resultados se encuentran en el directorio: %s", os.path.abspath(output_dir))
+    logger.info("Las imágenes se encuentran en el directorio: %s", os.path.abspath(test_images_dir))
+    
+    return resultados
 
 def main():
-    """Función principal del programa"""
-    print("ANÁLISIS TOPOLÓGICO 2D - CÓDIGOS Y FÓRMULAS DE EULER")
-    print("=" * 60)
-    print(f"Fecha de ejecución: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    print(f"Directorio de trabajo: {os.getcwd()}")
-    print()
-    
-    # Analizar imágenes de prueba
-    analyze_test_images()
+    """
+    Función principal del programa.
+    
+    Uso:
+        python main.py                          # imágenes de prueba
+        python main.py carpeta/ --workers 8     # directorio o patrón glob de PNGs
+    """
+    parser = argparse.ArgumentParser(description="Análisis topológico 2D")
+    parser.add_argument('source', nargs='?', help="Directorio o patrón glob de imágenes a analizar")
+    parser.add_argument('--workers', type=int, default=None, help="Número de procesos en paralelo")
+    parser.add_argument('--chunksize', type=int, default=1, help="Imágenes por tarea enviada a cada proceso")
+    parser.add_argument('--output', default=os.path.join("output", "metricas.csv"), help="Archivo CSV de salida")
+    parser.add_argument('-v', '--verbose', action='store_true', help="Mostrar detalle de depuración")
+    parser.add_argument('-q', '--quiet', action='store_true', help="Mostrar solo advertencias y errores")
+    parser.add_argument('--dump-codes', action='store_true', help="Volcar las cadenas de códigos F8/F4/VCC/3OT")
+    parser.add_argument('--profile', action='store_true',
+                        help="Medir tiempo, CPU y memoria de cada etapa y mostrar el reporte por etapa")
+    parser.add_argument('--cache', nargs='?', const=CACHE_CONFIG['path'], default=None, metavar='ARCHIVO',
+                        help="Reutilizar resultados de máscaras ya analizadas (caché SQLite)")
+    parser.add_argument('--parquet', nargs='?', const=COLUMNAR_CONFIG['path'], default=None, metavar='ARCHIVO',
+                        help="Guardar también las métricas en Parquet (o .arrow/.feather) a medida que llegan")
+    parser.add_argument('--codes-dir', nargs='?', const=os.path.join("output", "codes"), default=None,
+                        metavar='DIRECTORIO',
+                        help="Guardar los códigos empaquetados (.chc) y referenciarlos desde el CSV")
+    parser.add_argument('--plots', nargs='?', const=os.path.join("output", "plots"), default=None,
+                        metavar='DIRECTORIO',
+                        help="Dibujar las figuras de cada caso (backend Agg, en procesos aparte)")
+    args = parser.parse_args()
+    
+    # Verbosidad de la ejecución (por defecto LOGGING_CONFIG)
+    verbosity = None
+    if args.quiet:
+        verbosity = 0
+    elif args.verbose:
+        verbosity = 2
+    configure_logging(verbosity=verbosity, dump_codes=args.dump_codes or None)
+    
+    logger.info("ANÁLISIS TOPOLÓGICO 2D - CÓDIGOS Y FÓRMULAS DE EULER")
+    logger.info("=" * 60)
+    logger.info("Fecha de ejecución: %s", datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+    logger.info("Directorio de trabajo: %s", os.getcwd())
+    logger.info("")
+    
+    start = time.perf_counter()
+    
+    if args.source:
+        # Analizar un directorio o patrón glob en paralelo
+        resultados = run_batch(args.source, args.output, workers=args.workers, chunksize=args.chunksize,
+                               profile=args.profile, cache_path=args.cache, plots_dir=args.plots,
+                               columnar_path=args.parquet, codes_dir=args.codes_dir)
+    else:
+        # Analizar imágenes de prueba
+        resultados = analyze_test_images(workers=args.workers, chunksize=args.chunksize,
+                                         profile=args.profile, plots_dir=args.plots,
+                                         columnar_path=args.parquet, codes_dir=args.codes_dir)
+    
+    # Contadores de la ejecución (imágenes/s, bytes de códigos)
+    summarize_run(resultados, time.perf_counter() - start)
 
 if __name__ == "__main__":
     # Configurar numpy para reproducibilidad
@@ -0,0 +1,58 @@
+import time
+
+import pytest
+
+from generator.batch_runner import analyze_case, iter_batch_results
+from generator.field_generator import generate_topology_case
+
+def _square(x):
+    return {'name': str(x), 'value': x * x}
+
+def _slow_first(x):
+    time.sleep(0.2 if x == 0 else 0.0)
+    return {'name': str(x)}
+
+def _fail(x):
+    raise ValueError(f"fallo {x}")
+
+@pytest.mark.parametrize("chunksize", [1, 3])
+def test_iter_batch_results_returns_every_item(chunksize):
+    results = list(iter_batch_results(_square, ((i,) for i in range(20)), workers=2, chunksize=chunksize))
+    assert sorted(r['value'] for r in results) == [i * i for i in range(20)]
+    assert all('wall_time' in r for r in results)
+
+def test_iter_batch_results_keeps_submission_order():
+    items = [(i,) for i in range(8)]
+    results = list(iter_batch_results(_slow_first, items, workers=2))
+    assert [r['name'] for r in results] == [str(i) for i in range(8)]
+
+def test_iter_batch_results_unordered_returns_every_item():
+    results = list(iter_batch_results(_slow_first, [(i,) for i in range(8)], workers=2, ordered=False))
+    assert sorted(int(r['name']) for r in results) == list(range(8))
+
+def test_iter_batch_results_consumes_items_lazily():
+    consumed = []
+
+    def items():
+        for i in range(100):
+            consumed.append(i)
+            yield (i,)
+
+    results = iter_batch_results(_square, items(), workers=1, chunksize=2)
+    next(results)
+    # Como mucho 2 * workers lotes en curso más el que se acaba de leer
+    assert len(consumed) <= 3 * 2
+    assert len(list(results)) == 99
+    assert len(consumed) == 100
+
+def test_iter_batch_results_reports_errors():
+    results = list(iter_batch_results(_fail, [(1,), (2,)], workers=2))
+    assert sorted(r['name'] for r in results) == ['1', '2']
+    assert all('fallo' in r['error'] for r in results)
+
+def test_analyze_case_matches_in_process():
+    image = generate_topology_case('blob_with_hole', size=(64, 64), seed=0)
+    [result] = iter_batch_results(analyze_case, [('blob_with_hole', image)], workers=1)
+    expected = analyze_case('blob_with_hole', image)
+    assert result['codes'] == expected['codes']
+    assert result['metrics']['beta1'] == expected['metrics']['beta1'] == 1
@@ -0,0 +1,110 @@
+import pickle
+
+import numpy as np
+import pytest
+from scipy.ndimage import binary_erosion
+
+from generator import binary_mask
+from generator.binary_mask import BinaryMask, popcount, shift_left, shift_right
+
+WIDTHS = [1, 5, 7, 8, 9, 13, 16, 17, 63, 65]
+
+def _random(shape, seed=0, density=0.5):
+    return np.random.default_rng(seed).random(shape) < density
+
+def _bits(packed, count):
+    """Bits de cada fila empaquetada, incluido el relleno hasta `count`"""
+    return np.unpackbits(packed, axis=-1, count=count).astype(bool)
+
+def _padding(packed, width):
+    return _bits(packed, packed.shape[-1] * 8)[..., width:]
+
+@pytest.mark.parametrize("width", WIDTHS)
+def test_round_trip(width):
+    image = _random((11, width), seed=width)
+    mask = BinaryMask.from_array(image)
+    assert mask.shape == (11, width)
+    assert mask.packed.shape == (11, -(-width // 8))
+    np.testing.assert_array_equal(mask.unpack(), image)
+    np.testing.assert_array_equal(mask.as_uint8(), image.astype(np.uint8))
+    np.testing.assert_array_equal(np.asarray(mask), image)
+    assert mask.area == image.sum()
+    assert not _padding(mask.packed, width).any()
+
+def test_from_array_threshold():
+    image = np.array([[0.0, 0.4, 0.6, 1.0], [3.0, 0.5, 0.51, -1.0]])
+    np.testing.assert_array_equal(BinaryMask.from_array(image).unpack(), image > 0.5)
+    np.testing.assert_array_equal(BinaryMask.from_array(image, threshold=0).unpack(), image > 0)
+    np.testing.assert_array_equal(BinaryMask.from_array(np.array([[0, 1, 2]], np.uint8)).unpack(),
+                                  [[False, True, True]])
+
+def test_shape_mismatch():
+    with pytest.raises(ValueError):
+        BinaryMask(np.zeros((4, 2), np.uint8), (4, 17))
+
+def test_pickle_drops_unpacked_copy():
+    mask = BinaryMask.from_array(_random((9, 13)))
+    mask.unpack()
+    restored = pickle.loads(pickle.dumps(mask))
+    assert restored._unpacked is None
+    np.testing.assert_array_equal(restored.unpack(), mask.unpack())
+
+@pytest.mark.parametrize("shape", [(5, 3), (40, 17)])
+def test_popcount(shape, monkeypatch):
+    packed = np.random.default_rng(1).integers(0, 256, shape, dtype=np.uint8)
+    bits = np.unpackbits(packed, axis=1)
+    expected = int(bits.sum())
+    assert popcount(packed) == expected
+    np.testing.assert_array_equal(popcount(packed, axis=1), bits.sum(axis=1))
+    # Tabla de bits para numpy sin np.bitwise_count
+    monkeypatch.delattr(binary_mask.np, 'bitwise_count', raising=False)
+    assert popcount(packed) == expected
+    np.testing.assert_array_equal(popcount(packed, axis=0), np.unpackbits(packed[:, :, None], axis=2).sum(axis=(0, 2)))
+
+@pytest.mark.parametrize("width", WIDTHS)
+def test_shift_right(width):
+    image = _random((6, width), seed=width)
+    packed = BinaryMask.from_array(image).packed
+    shifted = _bits(shift_right(packed), packed.shape[1] * 8)
+    assert not shifted[:, 0].any()
+    # El último píxel pasa al primer bit de relleno, o se pierde si la fila no tiene relleno
+    kept = min(width, shifted.shape[1] - 1)
+    np.testing.assert_array_equal(shifted[:, 1:kept + 1], image[:, :kept])
+    assert kept == (width - 1 if width % 8 == 0 else width)
+    assert not shifted[:, width + 1:].any()
+
+@pytest.mark.parametrize("width", WIDTHS)
+def test_shift_left(width):
+    image = _random((6, width), seed=width)
+    packed = BinaryMask.from_array(image).packed
+    shifted = _bits(shift_left(packed), packed.shape[1] * 8)
+    np.testing.assert_array_equal(shifted[:, :width - 1], image[:, 1:])
+    # Entra un cero por la derecha y el relleno sigue a cero
+    assert not shifted[:, width - 1:].any()
+
+def test_shifts_do_not_modify_input():
+    packed = BinaryMask.from_array(_random((4, 21))).packed
+    original = packed.copy()
+    shift_right(packed)
+    shift_left(packed)
+    np.testing.assert_array_equal(packed, original)
+
+@pytest.mark.parametrize("width", WIDTHS)
+def test_pairs(width):
+    image = _random((12, width), seed=width, density=0.7)
+    mask = BinaryMask.from_array(image)
+    assert mask.horizontal_pairs() == np.sum(image[:, 1:] & image[:, :-1])
+    assert mask.vertical_pairs() == np.sum(image[1:] & image[:-1])
+
+@pytest.mark.parametrize("width", WIDTHS)
+@pytest.mark.parametrize("density", [0.6, 1.0])
+def test_perimeter_matches_erosion(width, density):
+    image = _random((10, width), seed=width, density=density)
+    expected = np.sum(image & ~binary_erosion(image))
+    assert BinaryMask.from_array(image).perimeter() == expected
+
+@pytest.mark.parametrize("width", [9, 15, 16, 17])
+def test_perimeter_full_rows_touch_right_edge(width):
+    # Un bloque lleno: la última columna es borde aunque le siga relleno
+    image = np.ones((5, width), dtype=bool)
+    assert BinaryMask.from_array(image).perimeter() == 2 * width + 2 * 3
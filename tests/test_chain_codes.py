@@ -0,0 +1,88 @@
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+import pytest
+
+from generator.analysis_context import AnalysisContext
+from generator.batch_runner import analyze_case, iter_batch_results, run_batch
+from generator.chain_codes import ChainCode, CODE_KINDS, context_chain_codes, load_chain_codes, save_chain_codes
+from generator.field_generator import generate_topology_case
+from generator.image_reader import read_binary_image, preprocess_binary_image
+from generator.test_images import get_test_images
+from generator.topology_codes_extended import get_f8_code
+from generator.visualizer import save_metrics_to_csv
+
+NAMES = ['blob_with_three_holes', 'two_blobs_one_hole', 'irregular_clusters']
+
+def _image(name):
+    return generate_topology_case(name, size=(96, 96), seed=0).astype(np.uint8)
+
+def _assert_matches_context(codes, image):
+    ctx = AnalysisContext(image)
+    chains, indices = ctx.f8_contours
+    f8 = codes['f8']
+    assert str(f8) == get_f8_code(image)
+    assert f8.num_contours == len(chains) == len(indices)
+    for k, chain in enumerate(chains):
+        np.testing.assert_array_equal(f8[k], chain)
+    contours, _ = ctx.contours
+    np.testing.assert_array_equal(f8.starts, [contours[i][0, 0] for i in indices])
+    assert f8.parents is not None and len(f8.parents) == len(chains)
+    assert str(codes['vcc']) == ctx.vcc['code_string'] and str(codes['ot3']) == ctx.ot3['code_string']
+
+@pytest.mark.parametrize("name", NAMES)
+def test_binary_round_trip(name, tmp_path):
+    codes = context_chain_codes(_image(name))
+    path = str(tmp_path / 'codes.chc')
+    save_chain_codes(path, codes)
+    loaded = load_chain_codes(path)
+    assert loaded == codes
+    _assert_matches_context(loaded, _image(name))
+
+@pytest.mark.parametrize("name", list(get_test_images()))
+def test_test_images_round_trip(name):
+    image = get_test_images()[name].astype(np.uint8)
+    codes = context_chain_codes(image)
+    assert {kind: ChainCode.frombytes(code.tobytes()) for kind, code in codes.items()} == codes
+    _assert_matches_context(codes, image)
+
+def test_analyze_case_carries_contours_through_processes(tmp_path):
+    items = [(name, _image(name), False, True) for name in NAMES]
+    results = list(iter_batch_results(analyze_case, items, workers=2))
+    save_path = str(tmp_path / 'metricas.csv')
+    save_metrics_to_csv(results, save_path, codes_dir=str(tmp_path / 'codes'))
+
+    df = pd.read_csv(save_path).set_index('imagen')
+    for result in results:
+        name = result['name']
+        loaded = load_chain_codes(str(tmp_path / df.loc[name, 'archivo_codigos']))
+        assert set(loaded) == set(CODE_KINDS)
+        _assert_matches_context(loaded, _image(name))
+        assert df.loc[name, 'longitud_f8'] == len(result['codes']['f8'])
+
+@pytest.mark.parametrize("use_cache", [False, True])
+def test_run_batch_codes_dir(tmp_path, use_cache):
+    for name in NAMES:
+        plt.imsave(tmp_path / f'{name}.png', _image(name), cmap='gray')
+    out = tmp_path / 'out'
+    cache_path = str(tmp_path / 'cache.sqlite') if use_cache else None
+    runs = 2 if use_cache else 1
+    for _ in range(runs):
+        run_batch(str(tmp_path), str(out / 'metricas.csv'), workers=2, cache_path=cache_path,
+                  codes_dir=str(out / 'codes'))
+
+    for name in NAMES:
+        image = preprocess_binary_image(read_binary_image(str(tmp_path / f'{name}.png')))
+        _assert_matches_context(load_chain_codes(str(out / 'codes' / f'{name}.chc')), image)
+
+def test_analyze_test_images_serial_codes_dir(tmp_path, monkeypatch):
+    import main
+
+    monkeypatch.chdir(tmp_path)
+    images = {name: _image(name) for name in NAMES}
+    monkeypatch.setattr(main, 'get_test_images', lambda: images)
+    main.analyze_test_images(codes_dir=str(tmp_path / 'codes'))
+    for name, image in images.items():
+        _assert_matches_context(load_chain_codes(str(tmp_path / 'codes' / f'{name}.chc')), image)
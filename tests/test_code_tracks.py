@@ -0,0 +1,105 @@
+import matplotlib
+matplotlib.use('Agg')
+import numpy as np
+import pytest
+from matplotlib.figure import Figure
+
+from config.topology_config import VISUALIZATION_CONFIG
+from generator.visualizer import (PATTERN_MIN_CELL, CODE_SYMBOL_COLORS, code_to_array, code_histogram,
+                                  create_topology_pattern, plot_topology_codes, _draw_code_track)
+
+def _code(n, n_symbols, seed=0):
+    symbols = np.random.default_rng(seed).integers(0, n_symbols, n).astype(np.uint8)
+    return (symbols + ord('0')).tobytes().decode('ascii')
+
+def test_code_to_array_inputs():
+    expected = np.array([0, 1, 2, 3, 1], dtype=np.uint8)
+    np.testing.assert_array_equal(code_to_array('01231'), expected)
+    np.testing.assert_array_equal(code_to_array(expected), expected)
+    np.testing.assert_array_equal(code_to_array([expected[:2], expected[2:]]), expected)
+    assert code_to_array([]).size == 0
+
+@pytest.mark.parametrize("n, bins, start, stop", [
+    (10007, 512, 0, None),
+    (1000, 7, 0, None),
+    (5000, 64, 123, 4321),
+    (30, 512, 0, None),
+])
+def test_code_histogram_matches_direct_count(n, bins, start, stop):
+    code = _code(n, 4)
+    symbols = code_to_array(code)
+    stop_index = n if stop is None else stop
+    edges, counts = code_histogram(code, 4, bins, start, stop)
+
+    expected_bins = min(bins, stop_index - start)
+    assert edges.shape == (expected_bins + 1,)
+    assert counts.shape == (expected_bins, 4)
+    assert edges[0] == start and edges[-1] == stop_index
+    assert np.all(np.diff(edges) > 0)
+    for k in range(expected_bins):
+        window = symbols[edges[k]:edges[k + 1]]
+        np.testing.assert_array_equal(counts[k], np.bincount(window, minlength=4))
+    assert counts.sum() == stop_index - start
+
+def test_code_histogram_empty():
+    edges, counts = code_histogram('', 3, 16, start=5)
+    np.testing.assert_array_equal(edges, [5])
+    assert counts.shape == (0, 3)
+
+def test_pattern_draws_symbols_when_they_fit():
+    size = (64, 128)
+    code = _code(size[1] // PATTERN_MIN_CELL, 3)
+    pattern = create_topology_pattern(code, size)
+    assert set(np.unique(pattern)) <= {0, 1}
+    assert pattern.any()
+
+@pytest.mark.parametrize("n", [128 // PATTERN_MIN_CELL + 1, 100, 128, 200_000])
+def test_pattern_falls_back_to_histogram(n):
+    size = (64, 128)
+    code = _code(n, 3, seed=n)
+    pattern = create_topology_pattern(code, size)
+
+    assert pattern.shape == size
+    edges, counts = code_histogram(code, 3, size[1])
+    columns = counts.shape[0]
+    # Valor = símbolo + 1 en las columnas del histograma, cero a la derecha
+    assert pattern[:, :columns].min() >= 1 and pattern.max() <= 3
+    assert not pattern[:, columns:].any()
+    # Cada columna reparte sus filas en proporción a las cuentas de su ventana
+    for k in range(columns):
+        rows = np.bincount(pattern[:, k] - 1, minlength=3)
+        np.testing.assert_allclose(rows / size[0], counts[k] / counts[k].sum(), atol=1 / size[0] + 1e-9)
+
+def test_pattern_single_symbol_histogram():
+    pattern = create_topology_pattern('2' * 1000, (32, 64))
+    assert np.all(pattern == 3)
+
+def _axes():
+    return Figure().add_subplot()
+
+def test_code_track_long_code_is_one_image():
+    ax = _axes()
+    _draw_code_track(ax, _code(200_000, 4), 4, CODE_SYMBOL_COLORS)
+    assert len(ax.images) == 1 and len(ax.patches) == 0
+    height, width, _ = ax.images[0].get_array().shape
+    assert width == VISUALIZATION_CONFIG['code_max_bins']
+    assert ax.get_xlim() == pytest.approx((-0.5, 200_000 - 0.5))
+
+def test_code_track_short_window_is_full_resolution():
+    ax = _axes()
+    _draw_code_track(ax, _code(200_000, 4), 4, CODE_SYMBOL_COLORS, window=(1000, 1100))
+    assert len(ax.patches) == 100 and len(ax.images) == 0
+    np.testing.assert_array_equal(ax.get_xticks(), np.arange(1000, 1100))
+
+def test_code_track_long_window_keeps_positions():
+    ax = _axes()
+    _draw_code_track(ax, _code(200_000, 4), 4, CODE_SYMBOL_COLORS, window=(50_000, 150_000))
+    assert len(ax.images) == 1
+    assert ax.get_xlim() == pytest.approx((50_000 - 0.5, 150_000 - 0.5))
+
+@pytest.mark.parametrize("window", [None, (1000, 1100), (0, 100_000)])
+def test_plot_topology_codes_200k_symbols(tmp_path, window):
+    codes = {'vcc': _code(200_000, 4), 'ot3': _code(200_000, 3, seed=1)}
+    path = tmp_path / 'codes.png'
+    plot_topology_codes(codes, str(path), 'largo', window=window, dpi=50)
+    assert path.stat().st_size > 0
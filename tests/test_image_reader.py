@@ -0,0 +1,95 @@
+import numpy as np
+import pytest
+from PIL import Image
+
+from generator import image_reader
+from generator.image_reader import (read_binary_image, read_binary_image_chunked, iter_binary_chunks,
+                                    _to_gray)
+
+tifffile = pytest.importorskip('tifffile')
+
+def _rgb_image(shape, seed=0):
+    """Imagen RGB con franjas de material y ruido en los tres canales"""
+    rng = np.random.default_rng(seed)
+    image = rng.integers(0, 256, size=shape + (3,), dtype=np.uint8)
+    image[::5] = 255
+    image[:, ::7] = 0
+    return image
+
+def test_to_gray_matches_pil():
+    rgb = _rgb_image((64, 48))
+    expected = np.asarray(Image.fromarray(rgb).convert('L'))
+    np.testing.assert_array_equal(_to_gray(rgb), expected)
+    np.testing.assert_array_equal(_to_gray(np.dstack([rgb, np.full((64, 48), 9, np.uint8)])), expected)
+
+@pytest.mark.parametrize("layout", [{'rowsperstrip': 7}, {'rowsperstrip': 1}, {'tile': (16, 16)}])
+@pytest.mark.parametrize("rgb", [True, False])
+def test_tiff_bands_match_whole_image(tmp_path, layout, rgb):
+    image = _rgb_image((45, 37))
+    if not rgb:
+        image = image[..., 0]
+    path = str(tmp_path / 'mask.tif')
+    tifffile.imwrite(path, image, photometric='rgb' if rgb else 'minisblack', **layout)
+
+    expected = read_binary_image(path).astype(bool)
+    np.testing.assert_array_equal(read_binary_image_chunked(path), expected)
+
+    chunks = list(iter_binary_chunks(path))
+    if 'rowsperstrip' in layout:
+        assert len(chunks) == -(-image.shape[0] // layout['rowsperstrip'])
+    assert [r0 for r0, _ in chunks] == sorted(r0 for r0, _ in chunks)
+    np.testing.assert_array_equal(np.concatenate([c for _, c in chunks]), expected)
+
+    packed = read_binary_image_chunked(path, packed=True)
+    np.testing.assert_array_equal(np.unpackbits(packed, axis=1, count=image.shape[1]).astype(bool), expected)
+
+def test_tiff_multipage(tmp_path):
+    pages = [_rgb_image((20, 30), seed)[..., 0] for seed in range(3)]
+    path = str(tmp_path / 'stack.tif')
+    with tifffile.TiffWriter(path) as tif:
+        for page in pages:
+            tif.write(page, rowsperstrip=4)
+    for i, page in enumerate(pages):
+        np.testing.assert_array_equal(read_binary_image_chunked(path, page=i), page > 127)
+
+def test_tiff_without_tifffile(tmp_path, monkeypatch):
+    image = _rgb_image((33, 21))
+    path = str(tmp_path / 'mask.tif')
+    tifffile.imwrite(path, image, photometric='rgb', rowsperstrip=5)
+    expected = read_binary_image_chunked(path)
+    monkeypatch.setattr(image_reader, 'tifffile', None)
+    np.testing.assert_array_equal(read_binary_image_chunked(path, chunk_rows=8), expected)
+
+def _drop_segments(path, missing):
+    """Vacía (offset y tamaño 0) las teselas o tiras `missing` de la primera página"""
+    with tifffile.TiffFile(path, mode='r+b') as tif:
+        page = tif.pages[0]
+        names = ('TileOffsets', 'TileByteCounts') if page.is_tiled else ('StripOffsets', 'StripByteCounts')
+        for name in names:
+            values = list(page.tags[name].value)
+            for i in missing:
+                values[i] = 0
+            page.tags[name].overwrite(values)
+
+@pytest.mark.parametrize("layout, missing", [
+    ({'tile': (16, 16)}, [1]),
+    ({'tile': (16, 16)}, [0, 3, 4, 5, 8]),   # incluye una fila de teselas entera
+    ({'rowsperstrip': 7}, [0, 3]),
+])
+@pytest.mark.parametrize("rgb", [True, False])
+def test_tiff_missing_segments_are_filled(tmp_path, layout, missing, rgb):
+    image = _rgb_image((45, 37))
+    if not rgb:
+        image = image[..., 0]
+    path = str(tmp_path / 'sparse.tif')
+    tifffile.imwrite(path, image, photometric='rgb' if rgb else 'minisblack', **layout)
+    _drop_segments(path, missing)
+
+    expected = _to_gray(tifffile.imread(path)) > 127
+    # Las zonas vacías se rellenan con 0 (nodata): nada de material en ellas
+    assert expected.sum() < (_to_gray(image) > 127).sum()
+    for chunk_rows in (5, 64):
+        np.testing.assert_array_equal(read_binary_image_chunked(path, chunk_rows=chunk_rows), expected)
+    chunks = list(iter_binary_chunks(path))
+    assert [r0 for r0, _ in chunks] == sorted(r0 for r0, _ in chunks)
+    np.testing.assert_array_equal(np.concatenate([c for _, c in chunks]), expected)
@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+
+from generator.field_generator import generate_topology_case
+from generator.topology_metrics import validate_euler_formulas
+from generator.incremental_topology import IncrementalTopology
+
+def _check_against_validate(topology):
+    """β₀/β₁ de validate_euler_formulas coinciden salvo por la inversión en [0, 0] y los poros en diagonal"""
+    expected = validate_euler_formulas(topology.image.astype(np.uint8))
+    if not topology.image[0, 0] and expected['is_consistent']:
+        assert (topology.beta0, topology.beta1) == (expected['beta0'], expected['beta1'])
+
+@pytest.mark.parametrize("shape,density,seed", [
+    ((1, 12), 0.5, 0),
+    ((12, 1), 0.5, 1),
+    ((9, 11), 0.3, 2),
+    ((16, 16), 0.5, 3),
+    ((20, 14), 0.7, 4),
+])
+def test_random_flips(shape, density, seed):
+    rng = np.random.default_rng(seed)
+    topology = IncrementalTopology(rng.random(shape) < density)
+    assert topology.verify() == {}
+
+    for _ in range(300):
+        topology.flip(rng.integers(shape[0]), rng.integers(shape[1]))
+        assert topology.verify() == {}
+        _check_against_validate(topology)
+
+def test_random_set_pixel_on_generated_case():
+    rng = np.random.default_rng(5)
+    image = generate_topology_case('blob_with_three_holes', size=(96, 96), seed=0)
+    topology = IncrementalTopology(image)
+    assert topology.verify() == {}
+    _check_against_validate(topology)
+
+    for _ in range(200):
+        i, j = rng.integers(96, size=2)
+        topology.set_pixel(i, j, rng.random() < 0.5)
+        assert topology.verify() == {}
+
+def test_verify_reports_mismatch():
+    topology = IncrementalTopology(np.zeros((5, 5)))
+    topology.flip(2, 2)
+    topology.beta0 += 1
+    mismatches = topology.verify()
+    assert mismatches == {'beta0': (2, 1), 'beta1': (1, 0)}
+
+def test_diagonal_pores_are_separate_holes():
+    # Dos poros que solo se tocan en diagonal: dos agujeros del complejo de
+    # píxeles, uno para compute_betti_numbers_2d (conectividad-8)
+    image = np.ones((4, 4), dtype=bool)
+    image[1, 1] = image[2, 2] = False
+    image = np.pad(image, 1)
+    topology = IncrementalTopology(image)
+    assert topology.verify() == {}
+    assert topology.beta1 == 2
+    assert validate_euler_formulas(image.astype(np.uint8))['beta1'] == 1
+
+def test_out_of_bounds():
+    with pytest.raises(IndexError):
+        IncrementalTopology(np.zeros((3, 3))).set_pixel(3, 0, 1)
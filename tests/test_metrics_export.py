@@ -0,0 +1,85 @@
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+import pytest
+
+from generator.batch_runner import analyze_case, run_batch
+from generator.field_generator import generate_topology_case
+from generator.topology_result import TopologyResult
+from generator.visualizer import metrics_record, save_metrics_to_csv, MetricsCSVWriter
+from generator.chain_codes import load_chain_codes
+
+NAMES = ['single_blob', 'blob_with_hole', 'two_blobs_one_hole']
+
+def _image(name):
+    return generate_topology_case(name, size=(64, 64), seed=0).astype(np.uint8)
+
+def _topology_result(name):
+    result = TopologyResult(_image(name))
+    result['name'] = name
+    return result
+
+def test_metrics_record_topology_result():
+    result = _topology_result('blob_with_hole')
+    record = metrics_record(result)
+    assert record['pixeles'] == _image('blob_with_hole').sum()
+    assert record == metrics_record(analyze_case('blob_with_hole', _image('blob_with_hole')))
+
+def test_save_metrics_to_csv_topology_result(tmp_path):
+    save_path = str(tmp_path / 'metricas.csv')
+    save_metrics_to_csv([_topology_result(n) for n in NAMES], save_path, codes_dir=str(tmp_path / 'codes'))
+    df = pd.read_csv(save_path)
+    assert list(df['imagen']) == NAMES
+    for name, row in zip(NAMES, df.itertuples()):
+        codes = load_chain_codes(str(tmp_path / row.archivo_codigos))
+        assert len(codes['f8']) == row.longitud_f8 == len(analyze_case(name, _image(name))['codes']['f8'])
+
+def test_csv_writer_matches_save_metrics_to_csv(tmp_path):
+    cases = [analyze_case(n, _image(n)) for n in NAMES]
+    save_metrics_to_csv(cases, str(tmp_path / 'a.csv'))
+    with MetricsCSVWriter(str(tmp_path / 'b.csv')) as writer:
+        for case in cases:
+            writer.write(case)
+    assert writer.rows_written == len(NAMES)
+    assert (tmp_path / 'a.csv').read_text(encoding='utf-8') == (tmp_path / 'b.csv').read_text(encoding='utf-8')
+
+def test_csv_writer_replaces_existing_file(tmp_path):
+    path = tmp_path / 'm.csv'
+    path.write_text("antiguo\n")
+    with MetricsCSVWriter(str(path)) as writer:
+        writer.write(analyze_case('single_blob', _image('single_blob')))
+    assert len(pd.read_csv(path)) == 1
+
+def test_columnar_writer_topology_result(tmp_path):
+    pytest.importorskip('pyarrow')
+    from generator.columnar_export import MetricsWriter, read_metrics_columnar
+
+    path = str(tmp_path / 'metricas.parquet')
+    with MetricsWriter(path, row_group_size=2) as writer:
+        for name in NAMES:
+            writer.write(_topology_result(name))
+    df = read_metrics_columnar(path, decode_codes=True)
+    assert list(df['imagen']) == NAMES
+    for name, code in zip(NAMES, df['codigo_f8']):
+        assert code == analyze_case(name, _image(name))['codes']['f8']
+
+def test_run_batch_keeps_summaries_with_columnar_writer(tmp_path):
+    pytest.importorskip('pyarrow')
+    from generator.columnar_export import read_metrics_columnar
+
+    for name in NAMES:
+        plt.imsave(tmp_path / f'{name}.png', _image(name), cmap='gray')
+    save_path = str(tmp_path / 'out' / 'metricas.csv')
+    results = run_batch(str(tmp_path), save_path, workers=2,
+                        columnar_path=str(tmp_path / 'out' / 'metricas.parquet'))
+
+    # Filas y resultados en el orden de las rutas, sea cual sea el orden de finalización
+    assert [r['name'] for r in results] == sorted(NAMES)
+    for result in results:
+        assert 'codes' not in result and 'connectivity' not in result
+        assert set(result['code_lengths']) == {'f8', 'f4', 'vcc', 'ot3'}
+        assert all(np.isscalar(v) for v in result['metrics'].values())
+    assert list(pd.read_csv(save_path)['imagen']) == sorted(NAMES)
+    assert list(read_metrics_columnar(str(tmp_path / 'out' / 'metricas.parquet'))['imagen']) == sorted(NAMES)
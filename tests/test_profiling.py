@@ -0,0 +1,130 @@
+import tracemalloc
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import numpy as np
+import pytest
+
+from generator.batch_runner import analyze_case, analyze_image_file
+from generator.field_generator import generate_topology_case
+from generator.profiling import StageProfiler, aggregate_timings, format_timings_report
+from generator.visualizer import metrics_record
+
+ANALYSIS_STAGES = ['betti', 'f8', 'f4', 'vcc', '3ot', 'metrics', 'connectivity', 'equalities']
+
+def _image():
+    return generate_topology_case('blob_with_hole', size=(64, 64), seed=0).astype(np.uint8)
+
+def _check_timing(t):
+    assert set(t) == {'wall_s', 'cpu_s', 'peak_bytes'}
+    assert isinstance(t['wall_s'], float) and t['wall_s'] >= 0
+    assert isinstance(t['cpu_s'], float) and t['cpu_s'] >= 0
+    assert t['peak_bytes'] >= 0
+
+def test_analyze_case_profile_timings():
+    result = analyze_case('blob_with_hole', _image(), profile=True)
+    assert list(result['timings']) == ANALYSIS_STAGES
+    for t in result['timings'].values():
+        _check_timing(t)
+    assert not tracemalloc.is_tracing()
+
+def test_analyze_case_profile_chain_codes_stage():
+    result = analyze_case('blob_with_hole', _image(), profile=True, chain_codes=True)
+    assert list(result['timings']) == ANALYSIS_STAGES + ['chain_codes']
+
+def test_analyze_case_without_profile():
+    result = analyze_case('blob_with_hole', _image())
+    assert 'timings' not in result
+    assert not any(key.startswith(('t_', 'cpu_', 'mem_')) for key in metrics_record(result))
+
+def test_analyze_image_file_profile_stages(tmp_path):
+    path = str(tmp_path / 'blob_with_hole.png')
+    plt.imsave(path, _image(), cmap='gray')
+    result = analyze_image_file(path, profile=True)
+    assert list(result['timings'])[:3] == ['read', 'validate', 'preprocess']
+    assert set(ANALYSIS_STAGES) <= set(result['timings'])
+
+def test_metrics_record_timing_columns():
+    result = analyze_case('blob_with_hole', _image(), profile=True)
+    record = metrics_record(result)
+    for stage, t in result['timings'].items():
+        assert record[f't_{stage}_s'] == t['wall_s']
+        assert record[f'cpu_{stage}_s'] == t['cpu_s']
+        assert record[f'mem_{stage}_bytes'] == t['peak_bytes']
+    timing_columns = [key for key in record if key.startswith(('t_', 'cpu_', 'mem_'))]
+    assert len(timing_columns) == 3 * len(result['timings'])
+
+def test_stage_profiler_measures_peak_memory():
+    profiler = StageProfiler()
+    with profiler.stage('alloc'):
+        block = np.ones(4 * 2**20, dtype=np.uint8)
+        del block
+    timings = profiler.close()
+    assert timings['alloc']['peak_bytes'] >= 4 * 2**20
+    assert not tracemalloc.is_tracing()
+
+def test_stage_profiler_accumulates_repeated_stages():
+    profiler = StageProfiler()
+    for _ in range(3):
+        with profiler.stage('repeat'):
+            sum(range(10000))
+    first = dict(profiler.timings['repeat'])
+    with profiler.stage('repeat'):
+        sum(range(10000))
+    profiler.close()
+    assert profiler.timings['repeat']['wall_s'] > first['wall_s']
+    assert profiler.timings['repeat']['cpu_s'] >= first['cpu_s']
+
+def test_stage_profiler_records_failed_stage():
+    profiler = StageProfiler()
+    with pytest.raises(ValueError):
+        with profiler.stage('fails'):
+            raise ValueError('fallo')
+    profiler.close()
+    _check_timing(profiler.timings['fails'])
+
+def test_stage_profiler_disabled():
+    profiler = StageProfiler(enabled=False)
+    with profiler.stage('nothing'):
+        pass
+    assert profiler.close() == {}
+    assert not tracemalloc.is_tracing()
+
+def test_stage_profiler_leaves_existing_tracing():
+    tracemalloc.start()
+    try:
+        profiler = StageProfiler()
+        with profiler.stage('a'):
+            pass
+        profiler.close()
+        assert tracemalloc.is_tracing()
+    finally:
+        tracemalloc.stop()
+
+RESULTS = [
+    {'timings': {'read': {'wall_s': 1.0, 'cpu_s': 0.5, 'peak_bytes': 100},
+                 'betti': {'wall_s': 3.0, 'cpu_s': 2.0, 'peak_bytes': 10}}},
+    {'timings': {'read': {'wall_s': 2.0, 'cpu_s': 1.5, 'peak_bytes': 50}}},
+    {'name': 'sin perfil'},
+]
+
+def test_aggregate_timings():
+    totals = aggregate_timings(RESULTS)
+    assert list(totals) == ['read', 'betti']
+    assert totals['read'] == {'wall_s': 3.0, 'cpu_s': 2.0, 'peak_bytes': 100, 'images': 2}
+    assert totals['betti'] == {'wall_s': 3.0, 'cpu_s': 2.0, 'peak_bytes': 10, 'images': 1}
+
+def test_format_timings_report():
+    report = format_timings_report(RESULTS, width=10)
+    lines = report.splitlines()
+    assert lines[0].split()[0] == 'Etapa'
+    rows = [line.split()[0] for line in lines[2:-2]]
+    assert sorted(rows) == ['betti', 'read']
+    assert lines[-1].split()[:3] == ['Total', '6.0000', '4.0000']
+    # La etapa más lenta tiene la barra completa
+    assert '█' * 10 in report
+
+def test_format_timings_report_empty():
+    assert format_timings_report([{'name': 'a'}]) == ''
+    assert aggregate_timings([]) == {}
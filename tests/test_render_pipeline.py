@@ -0,0 +1,76 @@
+import os
+
+import matplotlib
+matplotlib.use('Agg')
+import numpy as np
+import pytest
+from PIL import Image
+
+from generator.batch_runner import analyze_case
+from generator.field_generator import generate_topology_case
+from generator.render_pipeline import RenderPipeline, render_case, render_job, render_comparison
+
+NAMES = ['single_blob', 'blob_with_hole']
+
+def _case(name):
+    image = generate_topology_case(name, size=(48, 48), seed=0).astype(np.uint8)
+    case = analyze_case(name, image)
+    case['field'] = image
+    return case
+
+def _crash(*args):
+    # Termina el proceso trabajador sin devolver nada: el pool queda roto
+    os._exit(1)
+
+def _expected(output_dir, names):
+    return {os.path.join(output_dir, f'{figure}_{name}.png')
+            for name in names for figure in ('analysis', 'patterns', 'codes')}
+
+@pytest.mark.parametrize("workers", [0, 2])
+def test_pipeline_writes_every_figure(tmp_path, workers):
+    output_dir = str(tmp_path / 'plots')
+    with RenderPipeline(output_dir, workers=workers) as pipeline:
+        for name in NAMES:
+            pipeline.submit(_case(name))
+    assert pipeline.errors == []
+    assert set(pipeline.paths) == _expected(output_dir, NAMES)
+    assert all(os.path.getsize(path) > 0 for path in pipeline.paths)
+
+@pytest.mark.parametrize("workers", [0, 2])
+def test_failing_job_is_reported(tmp_path, workers):
+    output_dir = str(tmp_path / 'plots')
+    pipeline = RenderPipeline(output_dir, workers=workers)
+    bad = _case('single_blob')
+    bad['name'] = 'bad'
+    bad['metrics'] = {}
+    pipeline.submit(bad)
+    pipeline.submit(_case('blob_with_hole'))
+    paths = pipeline.close()
+
+    assert [name for name, _ in pipeline.errors] == ['bad']
+    assert set(paths) == _expected(output_dir, ['blob_with_hole'])
+
+def test_broken_pool_does_not_block_close(tmp_path):
+    pipeline = RenderPipeline(str(tmp_path / 'plots'), workers=1)
+    pipeline._queue.put(('crash', _crash, ()))
+    # Más trabajos que el tamaño de la cola: submit() se bloquearía si el
+    # despachador hubiera muerto
+    for i in range(20):
+        case = _case('single_blob')
+        case['name'] = f'caso_{i}'
+        pipeline.submit(case)
+    pipeline.close()
+
+    failed = [name for name, _ in pipeline.errors]
+    assert 'crash' in failed
+    assert len(failed) + len(pipeline.paths) // 3 == 21
+
+def test_figures_use_pipeline_dpi(tmp_path):
+    case = _case('blob_with_hole')
+    paths = render_case(render_job(case, str(tmp_path), figures=('codes',), dpi=50))
+    assert Image.open(paths[0]).size == (15 * 50, 10 * 50)
+
+    [path] = render_comparison([case], str(tmp_path / 'comparison.png'), dpi=50)
+    # create_comparison_plot guarda con bbox_inches='tight': como mucho 15x12 pulgadas
+    width, height = Image.open(path).size
+    assert width <= 15 * 50 + 100 and height <= 12 * 50 + 100
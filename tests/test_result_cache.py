@@ -0,0 +1,143 @@
+import itertools
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import numpy as np
+import pytest
+
+from generator import result_cache
+from generator.batch_runner import run_batch
+from generator.field_generator import generate_topology_case
+from generator.image_reader import PREPROCESS_SETTINGS
+from generator.result_cache import ResultCache, mask_key, open_cache
+
+NAMES = ['single_blob', 'blob_with_hole', 'two_blobs_one_hole']
+
+def _image(name):
+    return generate_topology_case(name, size=(64, 64), seed=0).astype(np.uint8)
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Reloj que avanza un segundo por llamada: el orden LRU no depende de la resolución de time.time"""
+    ticks = itertools.count(1)
+    monkeypatch.setattr(result_cache.time, 'time', lambda: float(next(ticks)))
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = ResultCache(str(tmp_path / 'cache.sqlite'), max_bytes=2500)
+    yield cache
+    cache.close()
+
+def _keys(cache):
+    return {key for key, in cache._conn.execute("SELECT key FROM entries")}
+
+def test_mask_key_is_stable():
+    image = _image('blob_with_hole')
+    assert mask_key(image, 127) == mask_key(image.copy(), 127)
+    assert mask_key(image, 127) == mask_key(image.astype(bool), 127)
+
+def test_mask_key_changes_with_inputs(monkeypatch):
+    image = _image('blob_with_hole')
+    key = mask_key(image, 127)
+    flipped = image.copy()
+    flipped[0, 0] ^= 1
+
+    assert mask_key(flipped, 127) != key
+    assert mask_key(image, 128) != key
+    assert mask_key(image.reshape(32, 128), 127) != key
+
+    assert mask_key(image, 127, preprocess={**PREPROCESS_SETTINGS, 'kernel': (5, 5)}) != key
+    assert mask_key(image, 127, preprocess={**PREPROCESS_SETTINGS, 'operations': ('close', 'open')}) != key
+    monkeypatch.setitem(PREPROCESS_SETTINGS, 'kernel', (5, 5))
+    assert mask_key(image, 127) != key
+    monkeypatch.undo()
+    assert mask_key(image, 127) == key
+
+    monkeypatch.setattr(result_cache, 'CACHE_VERSION', result_cache.CACHE_VERSION + 1)
+    assert mask_key(image, 127) != key
+
+def test_get_put_and_stats(cache):
+    assert cache.get('a') is None
+    cache.put('a', {'value': 1})
+    assert cache.get('a') == {'value': 1}
+    assert cache.get('a') == {'value': 1}
+
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['evictions'], stats['entries']) == (2, 1, 0, 1)
+    assert stats['hit_rate'] == pytest.approx(2 / 3)
+    assert stats['bytes'] > 0
+
+def test_stats_empty_cache(cache):
+    assert cache.stats() == {'hits': 0, 'misses': 0, 'hit_rate': 0.0, 'evictions': 0, 'entries': 0, 'bytes': 0}
+
+def test_clear_removes_entries_and_keeps_counters(cache):
+    cache.put('a', 1)
+    cache.put('b', 2)
+    cache.get('a')
+    cache.clear()
+
+    stats = cache.stats()
+    assert (stats['entries'], stats['bytes']) == (0, 0)
+    assert stats['hits'] == 1
+    assert cache.get('a') is None
+
+def test_evict_drops_least_recently_read(cache, clock):
+    payload = b'x' * 1000
+    cache.put('a', payload)
+    cache.put('b', payload)
+    # Leer 'a' la hace más reciente que 'b'
+    assert cache.get('a') == payload
+    cache.put('c', payload)
+
+    assert _keys(cache) == {'a', 'c'}
+    stats = cache.stats()
+    assert stats['evictions'] == 1
+    assert stats['bytes'] <= cache.max_bytes
+
+def test_evict_stays_under_max_bytes(cache, clock):
+    for i in range(20):
+        cache.put(f'k{i}', b'x' * (100 * (i % 7) + 50))
+        assert cache.stats()['bytes'] <= cache.max_bytes
+    # Las entradas restantes son las últimas escritas
+    assert 'k19' in _keys(cache)
+    assert 'k0' not in _keys(cache)
+
+def test_put_skips_values_larger_than_max_bytes(cache):
+    cache.put('big', b'x' * 5000)
+    assert cache.get('big') is None
+    assert cache.stats()['entries'] == 0
+
+def test_cache_persists_between_connections(tmp_path):
+    path = str(tmp_path / 'cache.sqlite')
+    first = ResultCache(path)
+    first.put('a', [1, 2, 3])
+    first.close()
+
+    second = ResultCache(path)
+    assert second.get('a') == [1, 2, 3]
+    second.close()
+
+def test_open_cache_reuses_connection(tmp_path):
+    path = str(tmp_path / 'cache.sqlite')
+    assert open_cache(path) is open_cache(path)
+
+def test_run_batch_second_run_hits_cache(tmp_path):
+    for name in NAMES:
+        plt.imsave(tmp_path / f'{name}.png', _image(name), cmap='gray')
+    cache_path = str(tmp_path / 'cache.sqlite')
+
+    first_csv = str(tmp_path / 'first.csv')
+    first = run_batch(str(tmp_path), first_csv, workers=2, cache_path=cache_path)
+    assert [r['cache_hit'] for r in first] == [False] * len(NAMES)
+
+    second_csv = str(tmp_path / 'second.csv')
+    second = run_batch(str(tmp_path), second_csv, workers=2, cache_path=cache_path)
+    assert [r['cache_hit'] for r in second] == [True] * len(NAMES)
+
+    for a, b in zip(first, second):
+        assert a['codes'] == b['codes']
+        assert a['metrics']['beta0'] == b['metrics']['beta0']
+        assert a['metrics']['beta1'] == b['metrics']['beta1']
+    with open(first_csv) as f, open(second_csv) as g:
+        assert f.read() == g.read()
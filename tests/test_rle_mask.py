@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+
+from generator.field_generator import generate_topology_case
+from generator.topology_base import compute_betti_numbers_2d
+from generator.topology_metrics import count_vertices_edges_faces_corrected, compute_perimeter
+from generator.rle_mask import (RLEMask, rle_vertices_edges_faces, rle_perimeter, rle_betti_numbers,
+                                rle_metrics, read_rle_image)
+
+def _random_mask(shape, density, seed):
+    return np.random.default_rng(seed).random(shape) < density
+
+IMAGES = {
+    'empty': np.zeros((12, 15), dtype=bool),
+    'full': np.ones((6, 9), dtype=bool),
+    'single_row': _random_mask((1, 50), 0.5, 0),
+    'single_column': _random_mask((50, 1), 0.5, 1),
+    'single_pixel': np.ones((1, 1), dtype=bool),
+    'noise': _random_mask((41, 37), 0.5, 2),
+    'dense_noise': _random_mask((30, 30), 0.8, 3),
+    'two_blobs_one_hole': generate_topology_case('two_blobs_one_hole', size=(72, 64), seed=0) > 0.5,
+    'irregular_mesh': generate_topology_case('irregular_mesh', size=(80, 80), seed=0) > 0.5,
+    'corner_ring': np.pad(np.pad(np.zeros((3, 3), dtype=bool), 2, constant_values=True), ((0, 4), (0, 4))),
+}
+
+@pytest.fixture(params=list(IMAGES), ids=list(IMAGES))
+def image(request):
+    return IMAGES[request.param]
+
+def test_round_trip(image):
+    rle = RLEMask.from_array(image)
+    np.testing.assert_array_equal(rle.to_array(), image)
+    assert rle.area == image.sum()
+
+def test_complement(image):
+    np.testing.assert_array_equal(RLEMask.from_array(image).complement().to_array(), ~image)
+
+def test_vertices_edges_faces(image):
+    expected = tuple(int(x) for x in count_vertices_edges_faces_corrected(image.astype(np.uint8)))
+    assert rle_vertices_edges_faces(RLEMask.from_array(image)) == expected
+
+def test_perimeter(image):
+    assert rle_perimeter(RLEMask.from_array(image)) == compute_perimeter(image.astype(np.uint8))
+
+def test_betti_numbers(image):
+    assert rle_betti_numbers(RLEMask.from_array(image)) == tuple(compute_betti_numbers_2d(image.astype(np.uint8)))
+
+def test_metrics_consistent(image):
+    metrics = rle_metrics(RLEMask.from_array(image))
+    assert metrics['euler_vef'] == metrics['vertices'] - metrics['edges'] + metrics['faces']
+    assert metrics['area_fraction'] == pytest.approx(image.mean())
+
+@pytest.mark.parametrize("chunk_rows", [1, 4, 1000])
+def test_from_chunks_and_read(image, chunk_rows, tmp_path):
+    chunks = ((r0, image[r0:r0 + chunk_rows]) for r0 in range(0, image.shape[0], chunk_rows))
+    expected = RLEMask.from_array(image)
+    rle = RLEMask.from_chunks(chunks, image.shape)
+    np.testing.assert_array_equal(rle.to_array(), image)
+
+    path = tmp_path / 'mask.npy'
+    np.save(path, image.astype(np.uint8))
+    rle = read_rle_image(str(path), threshold=0, chunk_rows=chunk_rows)
+    assert rle.shape == image.shape
+    np.testing.assert_array_equal(rle.starts, expected.starts)
+    np.testing.assert_array_equal(rle.ends, expected.ends)
+    np.testing.assert_array_equal(rle.rows, expected.rows)
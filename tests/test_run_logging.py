@@ -0,0 +1,33 @@
+import io
+import logging
+
+from generator.run_logging import configure_logging, log_codes
+
+def test_configure_logging_keeps_root_handlers():
+    root = logging.getLogger()
+    marker = logging.NullHandler()
+    root.addHandler(marker)
+    try:
+        stream = io.StringIO()
+        configure_logging(verbosity=1, stream=stream)
+        configure_logging(verbosity=1, stream=stream)
+        assert marker in root.handlers
+        logging.getLogger('generator.batch_runner').info("progreso %d", 1)
+        logging.getLogger('generator.batch_runner').debug("detalle")
+        # Reconfigurar no duplica los mensajes
+        assert stream.getvalue() == "progreso 1\n"
+    finally:
+        root.removeHandler(marker)
+
+def test_configure_logging_levels_and_codes():
+    stream = io.StringIO()
+    configure_logging(verbosity=2, dump_codes=False, stream=stream)
+    logging.getLogger('main').debug("detalle %s", "x")
+    log_codes("F8", "0123")
+    assert stream.getvalue() == "detalle x\n"
+
+    stream = io.StringIO()
+    configure_logging(verbosity=0, dump_codes=True, stream=stream)
+    logging.getLogger('main').info("oculto")
+    log_codes("F8", "0123")
+    assert stream.getvalue() == "F8: 0123\n"
@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+
+from generator.field_generator import generate_topology_case
+from generator.topology_base import compute_betti_numbers_2d
+from generator.topology_metrics import count_vertices_edges_faces_corrected
+from generator.stack_topology import analyze_stack, stack_vertices_edges_faces, STACK_COLUMNS
+
+def _random_stack(shape, seed):
+    rng = np.random.default_rng(seed)
+    return rng.random(shape) < rng.uniform(0.1, 0.9, size=(shape[0], 1, 1))
+
+def _generated_stack():
+    names = ['single_blob', 'blob_with_hole', 'two_blobs_one_hole', 'irregular_mesh', 'spiral_holes']
+    return np.stack([generate_topology_case(n, size=(48, 56), seed=0) > 0.5 for n in names])
+
+STACKS = {
+    'empty': np.zeros((3, 10, 12), dtype=bool),
+    'full': np.ones((2, 5, 7), dtype=bool),
+    'single_row': _random_stack((4, 1, 33), 0),
+    'single_column': _random_stack((4, 33, 1), 1),
+    'odd_width': _random_stack((9, 13, 19), 2),
+    'generated': _generated_stack(),
+}
+
+def _reference(stack):
+    rows = []
+    for image in stack.astype(np.uint8):
+        V, E, F = count_vertices_edges_faces_corrected(image)
+        beta0, beta1 = compute_betti_numbers_2d(image)
+        rows.append((V, E, F, V - E + F, beta0, beta1, beta0 - beta1))
+    return np.array(rows, dtype=np.int64).reshape(-1, 7)
+
+@pytest.mark.parametrize("name", list(STACKS))
+def test_stack_vertices_edges_faces(name):
+    stack = STACKS[name]
+    V, E, F = stack_vertices_edges_faces(stack)
+    np.testing.assert_array_equal(np.stack([V, E, F], axis=1), _reference(stack)[:, :3])
+
+@pytest.mark.parametrize("name", list(STACKS))
+@pytest.mark.parametrize("batch_size,workers,use_processes", [
+    (64, None, True),
+    (2, None, True),
+    (1, 2, False),
+    (2, 2, True),
+])
+def test_analyze_stack(name, batch_size, workers, use_processes):
+    stack = STACKS[name]
+    df = analyze_stack(stack, batch_size=batch_size, workers=workers, use_processes=use_processes)
+    assert list(df.columns) == STACK_COLUMNS
+    np.testing.assert_array_equal(df['slice'], np.arange(len(stack)))
+    columns = ['vertices', 'edges', 'faces', 'euler_vef', 'beta0', 'beta1', 'euler_poincare']
+    np.testing.assert_array_equal(df[columns].to_numpy(), _reference(stack))
+    np.testing.assert_allclose(df['area_fraction'], stack.mean(axis=(1, 2)))
+
+def test_analyze_stack_thresholds_memmap(tmp_path):
+    stack = (STACKS['generated'] * 200).astype(np.uint8)
+    memmap = np.lib.format.open_memmap(tmp_path / 'stack.npy', mode='w+', dtype=np.uint8, shape=stack.shape)
+    memmap[:] = stack
+    memmap.flush()
+    df = analyze_stack(np.load(tmp_path / 'stack.npy', mmap_mode='r'), batch_size=2, threshold=127)
+    np.testing.assert_array_equal(df[['beta0', 'beta1']].to_numpy(), _reference(stack > 127)[:, 4:6])
+
+def test_analyze_stack_rejects_2d():
+    with pytest.raises(ValueError):
+        analyze_stack(np.zeros((4, 4), dtype=bool))
@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+from generator.field_generator import generate_topology_case
+from generator.topology_metrics import validate_euler_formulas, count_vertices_edges_faces_corrected
+from generator.streaming_topology import StreamingTopology, scan_rows, stream_euler_betti
+
+def _random_mask(shape, density, seed):
+    return np.random.default_rng(seed).random(shape) < density
+
+IMAGES = {
+    'empty': np.zeros((10, 14), dtype=bool),
+    'full': np.ones((5, 8), dtype=bool),
+    'single_row': _random_mask((1, 45), 0.5, 0),
+    'single_column': _random_mask((45, 1), 0.5, 1),
+    'single_pixel': np.ones((1, 1), dtype=bool),
+    'noise': _random_mask((39, 41), 0.5, 2),
+    'dense_noise': _random_mask((32, 28), 0.75, 3),
+    'blob_with_three_holes': generate_topology_case('blob_with_three_holes', size=(72, 64), seed=0) > 0.5,
+    'spiral_holes': generate_topology_case('spiral_holes', size=(80, 80), seed=0) > 0.5,
+    'corner_ring': np.pad(np.pad(np.zeros((3, 3), dtype=bool), 2, constant_values=True), ((0, 4), (0, 4))),
+}
+
+KEYS = ['vertices', 'edges', 'faces', 'beta0', 'beta1', 'euler_vef', 'euler_poincare', 'is_consistent', 'difference']
+
+@pytest.fixture(params=list(IMAGES), ids=list(IMAGES))
+def image(request):
+    return IMAGES[request.param]
+
+def test_stream_matches_validate_euler_formulas(image):
+    result = stream_euler_betti(iter(image))
+    expected = validate_euler_formulas(image.astype(np.uint8))
+    assert {k: result[k] for k in KEYS} == {k: expected[k] for k in KEYS}
+
+def test_running_counts_match_prefix(image):
+    for r, counts in enumerate(scan_rows(image.astype(np.float64))):
+        V, E, F = count_vertices_edges_faces_corrected(image[:r + 1].astype(np.uint8))
+        assert counts['row'] == r
+        assert (counts['vertices'], counts['edges'], counts['faces']) == (V, E, F)
+        assert counts['euler_vef'] == V - E + F
+
+def test_rejects_inconsistent_rows():
+    scanner = StreamingTopology()
+    scanner.push(np.zeros(5))
+    with pytest.raises(ValueError):
+        scanner.push(np.zeros(6))
+    with pytest.raises(ValueError):
+        scanner.push(np.zeros((1, 5)))
@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from generator.field_generator import generate_topology_case
+from generator.topology_base import compute_betti_numbers_2d
+from generator.topology_metrics import count_vertices_edges_faces_corrected, euler_characteristic_2d
+from generator.tiled_topology import tiled_vertices_edges_faces, tiled_euler_characteristic, tiled_betti_numbers
+
+def _random_mask(shape, density, seed):
+    return (np.random.default_rng(seed).random(shape) < density).astype(np.uint8)
+
+IMAGES = {
+    'empty': np.zeros((20, 30), dtype=np.uint8),
+    'full': np.ones((17, 9), dtype=np.uint8),
+    'single_row': _random_mask((1, 40), 0.5, 0),
+    'single_column': _random_mask((40, 1), 0.5, 1),
+    'single_pixel': np.ones((1, 1), dtype=np.uint8),
+    'noise': _random_mask((37, 53), 0.5, 2),
+    'sparse_noise': _random_mask((64, 48), 0.2, 3),
+    'blob_with_three_holes': generate_topology_case('blob_with_three_holes', size=(64, 80), seed=0).astype(np.uint8),
+    'irregular_mesh': generate_topology_case('irregular_mesh', size=(96, 96), seed=0).astype(np.uint8),
+    # Píxel [0, 0] activo: compute_betti_numbers_2d invierte la imagen
+    'corner_ring': np.pad(np.pad(np.zeros((3, 3), dtype=np.uint8), 2, constant_values=1), ((0, 4), (0, 4))),
+}
+
+# tile_size=1 deja teselas más pequeñas que el solape de un píxel
+TILE_SIZES = [1, 2, 7, 16, 1000]
+
+@pytest.fixture(params=list(IMAGES), ids=list(IMAGES))
+def image(request):
+    return IMAGES[request.param]
+
+@pytest.mark.parametrize("tile_size", TILE_SIZES)
+def test_tiled_vertices_edges_faces(image, tile_size):
+    expected = tuple(int(x) for x in count_vertices_edges_faces_corrected(image))
+    assert tiled_vertices_edges_faces(image, tile_size=tile_size) == expected
+
+@pytest.mark.parametrize("tile_size", TILE_SIZES)
+def test_tiled_euler_characteristic(image, tile_size):
+    assert tiled_euler_characteristic(image, tile_size=tile_size) == euler_characteristic_2d(image)
+
+def test_tiled_euler_on_memmap(tmp_path):
+    image = IMAGES['noise']
+    memmap = np.lib.format.open_memmap(tmp_path / 'mask.npy', mode='w+', dtype=np.uint8, shape=image.shape)
+    memmap[:] = image
+    memmap.flush()
+    assert tiled_euler_characteristic(np.load(tmp_path / 'mask.npy', mmap_mode='r'), tile_size=8) == \
+        euler_characteristic_2d(image)
+
+@pytest.mark.parametrize("tile_size", TILE_SIZES)
+def test_tiled_betti_numbers(image, tile_size):
+    assert tiled_betti_numbers(image, tile_size=tile_size) == tuple(compute_betti_numbers_2d(image))
+
+@pytest.mark.parametrize("name", ['noise', 'irregular_mesh', 'corner_ring', 'single_row'])
+def test_tiled_betti_numbers_workers(name):
+    image = IMAGES[name]
+    assert tiled_betti_numbers(image, tile_size=5, workers=2) == tuple(compute_betti_numbers_2d(image))
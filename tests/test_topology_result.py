@@ -0,0 +1,67 @@
+import copy
+import logging
+
+import numpy as np
+import pytest
+
+from generator.field_generator import generate_topology_case
+from generator.topology_result import TopologyResult, LAZY_KEYS
+from generator.topology_metrics import compute_all_metrics
+
+IMAGE = generate_topology_case('two_blobs_one_hole', size=(64, 64), seed=0).astype(np.uint8)
+
+def test_mapping_sees_only_computed_parts():
+    result = TopologyResult(IMAGE)
+    result['cache_hit'] = False
+    assert list(result) == ['binary_image', 'cache_hit']
+    assert len(result) == 2
+    assert 'metrics' not in result and 'binary_image' in result
+
+    snapshot = dict(result)
+    copied = copy.copy(result)
+    assert set(snapshot) == {'binary_image', 'cache_hit'}
+    assert not any(result.is_computed(k) for k in LAZY_KEYS if k != 'binary_image')
+    assert not copied.is_computed('metrics')
+
+def test_item_and_attribute_access_stay_lazy():
+    result = TopologyResult(IMAGE)
+    assert result.betti == tuple(result.context.betti)
+    assert not result.is_computed('metrics')
+
+    metrics = result['metrics']
+    assert 'metrics' in result and list(result) == ['binary_image', 'metrics', 'codes']
+    expected = compute_all_metrics(IMAGE)
+    assert (metrics['beta0'], metrics['beta1']) == (expected['beta0'], expected['beta1'])
+    assert result.get('equalities') is not None
+    assert 'equalities' in result
+    assert result.get('timings') is None
+
+def test_precomputed_parts_are_listed():
+    result = TopologyResult(IMAGE, {'metrics': {'beta0': 2, 'beta1': 1}})
+    assert 'metrics' in result and 'codes' not in result
+    assert result.betti == (2, 1)
+
+def test_binary_image_cannot_be_replaced():
+    with pytest.raises(KeyError):
+        TopologyResult(IMAGE)['binary_image'] = IMAGE
+
+def test_analyze_binary_image_summary_only_with_debug(tmp_path, monkeypatch):
+    import matplotlib.pyplot as plt
+    import main
+
+    path = tmp_path / 'mask.png'
+    plt.imsave(path, IMAGE, cmap='gray')
+    calls = []
+    monkeypatch.setattr(main, 'log_image_analysis', calls.append)
+    logger = logging.getLogger('main')
+    monkeypatch.setattr(logger, 'level', logging.INFO)
+
+    result = main.analyze_binary_image(str(path))
+    assert calls == [] and not result.is_computed('metrics')
+
+    main.analyze_binary_image(str(path), log_summary=True)
+    assert len(calls) == 1
+
+    logger.setLevel(logging.DEBUG)
+    main.analyze_binary_image(str(path))
+    assert len(calls) == 2
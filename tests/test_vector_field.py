@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+from scipy.ndimage import gaussian_filter
+
+from config.topology_config import TOPOLOGY_CONFIG, VISUALIZATION_CONFIG
+from generator.field_generator import (generate_topology_case, generate_vector_field,
+                                       downsample_field, smooth_field)
+from generator.visualizer import quiver_grid
+
+def _field(shape=(160, 120)):
+    return generate_topology_case('blob_with_hole', size=shape, seed=0).astype(np.float32)
+
+@pytest.mark.parametrize("scale", [1.0, 1.5, 3.0])
+def test_smooth_field_fft_matches_gaussian_filter(scale):
+    field = _field()
+    sigma = TOPOLOGY_CONFIG['fft_sigma'] * scale
+    smoothed = smooth_field(field, sigma)
+    assert smoothed.dtype == np.float32
+    assert smoothed.shape == field.shape
+    np.testing.assert_allclose(smoothed, gaussian_filter(field, sigma=sigma), atol=1e-4)
+
+def test_smooth_field_below_fft_sigma_is_gaussian_filter():
+    field = _field()
+    sigma = TOPOLOGY_CONFIG['fft_sigma'] / 2
+    np.testing.assert_array_equal(smooth_field(field, sigma), gaussian_filter(field, sigma=sigma))
+
+@pytest.mark.parametrize("dtype", [bool, np.uint8, np.float64])
+@pytest.mark.parametrize("max_size", [None, 64])
+def test_vector_field_is_float32(dtype, max_size):
+    u, v = generate_vector_field(_field().astype(dtype), max_size=max_size)
+    assert u.dtype == v.dtype == np.float32
+    assert u.shape == v.shape
+
+def test_vector_field_downsampled_shape():
+    u, _ = generate_vector_field(_field((400, 300)), max_size=100)
+    assert u.shape == downsample_field(np.zeros((400, 300)), 4).shape == (100, 75)
+
+@pytest.mark.parametrize("shape", [(3000, 2), (2, 3000), (3000, 3), (3000, 8), (5, 5000)])
+def test_vector_field_thin_images(shape):
+    field = np.ones(shape, dtype=np.float32)
+    u, v = generate_vector_field(field, max_size=1024)
+    assert min(u.shape) >= 2
+    assert u.shape == v.shape
+    # Sin reducir, o reducido por el mismo factor en los dos ejes
+    factor = -(-shape[0] // u.shape[0])
+    assert u.shape == (-(-shape[0] // factor), -(-shape[1] // factor))
+
+def test_quiver_grid_downsampled_field():
+    shape = (400, 300)
+    u, v = generate_vector_field(_field(shape), max_size=100)
+    X, Y, U, V = quiver_grid(u, v, shape)
+
+    scale = shape[0] / u.shape[0]
+    image_step = max(VISUALIZATION_CONFIG['vector_field_step'],
+                     -(-max(shape) // VISUALIZATION_CONFIG['vector_field_arrows']))
+    step = max(1, int(round(image_step / scale)))
+    rows, cols = -(-u.shape[0] // step), -(-u.shape[1] // step)
+
+    assert X.shape == Y.shape == U.shape == V.shape == (rows, cols)
+    np.testing.assert_array_equal(U, u[::step, ::step])
+    np.testing.assert_array_equal(V, v[::step, ::step])
+    # Cada flecha en el centro de su bloque de la imagen original
+    np.testing.assert_allclose(Y[:, 0], np.arange(rows) * step * scale + (scale - 1) / 2)
+    np.testing.assert_allclose(X[0, :], np.arange(cols) * step * scale + (scale - 1) / 2)
+    assert X.max() < shape[1] and Y.max() < shape[0]
+
+def test_quiver_grid_full_resolution():
+    shape = (120, 90)
+    u, v = generate_vector_field(_field(shape))
+    X, Y, U, _ = quiver_grid(u, v, shape)
+    step = VISUALIZATION_CONFIG['vector_field_step']
+    np.testing.assert_array_equal(Y[:, 0], np.arange(0, shape[0], step))
+    np.testing.assert_array_equal(X[0, :], np.arange(0, shape[1], step))
+    np.testing.assert_array_equal(U, u[::step, ::step])
@@ -0,0 +1,143 @@
+"""
+Equivalencia de V/E/F, perímetro y conectividad con las implementaciones
+originales (bucles por píxel), congeladas aquí como referencia.
+"""
+import numpy as np
+import pytest
+from scipy.ndimage import label, binary_erosion
+
+from generator.test_images import get_test_images
+from generator.case_definitions import get_topology_cases
+from generator.field_generator import generate_topology_case
+from generator.topology_base import calcular_V_E_F
+from generator.topology_metrics import (count_vertices_edges_faces_corrected,
+                                        compute_perimeter, analyze_connectivity)
+
+def reference_vertices_edges_faces(binary_image):
+    """count_vertices_edges_faces_corrected original (triple bucle)"""
+    binary_img = (binary_image > 0.5).astype(bool)
+    h, w = binary_img.shape
+    F = np.sum(binary_img)
+
+    E_internal = 0
+    for i in range(h):
+        for j in range(w - 1):
+            if binary_img[i, j] and binary_img[i, j + 1]:
+                E_internal += 1
+    for i in range(h - 1):
+        for j in range(w):
+            if binary_img[i, j] and binary_img[i + 1, j]:
+                E_internal += 1
+
+    E_boundary = 0
+    for i in range(h):
+        for j in range(w):
+            if binary_img[i, j]:
+                neighbors = [binary_img[i-1, j] if i > 0 else False,
+                             binary_img[i+1, j] if i < h-1 else False,
+                             binary_img[i, j-1] if j > 0 else False,
+                             binary_img[i, j+1] if j < w-1 else False]
+                E_boundary += sum(1 for n in neighbors if not n)
+    E = E_internal + E_boundary
+
+    V = 0
+    for i in range(h + 1):
+        for j in range(w + 1):
+            pixels = [binary_img[i-1, j-1] if i > 0 and j > 0 else False,
+                      binary_img[i-1, j] if i > 0 and j < w else False,
+                      binary_img[i, j-1] if i < h and j > 0 else False,
+                      binary_img[i, j] if i < h and j < w else False]
+            if sum(pixels) > 0:
+                V += 1
+
+    return V, E, F
+
+def reference_calcular_V_E_F(imagen_binaria):
+    """calcular_V_E_F original (recorrido de bloques 2x2)"""
+    V = E = F = 0
+    imagen = imagen_binaria.copy()
+    filas, cols = imagen.shape
+    for i in range(filas - 1):
+        for j in range(cols - 1):
+            bloque = imagen[i:i+2, j:j+2].flatten()
+            suma = np.sum(bloque)
+            if suma > 0:
+                F += 1
+            if suma == 1:
+                V += 1
+                E += 1
+            elif suma == 2:
+                if (bloque[0] == bloque[3] and bloque[0] == 1) or (bloque[1] == bloque[2] and bloque[1] == 1):
+                    V += 2
+                    E += 2
+                else:
+                    E += 2
+            elif suma == 3:
+                V += 1
+                E += 3
+            elif suma == 4:
+                E += 4
+    return V, E, F
+
+def reference_perimeter(binary_image):
+    """compute_perimeter original (erosión)"""
+    binary_img = (binary_image > 0.5).astype(bool)
+    return np.sum(binary_img & ~binary_erosion(binary_img))
+
+def reference_connectivity(binary_image):
+    """analyze_connectivity original (una máscara por componente)"""
+    binary_img = (binary_image > 0.5).astype(bool)
+    labeled_array, num_components = label(binary_img)
+    component_sizes = []
+    component_holes = []
+    for i in range(1, num_components + 1):
+        component_mask = (labeled_array == i)
+        component_sizes.append(np.sum(component_mask))
+        rows, cols = np.where(component_mask)
+        region = component_mask[max(0, rows.min() - 1):min(binary_img.shape[0], rows.max() + 2),
+                                max(0, cols.min() - 1):min(binary_img.shape[1], cols.max() + 2)]
+        labeled_holes, num_bg = label(~region)
+        holes = 0
+        for hole_id in range(1, num_bg + 1):
+            hole_mask = (labeled_holes == hole_id)
+            if not (np.any(hole_mask[0, :]) or np.any(hole_mask[-1, :]) or
+                    np.any(hole_mask[:, 0]) or np.any(hole_mask[:, -1])):
+                holes += 1
+        component_holes.append(holes)
+    return {
+        'num_components': num_components,
+        'component_sizes': component_sizes,
+        'component_holes': component_holes,
+        'largest_component_size': max(component_sizes) if component_sizes else 0,
+        'total_holes': sum(component_holes)
+    }
+
+TEST_IMAGES = get_test_images()
+CASES = [(name, size) for name in get_topology_cases() for size in [(64, 64), (96, 128)]]
+
+def _images():
+    for name, image in TEST_IMAGES.items():
+        yield pytest.param(image, id=name)
+    for name, size in CASES:
+        yield pytest.param(generate_topology_case(name, size=size, seed=0), id=f"{name}-{size[0]}x{size[1]}")
+
+@pytest.fixture(params=list(_images()))
+def image(request):
+    return request.param
+
+def test_vertices_edges_faces(image):
+    assert tuple(count_vertices_edges_faces_corrected(image)) == reference_vertices_edges_faces(image)
+
+def test_calcular_V_E_F(image):
+    binary = (image > 0.5).astype(np.uint8)
+    assert tuple(calcular_V_E_F(binary)) == reference_calcular_V_E_F(binary)
+
+def test_perimeter(image):
+    assert compute_perimeter(image) == reference_perimeter(image)
+
+def test_connectivity(image):
+    result = analyze_connectivity(image)
+    expected = reference_connectivity(image)
+    assert result.keys() == expected.keys()
+    for key, value in expected.items():
+        assert list(np.ravel(result[key])) == list(np.ravel(value)), key